@@ -0,0 +1,95 @@
+"""Rows per second ingested by the SQLite archive
+
+Compares the bulk upserts of ``SQLiteArchive`` with inserting and committing
+row by row. Run from the repository root::
+
+    python -m benchmarks.bench_archive
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from iexcloud.archive import SQLiteArchive
+
+
+def prices(days: int = 15 * 252) -> list:
+
+    dates = pd.bdate_range("2005-01-03", periods=days).strftime("%Y-%m-%d")
+    return [
+        {
+            "date": date,
+            "open": 55.33,
+            "close": 54.99,
+            "high": 55.43,
+            "low": 54.76,
+            "volume": 11867660,
+            "uOpen": 55.33,
+            "uClose": 54.99,
+            "uHigh": 55.43,
+            "uLow": 54.76,
+            "uVolume": 11867660,
+            "change": 0.1,
+            "changePercent": 0.002,
+            "label": date,
+            "changeOverTime": 0.01,
+        }
+        for date in dates
+    ]
+
+
+def row_by_row(path: str, outputs: dict) -> int:
+
+    connection = sqlite3.connect(path)
+    columns = list(next(iter(outputs.values()))[0])
+    connection.execute(
+        f"CREATE TABLE prices (symbol TEXT, {', '.join(columns)}, "
+        "PRIMARY KEY (symbol, date))"
+    )
+    statement = (
+        f"INSERT OR REPLACE INTO prices VALUES ({', '.join('?' * (len(columns) + 1))})"
+    )
+
+    rows = 0
+    for symbol, records in outputs.items():
+        for record in records:
+            connection.execute(statement, (symbol, *record.values()))
+            connection.commit()
+            rows += 1
+
+    connection.close()
+    return rows
+
+
+def bulk(path: str, outputs: dict) -> int:
+
+    archive = SQLiteArchive(path)
+    rows = archive.write_many("price", outputs)
+    archive.close()
+
+    return rows
+
+
+def main():
+
+    records = prices()
+    for label, ingest, symbols in [
+        ("row by row", row_by_row, 2),
+        ("bulk upsert", bulk, 20),
+    ]:
+        outputs = {f"S{i}": records for i in range(symbols)}
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            rows = ingest(os.path.join(directory, "archive.sqlite"), outputs)
+            elapsed = time.perf_counter() - start
+
+        print(
+            f"{label:12s} {rows:8d} rows {elapsed:7.2f} s {rows / elapsed:10.0f} rows/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Time and peak memory of the previous and the single-pass parsers, and of
+the streaming decoder on a batch payload
+
+Run from the repository root::
+
+    python -m benchmarks.bench_parse
+"""
+
+import json
+import time
+import tracemalloc
+
+import pandas as pd
+
+from io import StringIO
+from functools import partial
+from iexcloud.frames import records_to_frame
+from iexcloud.parse import loads
+from iexcloud.schema import NEWS, PRICE
+from iexcloud.stream import iter_items
+
+
+def price_payload(days: int = 15 * 252) -> bytes:
+
+    bar = {
+        "date": "2020-01-02",
+        "open": 55.33,
+        "close": 54.99,
+        "high": 55.43,
+        "low": 54.76,
+        "volume": 11867660,
+        "uOpen": 55.33,
+        "uClose": 54.99,
+        "uHigh": 55.43,
+        "uLow": 54.76,
+        "uVolume": 11867660,
+        "change": 0,
+        "changePercent": 0,
+        "label": "Jan 2, 20",
+        "changeOverTime": 0,
+    }
+    return json.dumps([bar] * days).encode("utf-8")
+
+
+def news_payload(last: int = 50) -> bytes:
+
+    # no apostrophes: the previous parser turns them into quotes and fails
+    article = {
+        "datetime": 1593459600000,
+        "headline": "Coca-Cola dividend is not going anywhere",
+        "source": "Motley Fool",
+        "url": "https://cloud.iexapis.com/v1/news/article/x",
+        "summary": "The payout of the beverage giant is safe. " * 40,
+        "related": "KO,PEP,KDP",
+        "image": "https://cloud.iexapis.com/v1/news/image/x",
+        "lang": "en",
+        "hasPaywall": False,
+    }
+    return json.dumps([article] * last).encode("utf-8")
+
+
+def batch_payload(symbols: int = 100) -> bytes:
+
+    # /stock/market/batch?types=chart&range=max for a full batch of symbols
+    chart = price_payload().decode("utf-8")
+    return (
+        "{"
+        + ",".join(f'"S{i:03d}": {{"chart": {chart}}}' for i in range(symbols))
+        + "}"
+    ).encode("utf-8")
+
+
+def streamed(content: bytes, chunk_size: int = 64 * 1024):
+
+    chunks = (content[i : i + chunk_size] for i in range(0, len(content), chunk_size))
+    for _ in iter_items(chunks):
+        pass
+
+
+def previous(content: bytes) -> pd.DataFrame:
+
+    # parser before the single-pass rewrite: bytes -> str -> replace -> read_json
+    text = content.decode("utf-8").replace("'", '"')
+    return pd.read_json(StringIO(text))
+
+
+def single_pass(content: bytes, schema: dict = None, compact: bool = False):
+
+    return records_to_frame(loads(content), schema, compact)
+
+
+def frame_size(parser, content: bytes) -> float:
+
+    return parser(content).memory_usage(deep=True).sum() / 1024 / 1024
+
+
+def measure(parser, content: bytes, repeat: int):
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parser(content)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+
+    tracemalloc.start()
+    parser(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+
+    for name, content, repeat, schema in [
+        ('get_price("max")', price_payload(), 20, PRICE),
+        ("get_news(50)", news_payload(), 50, NEWS),
+    ]:
+        print(f"{name}: {len(content) / 1024:.0f} KiB")
+        base_time = base_peak = None
+        for label, parser in [
+            ("previous", previous),
+            ("single-pass", single_pass),
+            ("schema", partial(single_pass, schema=schema)),
+            ("compact", partial(single_pass, schema=schema, compact=True)),
+        ]:
+            elapsed, peak = measure(parser, content, repeat)
+            base_time, base_peak = base_time or elapsed, base_peak or peak
+            print(
+                f"  {label:12s} {elapsed:8.2f} ms ({base_time / elapsed:4.1f}x)"
+                f"  peak {peak:7.2f} MiB ({peak / base_peak:4.2f}x)"
+                f"  frame {frame_size(parser, content):6.2f} MiB"
+            )
+
+    content = batch_payload()
+    print(f"batch of 100 symbols, range=max: {len(content) / 1024 / 1024:.0f} MiB")
+    for label, parser in [("json.loads", json.loads), ("streamed", streamed)]:
+        elapsed, peak = measure(parser, content, 3)
+        print(f"  {label:12s} {elapsed:8.2f} ms  peak {peak:7.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Requests/sec of one-connection-per-call versus the pooled ``Client``
+
+Run from the repository root::
+
+    python -m benchmarks.bench_transport --requests 2000
+"""
+
+import argparse
+import time
+
+import requests
+
+from iexcloud import Client, RateLimiter, Stock, set_token
+from tests.stub import StubServer
+
+PRICE = [{"date": "2020-01-02", "close": 54.99, "volume": 11867660}] * 21
+
+
+def _timed(func, n: int) -> float:
+
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    return n / (time.perf_counter() - start)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    set_token("benchmark_token")
+
+    with StubServer({"/stock/KO/chart/1m": PRICE}) as server:
+        url = f"{server.url}/stock/KO/chart/1m"
+
+        before = _timed(lambda: requests.get(url, params={"token": "x"}), args.requests)
+        connections_before = server.connections
+
+        client = Client(base_url=server.url, rate_limiter=RateLimiter(rate=None))
+        stock = Stock("KO", output="json", client=client)
+        after = _timed(lambda: stock.get_price("1m"), args.requests)
+        connections_after = server.connections - connections_before
+
+    print(f"requests.get : {before:10.1f} req/s  {connections_before} connections")
+    print(f"Client       : {after:10.1f} req/s  {connections_after} connections")
+    print(f"speedup      : {after / before:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
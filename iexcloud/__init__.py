@@ -1,10 +1,59 @@
 # flake8: noqa
 
-# Versioneer automatic version
-from ._version import get_versions
+# Configuration helpers are imported eagerly: they only need os. Everything
+# else, and with it requests, pandas and friends, is imported on first access.
+from iexcloud.config import get_token, get_url, set_token, set_test_token, set_mode
 
-__version__ = get_versions()["version"]
-del get_versions
+_LAZY = {
+    "Cache": "iexcloud.cache",
+    "MemoryCache": "iexcloud.cache",
+    "SQLiteCache": "iexcloud.cache",
+    "Client": "iexcloud.client",
+    "get_client": "iexcloud.client",
+    "set_client": "iexcloud.client",
+    "RateLimiter": "iexcloud.ratelimit",
+    "get_rate_limiter": "iexcloud.ratelimit",
+    "set_rate_limit": "iexcloud.ratelimit",
+    "Reference": "iexcloud.reference",
+    "Result": "iexcloud.result",
+    "CircuitOpenError": "iexcloud.retry",
+    "RetryPolicies": "iexcloud.retry",
+    "RetryPolicy": "iexcloud.retry",
+    "SingleFlight": "iexcloud.singleflight",
+    "Stock": "iexcloud.stock",
+    "StockBatch": "iexcloud.batch",
+    "fetch_universe": "iexcloud.universe",
+}
 
-from iexcloud.config import get_token, get_url, set_token, set_test_token, set_mode
-from iexcloud.stock import Stock
+__all__ = [
+    "__version__",
+    "get_token",
+    "get_url",
+    "set_token",
+    "set_test_token",
+    "set_mode",
+    *_LAZY,
+]
+
+
+def __getattr__(name: str):
+
+    if name == "__version__":
+        # Versioneer may shell out to git, so the version is resolved on demand
+        from ._version import get_versions
+
+        value = get_versions()["version"]
+    elif name in _LAZY:
+        from importlib import import_module
+
+        value = getattr(import_module(_LAZY[name]), name)
+    else:
+        raise AttributeError(f"module 'iexcloud' has no attribute '{name}'")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,560 @@
+import asyncio
+
+from contextlib import contextmanager
+
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Iterable, List, Union
+from urllib.parse import urlsplit
+from requests import Response
+from requests.exceptions import ConnectionError, Timeout
+from iexcloud.client import CACHED_HEADERS, build_response
+from iexcloud.config import get_token, get_url
+from iexcloud.cache import Cache, cache_key
+from iexcloud.ratelimit import RateLimiter, get_rate_limiter, retry_after
+from iexcloud.retry import RetryPolicies
+from iexcloud.singleflight import AsyncSingleFlight
+from iexcloud.stock import Stock
+from iexcloud.stream import aiter_chunks, aiter_items
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class AsyncClient(object):
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        timeout: float = None,
+        base_url: str = None,
+        rate_limiter: RateLimiter = None,
+        max_throttle_retries: int = 3,
+        retry: RetryPolicies = None,
+        single_flight: bool = True,
+        cache: Cache = None,
+    ):
+        """asyncio counterpart of ``Client`` backed by an aiohttp connection pool
+
+        A pool is opened per event loop and closed when its loop shuts down,
+        e.g. when ``asyncio.run`` returns, so the client can be reused across
+        ``asyncio.run`` calls.
+
+        Args:
+            limit: maximum number of open connections. 0 means unlimited.
+            limit_per_host: maximum number of open connections per host.
+                0 means unlimited.
+            timeout: total seconds to wait for a request. Defaults to no timeout.
+            base_url: override of the API url. Defaults to ``get_url()``.
+            rate_limiter: limiter every request passes through. Defaults to the
+                process-wide one configured by ``set_rate_limit``.
+            max_throttle_retries: number of times a request rejected with 429 is
+                sent again after the limiter's pause.
+            retry: retry policies and circuit breakers. Defaults to
+                ``RetryPolicies()``.
+            single_flight: whether concurrent identical requests share one call
+            cache: response cache, e.g. ``MemoryCache()``. Defaults to none.
+
+        Raises:
+            ImportError: when aiohttp is not installed
+        """
+
+        if aiohttp is None:  # pragma: no cover
+            raise ImportError("AsyncClient requires aiohttp: pip install aiohttp")
+
+        self.limit: int = limit
+        self.limit_per_host: int = limit_per_host
+        self.timeout: float = timeout
+        self.base_url: str = base_url
+        self.rate_limiter: RateLimiter = (
+            rate_limiter if rate_limiter is not None else get_rate_limiter()
+        )
+        self.max_throttle_retries: int = max_throttle_retries
+        self.retry: RetryPolicies = retry if retry is not None else RetryPolicies()
+        self.flight: AsyncSingleFlight = AsyncSingleFlight() if single_flight else None
+        self.cache: Cache = cache
+        self._session = None
+        self._loop = None
+        self._guard = None
+
+    @property
+    def url(self) -> str:
+
+        return self.base_url if self.base_url is not None else get_url()
+
+    async def _get_session(self):
+
+        # aiohttp sessions are bound to the loop they were created in, so a new
+        # pool is opened when the client is reused under another asyncio.run
+        loop = asyncio.get_event_loop()
+        session = self._session
+
+        if session is None or session.closed or self._loop is not loop:
+            if session is not None and not session.closed:
+                await _discard(session, self._guard, self._loop)
+
+            connector = aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._session = session
+            self._loop = loop
+
+            # the loop closes its async generators when asyncio.run returns,
+            # which closes the pool while its loop can still run
+            self._guard = _close_on_shutdown(session)
+            await self._guard.__anext__()
+
+        return session
+
+    async def get(self, path: str, params: dict = None) -> Response:
+        """Send a GET request for an API path
+
+        Args:
+            path: API path starting with "/", e.g. "/stock/KO/chart/1m"
+            params: extra query parameters. The token is added automatically.
+
+        Raises:
+            CircuitOpenError: when the host's circuit breaker is open
+            RequestException: when the request fails and is not retried
+
+        Returns:
+            Response: fully read response of the request
+        """
+
+        query = {"token": get_token()}
+        if params is not None:
+            query.update(params)
+
+        url = self.url
+        key = cache_key(url + path, query)
+        ttl = self.cache.ttl(path) if self.cache is not None else 0
+
+        if ttl > 0:
+            content = self.cache.get(key)
+            if content is not None:
+                return build_response(url + path, 200, content, CACHED_HEADERS)
+
+        if self.flight is None:
+            response = await self._request(url, path, query)
+        else:
+            response = await self.flight.do(
+                (key, query["token"]), lambda: self._request(url, path, query)
+            )
+
+        if ttl > 0 and response.status_code == 200:
+            self.cache.set(key, response.content, ttl)
+
+        return response
+
+    async def stream(self, path: str, params: dict = None) -> Response:
+        """Send a GET request whose body is read lazily
+
+        The request goes through rate limiting and retries but skips the cache
+        and single-flight. Pass the response to :func:`iter_response` or close
+        it after use.
+
+        Args:
+            path: API path starting with "/", e.g. "/stock/KO/chart/max"
+            params: extra query parameters. The token is added automatically.
+
+        Returns:
+            Response: response whose aiohttp response, with an unread body, is
+                ``response.raw``
+        """
+
+        query = {"token": get_token()}
+        if params is not None:
+            query.update(params)
+
+        return await self._request(self.url, path, query, stream=True)
+
+    async def _request(
+        self, url: str, path: str, query: dict, stream: bool = False
+    ) -> Response:
+
+        policy = self.retry.policy(path)
+        breaker = self.retry.breaker(urlsplit(url).netloc)
+        attempt = throttles = 0
+
+        while True:
+            trial = breaker.allow()
+
+            try:
+                await self.rate_limiter.acquire_async()
+                response = await self._send(url + path, query, stream)
+            except Exception as error:
+                breaker.record_failure()
+                if not policy.should_retry(attempt, error=error):
+                    raise
+            else:
+                if response.status_code == 429:
+                    self.rate_limiter.throttle(retry_after(response))
+                    if throttles < self.max_throttle_retries:
+                        throttles += 1
+                        if stream:
+                            response.close()
+                        continue
+                    return response
+
+                self.rate_limiter.succeed()
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+
+                if not policy.should_retry(attempt, response=response):
+                    return response
+
+                if stream:
+                    response.close()
+            finally:
+                # a throttled or interrupted trial leaves the circuit half-open
+                if trial:
+                    breaker.release()
+
+            await asyncio.sleep(policy.delay(attempt))
+            attempt += 1
+
+    async def _send(self, url: str, query: dict, stream: bool = False) -> Response:
+
+        # aiohttp errors are raised as their requests equivalents so callers
+        # handle failures of Stock and AsyncStock the same way
+        with _requests_errors():
+            session = await self._get_session()
+            if stream:
+                raw = await session.get(url, params=query)
+            else:
+                async with session.get(url, params=query) as raw:
+                    content = await raw.read()
+
+        if not stream:
+            return build_response(
+                str(raw.url), raw.status, content, dict(raw.headers), raw.reason
+            )
+
+        # an unread body: closing the response closes the aiohttp one
+        response = build_response(
+            str(raw.url), raw.status, False, dict(raw.headers), raw.reason
+        )
+        response.raw = raw
+
+        return response
+
+    def stats(self) -> dict:
+        """Counters of the rate limiter, retries, circuit breakers, single-flight
+        and cache
+
+        Returns:
+            dict: counters for tuning the client
+        """
+
+        return {
+            "throttled": self.rate_limiter.throttled,
+            "rate": self.rate_limiter.rate,
+            **self.retry.stats(),
+            "single_flight": self.flight.stats() if self.flight else None,
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+    async def close(self):
+        """Close all pooled connections"""
+
+        if self._session is not None:
+            await self._guard.aclose()
+            self._session = None
+            self._loop = None
+            self._guard = None
+
+
+@contextmanager
+def _requests_errors():
+
+    try:
+        yield
+    except asyncio.TimeoutError as error:
+        raise Timeout(error) from error
+    except aiohttp.ClientConnectionError as error:
+        raise ConnectionError(error) from error
+
+
+async def iter_response(response: Response, chunk_size: int = 64 * 1024):
+    """Decode the items of a response of ``AsyncClient.stream`` incrementally
+
+    The response is closed once its items are exhausted.
+
+    Args:
+        response: response of ``AsyncClient.stream``
+        chunk_size: bytes read from the network at a time
+
+    Raises:
+        HTTPError: when the response is an error
+
+    Returns:
+        AsyncIterator: array elements, or (key, value) pairs of an object
+    """
+
+    try:
+        response.raise_for_status()
+        with _requests_errors():
+            async for item in aiter_items(
+                response.raw.content.iter_chunked(chunk_size)
+            ):
+                yield item
+    finally:
+        response.close()
+
+
+async def _close_on_shutdown(session):
+
+    try:
+        yield
+    finally:
+        await session.close()
+
+
+async def _discard(session, guard, loop: asyncio.AbstractEventLoop):
+
+    # a pool left open on another loop. A loop running in another thread
+    # closes it itself; one that is closed, or open but not running, e.g. a
+    # manual loop between run_until_complete calls, may never run again, so
+    # its transports are closed here
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+        return
+
+    if session.connector is not None:
+        session.connector._close()
+    session.detach()
+
+    # the guard only closes the session, which is already closed
+    await guard.aclose()
+
+
+_async_client = None
+
+
+def get_async_client() -> AsyncClient:
+    """Retrieve the process-wide async client, creating it on first use
+
+    Returns:
+        AsyncClient: shared async client
+    """
+
+    global _async_client
+
+    if _async_client is None:
+        _async_client = AsyncClient()
+
+    return _async_client
+
+
+def set_async_client(client: AsyncClient = None, **kwargs) -> AsyncClient:
+    """Replace the process-wide async client
+
+    Args:
+        client: client to share. When omitted, a new ``AsyncClient`` is built
+            from ``kwargs``, e.g. ``set_async_client(limit=200)``.
+
+    Returns:
+        AsyncClient: the new shared async client
+    """
+
+    global _async_client
+
+    if client is None:
+        client = AsyncClient(**kwargs)
+
+    _async_client = client
+
+    return client
+
+
+class AsyncStock(Stock):
+    def __init__(
+        self,
+        symbol: str,
+        output="pandas",
+        client: AsyncClient = None,
+        compact: bool = False,
+    ):
+        """Stock whose ``get_*`` methods are awaitable
+
+        Outputs are built by the same code as ``Stock``, so every method returns
+        exactly what its blocking counterpart does.
+
+        Args:
+            symbol: stock symbol
+            output: output format, as in ``Stock``.
+            client: async client to use. Defaults to the shared one.
+            compact: whether pandas outputs use float32/int32
+        """
+
+        if client is None:
+            client = get_async_client()
+
+        super().__init__(symbol, output, client=client, compact=compact)
+
+    async def get_dividend(self, time_range: str) -> Union["pd.DataFrame", str]:
+        """Awaitable :meth:`Stock.get_dividend`"""
+
+        response = await self.client.get(f"/stock/{self.symbol}/dividends/{time_range}")
+        output = self._create_output(response, dataset="dividend")
+
+        self.dividend = output
+
+        return output
+
+    async def get_earning(self, last: int) -> Union["pd.DataFrame", str]:
+        """Awaitable :meth:`Stock.get_earning`"""
+
+        response = await self.client.get(f"/stock/{self.symbol}/earnings/{last}")
+        output = self._create_output(response, "earnings", "earning")
+
+        self.earning = output
+
+        return output
+
+    async def get_logo(self) -> str:
+        """Awaitable :meth:`Stock.get_logo`"""
+
+        response = await self.client.get(f"/stock/{self.symbol}/logo")
+        output = self._load_json(response)["url"]
+
+        self.logo = output
+
+        return output
+
+    async def get_news(self, last: int) -> Union["pd.DataFrame", str]:
+        """Awaitable :meth:`Stock.get_news`"""
+
+        response = await self.client.get(f"/stock/{self.symbol}/news/last/{last}")
+        output = self._create_output(response, dataset="news")
+
+        self.news = output
+
+        return output
+
+    async def get_peer(self) -> List[str]:
+        """Awaitable :meth:`Stock.get_peer`"""
+
+        response = await self.client.get(f"/stock/{self.symbol}/peers")
+        output = self._load_json(response)
+
+        self.peer = output
+
+        return output
+
+    async def get_price(self, time_range: str) -> Union["pd.DataFrame", str]:
+        """Awaitable :meth:`Stock.get_price`"""
+
+        response = await self.client.get(f"/stock/{self.symbol}/chart/{time_range}")
+        output = self._create_output(response, dataset="price")
+
+        self.price = output
+
+        return output
+
+    async def iter_price(
+        self, time_range: str, chunk_size: int = 5000
+    ) -> AsyncIterator:
+        """Asynchronous :meth:`Stock.iter_price`, used with ``async for``"""
+
+        response = await self.client.stream(f"/stock/{self.symbol}/chart/{time_range}")
+
+        async for records in aiter_chunks(iter_response(response), chunk_size):
+            yield self._records_to_output(records, dataset="price")
+
+    async def get_profile(self) -> dict:
+        """Awaitable :meth:`Stock.get_profile`"""
+
+        response = await self.client.get(f"/stock/{self.symbol}/company")
+        output = self._load_json(response)
+
+        self.profile = output
+
+        return output
+
+    async def get_split(self, time_range: str) -> Union["pd.DataFrame", str]:
+        """Awaitable :meth:`Stock.get_split`"""
+
+        response = await self.client.get(f"/stock/{self.symbol}/splits/{time_range}")
+        output = self._create_output(response, dataset="split")
+
+        self.split = output
+
+        return output
+
+
+async def gather(
+    symbols: Iterable[str],
+    dataset: str,
+    *args,
+    concurrency: int = 100,
+    output: str = "pandas",
+    client: AsyncClient = None,
+    **kwargs,
+) -> Dict[str, object]:
+    """Fetch one dataset for many symbols with bounded concurrency
+
+    Args:
+        symbols: stock symbols
+        dataset: name of the ``AsyncStock.get_*`` method without the prefix,
+            e.g. "price" or "dividend"
+        *args: positional arguments of the method, e.g. the time range
+        concurrency: maximum number of requests in flight
+        output: output format, as in ``Stock``.
+        client: async client to use. Defaults to the shared one.
+        **kwargs: keyword arguments of the method
+
+    Returns:
+        Dict[str, object]: output of the method keyed by symbol
+    """
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(symbol: str):
+        async with semaphore:
+            stock = AsyncStock(symbol, output=output, client=client)
+            return await getattr(stock, f"get_{dataset}")(*args, **kwargs)
+
+    symbols = list(symbols)
+    outputs = await asyncio.gather(*[fetch(symbol) for symbol in symbols])
+
+    return dict(zip(symbols, outputs))
+
+
+async def gather_prices(
+    symbols: Iterable[str],
+    time_range: str,
+    concurrency: int = 100,
+    output: str = "pandas",
+    client: AsyncClient = None,
+) -> Dict[str, object]:
+    """Fetch historical prices for many symbols with bounded concurrency
+
+    Args:
+        symbols: stock symbols
+        time_range: time range accepted by :meth:`Stock.get_price`
+        concurrency: maximum number of requests in flight
+        output: output format, as in ``Stock``.
+        client: async client to use. Defaults to the shared one.
+
+    Returns:
+        Dict[str, object]: price output keyed by symbol
+    """
+
+    return await gather(
+        symbols,
+        "price",
+        time_range,
+        concurrency=concurrency,
+        output=output,
+        client=client,
+    )
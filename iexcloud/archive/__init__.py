@@ -0,0 +1,34 @@
+# flake8: noqa
+
+# Backends are imported on first access so that using one does not import the
+# optional dependencies of the others.
+_LAZY = {
+    "adjust_prices": "iexcloud.archive.adjust",
+    "DuckDBArchive": "iexcloud.archive.duck",
+    "Manifest": "iexcloud.archive.manifest",
+    "NewsLog": "iexcloud.archive.news",
+    "ParquetArchive": "iexcloud.archive.parquet",
+    "PriceStore": "iexcloud.archive.panel",
+    "SQLiteArchive": "iexcloud.archive.sqlite",
+    "plan_range": "iexcloud.archive.sync",
+    "sync_prices": "iexcloud.archive.sync",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+
+    if name not in _LAZY:
+        raise AttributeError(f"module 'iexcloud.archive' has no attribute '{name}'")
+
+    from importlib import import_module
+
+    value = getattr(import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+from iexcloud.archive.convert import to_frame
+
+# unadjusted bar column -> adjusted column
+PRICES = {"uOpen": "open", "uHigh": "high", "uLow": "low", "uClose": "close"}
+
+
+def _factors(dates: np.ndarray, ex_dates: np.ndarray, ratios: np.ndarray):
+
+    # a corporate action scales every bar before its ex-date, so the factor
+    # of a date is the product of the ratios of the later actions
+    order = np.argsort(ex_dates)
+    ex_dates, ratios = ex_dates[order], ratios[order]
+    products = np.append(np.cumprod(ratios[::-1])[::-1], 1.0)
+
+    return products[np.searchsorted(ex_dates, dates, side="right")]
+
+
+def _effective(dates: np.ndarray, ex_dates: np.ndarray) -> np.ndarray:
+
+    # announced actions, e.g. of get_split("next"), have not happened by the
+    # last bar and must not scale the history yet
+    if not len(dates):
+        return np.zeros(len(ex_dates), dtype=bool)
+
+    return ~np.isnat(ex_dates) & (ex_dates <= dates.max())
+
+
+def split_factors(dates, splits) -> np.ndarray:
+    """Split adjustment factor of each date
+
+    Splits with an ex-date after the last bar are ignored.
+
+    Args:
+        dates: dates of the bars
+        splits: output of ``Stock.get_split`` in any output mode
+
+    Returns:
+        np.ndarray: factor multiplying prices and dividing volumes
+    """
+
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+    splits = to_frame(splits, "split")
+    if splits.empty:
+        return np.ones(len(dates))
+
+    ratios = splits["ratio"] if "ratio" in splits else pd.Series(np.nan, splits.index)
+    if "fromFactor" in splits and "toFactor" in splits:
+        ratios = ratios.fillna(splits["fromFactor"] / splits["toFactor"])
+
+    ex_dates = splits["exDate"].to_numpy(dtype="datetime64[ns]")
+    valid = ratios.notna().to_numpy() & _effective(dates, ex_dates)
+    ex_dates = ex_dates[valid]
+
+    return _factors(dates, ex_dates, ratios.to_numpy(dtype=float)[valid])
+
+
+def dividend_factors(dates, closes, dividends) -> np.ndarray:
+    """Total-return adjustment factor of each date
+
+    Each cash dividend scales earlier prices by ``1 - amount / close`` where
+    close is the unadjusted close before the ex-date. Dividends with an
+    ex-date after the last bar are ignored.
+
+    Args:
+        dates: sorted dates of the bars
+        closes: unadjusted closes of the bars
+        dividends: output of ``Stock.get_dividend`` in any output mode
+
+    Returns:
+        np.ndarray: factor multiplying split-adjusted prices
+    """
+
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+    closes = np.asarray(closes, dtype=float)
+    dividends = to_frame(dividends, "dividend")
+    if dividends.empty:
+        return np.ones(len(dates))
+
+    ex_dates = dividends["exDate"].to_numpy(dtype="datetime64[ns]")
+    amounts = dividends["amount"].to_numpy(dtype=float, na_value=np.nan)
+
+    previous = np.searchsorted(dates, ex_dates, side="left") - 1
+    valid = (previous >= 0) & ~np.isnan(amounts) & _effective(dates, ex_dates)
+    ratios = 1 - amounts[valid] / closes[previous[valid]]
+
+    return _factors(dates, ex_dates[valid], ratios)
+
+
+def adjust_prices(prices, splits=None, dividends=None) -> pd.DataFrame:
+    """Adjust unadjusted bars for splits and, optionally, dividends
+
+    Adjusted series are recomputed locally from the unadjusted ``u*``
+    columns, so a new split or dividend only needs its corporate action, not
+    the price history, to be fetched again. Prices of several symbols are
+    adjusted per symbol when they have a ``symbol`` column, and so are
+    actions with one.
+
+    Example:
+        >>> adjust_prices(
+        ...     archive.read_prices(["KO"]),
+        ...     archive.read_splits(["KO"]),
+        ...     archive.read_dividends(["KO"]),
+        ... )
+
+    Args:
+        prices: output of ``Stock.get_price`` in any output mode
+        splits: output of ``Stock.get_split``
+        dividends: output of ``Stock.get_dividend``
+
+    Raises:
+        ValueError: when the prices have no unadjusted close
+
+    Returns:
+        pd.DataFrame: prices sorted by date where open, high, low, close and
+        volume are split-adjusted, with ``splitFactor`` and, given dividends,
+        ``dividendFactor`` and ``totalReturnClose``
+    """
+
+    prices = to_frame(prices, "price")
+    if "uClose" not in prices:
+        raise ValueError("Prices should have unadjusted columns such as uClose")
+
+    splits = to_frame(splits if splits is not None else [], "split")
+    dividends = to_frame(dividends if dividends is not None else [], "dividend")
+
+    if "symbol" in prices and len(prices):
+        return pd.concat(
+            [
+                _adjust(rows, _of(splits, symbol), _of(dividends, symbol))
+                for symbol, rows in prices.groupby("symbol", sort=True)
+            ],
+            ignore_index=True,
+        )
+
+    return _adjust(prices, splits, dividends)
+
+
+def _of(actions: pd.DataFrame, symbol: str) -> pd.DataFrame:
+
+    if "symbol" not in actions:
+        return actions
+
+    return actions[actions["symbol"].str.upper() == str(symbol).upper()]
+
+
+def _adjust(
+    prices: pd.DataFrame, splits: pd.DataFrame, dividends: pd.DataFrame
+) -> pd.DataFrame:
+
+    prices = prices.sort_values("date", ignore_index=True)
+    dates = prices["date"].to_numpy(dtype="datetime64[ns]")
+
+    factors = split_factors(dates, splits)
+    for unadjusted, adjusted in PRICES.items():
+        if unadjusted in prices:
+            prices[adjusted] = prices[unadjusted].to_numpy(dtype=float) * factors
+    if "uVolume" in prices:
+        prices["volume"] = prices["uVolume"].to_numpy(dtype=float) / factors
+    prices["splitFactor"] = factors
+
+    if not dividends.empty:
+        closes = prices["uClose"].to_numpy(dtype=float)
+        prices["dividendFactor"] = dividend_factors(dates, closes, dividends)
+        prices["totalReturnClose"] = prices["close"] * prices["dividendFactor"]
+
+    return prices
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from iexcloud.frames import records_to_frame
+from iexcloud.parse import loads
+from iexcloud.result import Result
+from iexcloud.schema import DIVIDEND, EARNING, NEWS, PRICE, SCHEMAS, SPLIT
+
+# Stock attribute -> (table, schema, key columns besides symbol, date column)
+TABLES = {
+    "price": ("prices", PRICE, ("date",), "date"),
+    "dividend": ("dividends", DIVIDEND, ("exDate",), "exDate"),
+    "split": ("splits", SPLIT, ("exDate",), "exDate"),
+    "earning": ("earnings", EARNING, ("fiscalPeriod",), "EPSReportDate"),
+    "news": ("news", NEWS, ("datetime", "headline"), "datetime"),
+}
+
+# compact dtypes are widened so every write to an archive has the same types
+_WIDE = {"float32": "float64", "int32": "int64", "Int32": "Int64"}
+
+
+def to_frame(data, dataset: str) -> pd.DataFrame:
+    """Normalise the output of a ``Stock.get_*`` method to a DataFrame
+
+    Every output mode is accepted: pandas, json, arrow, numpy, records and
+    result. Numeric columns are widened to 64 bits.
+
+    Args:
+        data: output of the method
+        dataset: ``Stock`` attribute name selecting the schema, e.g. "price"
+
+    Returns:
+        pd.DataFrame: one row per record
+    """
+
+    if isinstance(data, Result):
+        data = data.records()
+    elif isinstance(data, (str, bytes)):
+        data = loads(data)
+
+    if isinstance(data, dict) and all(
+        isinstance(values, np.ndarray) for values in data.values()
+    ):
+        frame = pd.DataFrame(data)
+    elif isinstance(data, (list, dict)):
+        frame = records_to_frame(data, SCHEMAS.get(dataset))
+    elif hasattr(data, "to_pandas"):
+        frame = data.to_pandas()
+    else:
+        frame = data
+
+    wide = {
+        column: _WIDE[str(dtype)]
+        for column, dtype in frame.dtypes.items()
+        if str(dtype) in _WIDE
+    }
+
+    return frame.astype(wide) if wide else frame
+
+
+def table_of(dataset: str) -> tuple:
+    """Table, schema, key columns and date column of a dataset
+
+    Raises:
+        ValueError: when the dataset is not archived
+    """
+
+    if dataset not in TABLES:
+        raise ValueError(
+            "Dataset should be one of " + ", ".join(f"'{d}'" for d in TABLES)
+        )
+
+    return TABLES[dataset]
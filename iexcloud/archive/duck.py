@@ -0,0 +1,333 @@
+import threading
+
+import pandas as pd
+
+from typing import Dict, Iterable, List, Optional
+from iexcloud.archive.convert import TABLES, table_of, to_frame
+from iexcloud.archive.manifest import Manifest
+
+try:
+    import duckdb
+except ImportError:  # pragma: no cover
+    duckdb = None
+
+_TYPES = {
+    "datetime": "TIMESTAMP",
+    "float": "DOUBLE",
+    "int": "BIGINT",
+    "bool": "BOOLEAN",
+}
+
+
+def _quote(column: str) -> str:
+
+    return f'"{column}"'
+
+
+class DuckDBArchive(object):
+    def __init__(self, path: str = ":memory:"):
+        """Embedded DuckDB store for SQL over archived data
+
+        Outputs are appended to ``<table>_log`` tables straight from their
+        pandas or Arrow buffers. The ``prices``, ``dividends``, ``splits``,
+        ``earnings`` and ``news`` views keep the latest row per symbol and
+        key, so rewriting a range is idempotent; :meth:`compact` drops the
+        superseded rows. ``manifest`` indexes what is archived in
+        ``<path>.manifest.sqlite``, or in memory for an in-memory database.
+        Writes are recorded there as pending before the transaction and
+        confirmed after it commits; writes left pending by a crash are
+        repaired when the archive opens.
+
+        Example:
+            >>> archive.query("SELECT date, avg(close) FROM prices GROUP BY date")
+
+        Args:
+            path: database file, or ":memory:"
+
+        Raises:
+            ImportError: when duckdb is not installed
+        """
+
+        if duckdb is None:  # pragma: no cover
+            raise ImportError("DuckDB archives require duckdb: pip install duckdb")
+
+        self.path: str = path
+        self.connection = duckdb.connect(path)
+        self._lock = threading.Lock()
+        self.manifest: Manifest = Manifest(
+            ":memory:" if path == ":memory:" else f"{path}.manifest.sqlite"
+        )
+
+        self.connection.execute("CREATE SEQUENCE IF NOT EXISTS ingestion")
+        for table, schema, keys, _ in TABLES.values():
+            columns = ", ".join(
+                f"{_quote(column)} {_TYPES.get(kind, 'VARCHAR')}"
+                for column, kind in schema.items()
+            )
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table}_log (symbol VARCHAR, "
+                f"{columns}, _ingested BIGINT DEFAULT nextval('ingestion'))"
+            )
+            self.connection.execute(
+                f"CREATE OR REPLACE VIEW {table} AS "
+                f"SELECT * EXCLUDE (_ingested) FROM {table}_log "
+                f"QUALIFY row_number() OVER ({_latest(keys)}) = 1"
+            )
+
+        self.repair()
+
+    def _cursor(self):
+
+        # a cursor is a connection to the same database usable by one thread
+        return self.connection.cursor()
+
+    def write(self, dataset: str, symbol: str, data) -> int:
+        """Append the output of a ``Stock.get_*`` method
+
+        Args:
+            dataset: {"price", "dividend", "split", "earning", "news"}
+            symbol: stock symbol
+            data: output of the method in any output mode
+
+        Returns:
+            int: number of rows written
+        """
+
+        return self.write_many(dataset, {symbol: data})
+
+    def write_many(self, dataset: str, outputs: Dict[str, object]) -> int:
+        """Append the outputs of many symbols in a single transaction
+
+        pandas DataFrames and pyarrow Tables are scanned in place; other
+        output modes are converted to a DataFrame first. Columns missing from
+        the dataset schema are not stored. The manifest is confirmed once
+        the transaction commits, with a hash of each symbol's deduped rows.
+
+        Args:
+            dataset: {"price", "dividend", "split", "earning", "news"}
+            outputs: output of the ``Stock.get_*`` method keyed by symbol
+
+        Returns:
+            int: number of rows written
+        """
+
+        table, schema, _, date = table_of(dataset)
+
+        written = 0
+        dates = {}
+        with self._lock:
+            self.manifest.begin(dataset, outputs)
+            cursor = self._cursor()
+            cursor.begin()
+            try:
+                for symbol, data in outputs.items():
+                    buffer = _buffer(data, dataset)
+                    columns = [c for c in schema if c in _columns(buffer)]
+                    if not columns:
+                        continue
+
+                    casts = {
+                        c: f"CAST({_quote(c)} AS {_TYPES.get(schema[c], 'VARCHAR')})"
+                        for c in columns
+                    }
+                    select = ", ".join(f"{casts[c]} AS {_quote(c)}" for c in columns)
+                    cursor.register("buffer", buffer)
+                    cursor.execute(
+                        f"INSERT INTO {table}_log BY NAME "
+                        f"SELECT ? AS symbol, {select} FROM buffer",
+                        [symbol.upper()],
+                    )
+                    if date in casts:
+                        dates[symbol.upper()] = cursor.execute(
+                            f"SELECT min({casts[date]}), max({casts[date]}) "
+                            "FROM buffer"
+                        ).fetchone()
+                    cursor.unregister("buffer")
+                    written += len(buffer)
+                cursor.commit()
+            except Exception:
+                cursor.rollback()
+                self.manifest.cancel(dataset, outputs)
+                raise
+            finally:
+                cursor.close()
+
+            self._index(dataset, dates)
+            # symbols without dated rows have nothing to index
+            self.manifest.cancel(dataset, outputs)
+
+        return written
+
+    def _index(self, dataset: str, dates: Dict[str, tuple]):
+
+        table, schema, _, _ = table_of(dataset)
+        symbols = [symbol for symbol, (start, _) in dates.items() if start is not None]
+        if not symbols:
+            return
+
+        # an order-independent digest of the rows the view keeps
+        digest = f"hash({', '.join(map(_quote, schema))})"
+        rows = (
+            self._cursor()
+            .execute(
+                f"SELECT symbol, count(*), format('{{:016x}}', bit_xor({digest})) "
+                f"FROM {table} WHERE list_contains(?, symbol) GROUP BY symbol",
+                [symbols],
+            )
+            .fetchall()
+        )
+        for symbol, archived, content in rows:
+            start, end = dates[symbol]
+            self.manifest.update(dataset, symbol, start, end, archived, content)
+
+    def repair(self):
+        """Rebuild the manifest entries of writes interrupted by a crash"""
+
+        with self._lock:
+            for dataset, (table, _, _, date) in TABLES.items():
+                symbols = [symbol for _, symbol in self.manifest.pending(dataset)]
+                if not symbols:
+                    continue
+
+                rows = (
+                    self._cursor()
+                    .execute(
+                        f"SELECT symbol, min({_quote(date)}), max({_quote(date)}) "
+                        f"FROM {table} WHERE list_contains(?, symbol) "
+                        "GROUP BY symbol",
+                        [symbols],
+                    )
+                    .fetchall()
+                )
+                self._index(dataset, {symbol: dates for symbol, *dates in rows})
+                self.manifest.cancel(dataset, symbols)
+
+    def write_prices(self, symbol: str, prices) -> int:
+        """Append the output of ``Stock.get_price``, see :meth:`write`"""
+
+        return self.write("price", symbol, prices)
+
+    def last_date(self, symbol: str) -> Optional[pd.Timestamp]:
+        """Last archived price date of a symbol
+
+        Returns:
+            pd.Timestamp: last date, or None when nothing is archived
+        """
+
+        (date,) = (
+            self._cursor()
+            .execute(
+                "SELECT max(date) FROM prices_log WHERE symbol = ?", [symbol.upper()]
+            )
+            .fetchone()
+        )
+
+        return None if date is None else pd.Timestamp(date)
+
+    def query(self, sql: str, params: list = None) -> pd.DataFrame:
+        """Run SQL over the views
+
+        Args:
+            sql: query, e.g. over ``prices``, ``dividends`` or ``splits``
+            params: values of the ``?`` placeholders
+
+        Returns:
+            pd.DataFrame: result of the query
+        """
+
+        return self._cursor().execute(sql, params or []).df()
+
+    def read(
+        self,
+        dataset: str,
+        symbols: Iterable[str] = None,
+        start=None,
+        end=None,
+    ) -> pd.DataFrame:
+        """Read archived rows of a dataset
+
+        Args:
+            dataset: {"price", "dividend", "split", "earning", "news"}
+            symbols: symbols to read. Defaults to all.
+            start: first date, inclusive
+            end: last date, inclusive
+
+        Returns:
+            pd.DataFrame: rows sorted by symbol and date
+        """
+
+        table, _, _, date = table_of(dataset)
+
+        conditions, params = [], []
+        if symbols is not None:
+            conditions.append("list_contains(?, symbol)")
+            params.append([symbol.upper() for symbol in symbols])
+        if start is not None:
+            conditions.append(f"{_quote(date)} >= ?")
+            params.append(pd.Timestamp(start).to_pydatetime())
+        if end is not None:
+            # the whole end day is included
+            conditions.append(f"{_quote(date)} < ?")
+            params.append((pd.Timestamp(end) + pd.Timedelta(days=1)).to_pydatetime())
+
+        sql = f"SELECT * FROM {table}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY symbol, {_quote(date)}"
+
+        return self.query(sql, params)
+
+    def read_prices(self, symbols: Iterable[str] = None, start=None, end=None):
+        """Read archived prices, see :meth:`read`"""
+
+        return self.read("price", symbols, start, end)
+
+    def read_dividends(self, symbols: Iterable[str] = None, start=None, end=None):
+        """Read archived dividends by ex-date, see :meth:`read`"""
+
+        return self.read("dividend", symbols, start, end)
+
+    def read_splits(self, symbols: Iterable[str] = None, start=None, end=None):
+        """Read archived splits by ex-date, see :meth:`read`"""
+
+        return self.read("split", symbols, start, end)
+
+    def compact(self):
+        """Delete rows superseded by later writes of the same key"""
+
+        with self._lock:
+            for table, _, keys, _ in TABLES.values():
+                self.connection.execute(
+                    f"DELETE FROM {table}_log WHERE _ingested IN ("
+                    f"SELECT _ingested FROM {table}_log "
+                    f"QUALIFY row_number() OVER ({_latest(keys)}) > 1)"
+                )
+
+    def close(self):
+
+        self.connection.close()
+        self.manifest.close()
+
+
+def _latest(keys: tuple) -> str:
+
+    partition = ", ".join(_quote(column) for column in ("symbol", *keys))
+
+    return f"PARTITION BY {partition} ORDER BY _ingested DESC"
+
+
+def _buffer(data, dataset: str):
+
+    if isinstance(data, pd.DataFrame) or type(data).__module__.startswith("pyarrow"):
+        return data
+
+    return to_frame(data, dataset)
+
+
+def _columns(buffer) -> List[str]:
+
+    return (
+        list(buffer.columns)
+        if isinstance(buffer, pd.DataFrame)
+        else buffer.column_names
+    )
@@ -0,0 +1,279 @@
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from iexcloud.archive.sync import plan_range
+
+# ranges closer than this are merged, so weekends and holidays leave no gap
+MERGE_DAYS = 5
+
+# names of in-memory manifests, unique within the process
+_memory = itertools.count()
+
+
+class Entry(NamedTuple):
+    """What an archive holds for a symbol and dataset
+
+    ``ranges`` are the (start, end) ISO dates covered, ``fetched`` the epoch
+    time of the last write and ``hash`` a digest of the archived content.
+    """
+
+    dataset: str
+    symbol: str
+    ranges: List[Tuple[str, str]]
+    rows: int
+    fetched: float
+    hash: str
+
+    @property
+    def start(self) -> Optional[pd.Timestamp]:
+
+        return pd.Timestamp(self.ranges[0][0]) if self.ranges else None
+
+    @property
+    def end(self) -> Optional[pd.Timestamp]:
+
+        return pd.Timestamp(self.ranges[-1][1]) if self.ranges else None
+
+
+def content_hash(frame: pd.DataFrame) -> str:
+    """Digest of the values of a DataFrame, independent of its index"""
+
+    digest = pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes()
+
+    return hashlib.sha1(digest).hexdigest()
+
+
+def _merge(ranges: List[list], start: str, end: str) -> List[list]:
+
+    ranges = sorted([*map(list, ranges), [start, end]])
+    merged = [ranges[0]]
+    for first, last in ranges[1:]:
+        gap = pd.Timestamp(first) - pd.Timestamp(merged[-1][1])
+        if gap <= pd.Timedelta(days=MERGE_DAYS):
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+
+    return merged
+
+
+class Manifest(object):
+    def __init__(self, path: str):
+        """Index of what an archive holds per symbol and dataset
+
+        Keeps the covered date ranges, row count, last fetch time and content
+        hash of every symbol and dataset in a small SQLite table, so a fetch
+        plan for a whole universe is one query instead of opening each
+        symbol's data. Updates are transactional.
+
+        Archives whose data cannot share a transaction with the manifest call
+        :meth:`begin` before writing and :meth:`update` after, so writes
+        interrupted in between are listed by :meth:`pending` until repaired.
+
+        Args:
+            path: database file, created if missing, or ":memory:". May be the
+                database of a ``SQLiteArchive``, which then updates it in its
+                own transactions.
+        """
+
+        if path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+
+        self.path: str = path
+        self._local = threading.local()
+        self._uri: str = f"file:manifest-{next(_memory)}?mode=memory&cache=shared"
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS manifest (dataset TEXT, symbol TEXT, "
+                "ranges TEXT, rows INTEGER, fetched REAL, hash TEXT, "
+                "PRIMARY KEY (dataset, symbol)) WITHOUT ROWID"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS manifest_pending (dataset TEXT, "
+                "symbol TEXT, started REAL, PRIMARY KEY (dataset, symbol)) "
+                "WITHOUT ROWID"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+
+        # sqlite3 connections cannot be shared between threads
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            if self.path == ":memory:":
+                # one in-memory database shared by the threads' connections
+                connection = sqlite3.connect(self._uri, timeout=30, uri=True)
+            else:
+                connection = sqlite3.connect(self.path, timeout=30)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+
+        return connection
+
+    def begin(self, dataset: str, symbols: Iterable[str]):
+        """Record writes about to start, confirmed by :meth:`update`
+
+        Args:
+            dataset: Stock attribute name, e.g. "price"
+            symbols: symbols about to be written
+        """
+
+        started = time.time()
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO manifest_pending VALUES (?, ?, ?)",
+                [(dataset, symbol.upper(), started) for symbol in symbols],
+            )
+
+    def cancel(self, dataset: str, symbols: Iterable[str]):
+        """Forget writes begun but not made, e.g. rolled back"""
+
+        with self._connect() as connection:
+            connection.executemany(
+                "DELETE FROM manifest_pending WHERE dataset = ? AND symbol = ?",
+                [(dataset, symbol.upper()) for symbol in symbols],
+            )
+
+    def pending(self, dataset: str = None) -> List[Tuple[str, str]]:
+        """(dataset, symbol) of writes begun but never confirmed, e.g. after a
+        crash, whose entries may not match the archived data"""
+
+        query, params = "SELECT dataset, symbol FROM manifest_pending", ()
+        if dataset is not None:
+            query, params = query + " WHERE dataset = ?", (dataset,)
+
+        return [tuple(row) for row in self._connect().execute(query, params)]
+
+    def update(
+        self,
+        dataset: str,
+        symbol: str,
+        start,
+        end,
+        rows: int,
+        hash: str,
+        connection: sqlite3.Connection = None,
+    ) -> Entry:
+        """Record a write to the archive, confirming it if begun
+
+        Args:
+            dataset: Stock attribute name, e.g. "price"
+            symbol: stock symbol
+            start: first date written
+            end: last date written
+            rows: rows archived for the symbol after the write
+            hash: digest of the archived content, see ``content_hash``
+            connection: connection of an open transaction to update in,
+                e.g. the archive's own. Defaults to a new transaction.
+
+        Returns:
+            Entry: updated entry
+        """
+
+        symbol = symbol.upper()
+        start = pd.Timestamp(start).strftime("%Y-%m-%d")
+        end = pd.Timestamp(end).strftime("%Y-%m-%d")
+
+        def write(connection: sqlite3.Connection) -> Entry:
+            row = connection.execute(
+                "SELECT ranges FROM manifest WHERE dataset = ? AND symbol = ?",
+                (dataset, symbol),
+            ).fetchone()
+            ranges = _merge(json.loads(row[0]) if row else [], start, end)
+            entry = Entry(dataset, symbol, ranges, rows, time.time(), hash)
+            connection.execute(
+                "INSERT OR REPLACE INTO manifest VALUES (?, ?, ?, ?, ?, ?)",
+                (dataset, symbol, json.dumps(ranges), rows, entry.fetched, hash),
+            )
+            connection.execute(
+                "DELETE FROM manifest_pending WHERE dataset = ? AND symbol = ?",
+                (dataset, symbol),
+            )
+            return entry
+
+        if connection is not None:
+            return write(connection)
+
+        with self._connect() as connection:
+            return write(connection)
+
+    def get(self, dataset: str, symbol: str) -> Optional[Entry]:
+        """Entry of a symbol, or None when nothing is archived"""
+
+        row = (
+            self._connect()
+            .execute(
+                "SELECT * FROM manifest WHERE dataset = ? AND symbol = ?",
+                (dataset, symbol.upper()),
+            )
+            .fetchone()
+        )
+
+        return None if row is None else _entry(row)
+
+    def entries(self, dataset: str = None) -> Dict[str, Entry]:
+        """Entries keyed by symbol, of one dataset or all when None"""
+
+        query, params = "SELECT * FROM manifest", ()
+        if dataset is not None:
+            query, params = query + " WHERE dataset = ?", (dataset,)
+
+        return {row[1]: _entry(row) for row in self._connect().execute(query, params)}
+
+    def plan(
+        self, symbols: Iterable[str], dataset: str = "price", today=None
+    ) -> Dict[str, str]:
+        """Chart range to fetch per symbol, from the manifest alone
+
+        Args:
+            symbols: symbols of the universe
+            dataset: dataset to plan
+            today: date of the sync. Defaults to today.
+
+        Returns:
+            Dict[str, str]: time range keyed by symbol, for symbols not up to
+            date. See ``plan_range``.
+        """
+
+        entries = self.entries(dataset)
+        today = pd.Timestamp.today() if today is None else pd.Timestamp(today)
+
+        # most symbols share their last date, so each date is planned once
+        ranges = {}
+        plan = {}
+        for symbol in symbols:
+            entry = entries.get(symbol.upper())
+            end = None if entry is None else entry.ranges[-1][1]
+            if end not in ranges:
+                ranges[end] = plan_range(end, today)
+            if ranges[end] is not None:
+                plan[symbol] = ranges[end]
+
+        return plan
+
+    def close(self):
+
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+def _entry(row: tuple) -> Entry:
+
+    dataset, symbol, ranges, rows, fetched, hash = row
+
+    return Entry(
+        dataset, symbol, [tuple(r) for r in json.loads(ranges)], rows, fetched, hash
+    )
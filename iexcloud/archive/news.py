@@ -0,0 +1,326 @@
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+import zlib
+
+import pandas as pd
+
+from typing import Dict, List, Tuple
+from iexcloud.archive.manifest import Manifest
+from iexcloud.frames import records_to_frame
+from iexcloud.parse import loads
+from iexcloud.result import Result
+from iexcloud.schema import NEWS
+
+# SQLite caps the number of parameters of a statement
+_BATCH = 500
+
+_HEADER = struct.Struct("<I")
+
+
+def article_hash(article: dict) -> str:
+    """Identity of an article: a digest of its time, headline and source"""
+
+    key = "\x1f".join(
+        str(article.get(field)) for field in ("datetime", "headline", "source")
+    )
+
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _records(news) -> List[dict]:
+
+    if isinstance(news, Result):
+        return news.records()
+    if isinstance(news, (str, bytes)):
+        return loads(news)
+    if isinstance(news, pd.DataFrame):
+        frame = news.copy()
+        for column in frame.columns:
+            if pd.api.types.is_datetime64_any_dtype(frame[column]):
+                # back to the millisecond epochs the API sends
+                frame[column] = frame[column].astype("datetime64[ms]").astype("int64")
+        return json.loads(frame.to_json(orient="records"))
+
+    return list(news)
+
+
+def _tickers(article: dict, symbol: str = None) -> set:
+
+    related = article.get("related") or ""
+    tickers = {ticker.strip().upper() for ticker in related.split(",")}
+    if symbol is not None:
+        tickers.add(symbol.upper())
+
+    return tickers - {""}
+
+
+class NewsLog(object):
+    def __init__(
+        self,
+        root: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        compression: int = 6,
+    ):
+        """Append-only news store deduped on content, indexed by ticker
+
+        Articles are deduped on a hash of their time, headline and source,
+        and new ones are appended as one zlib-compressed block to the current
+        segment file. An index in ``<root>/index.sqlite`` maps each hash to
+        its block, and each ticker of ``related`` to its articles, so news of
+        a ticker is a lookup instead of a scan. Its ``manifest`` table, see
+        ``manifest``, is updated per ticker in the same transaction.
+
+        Args:
+            root: directory of the log, created if missing
+            segment_bytes: size after which a new segment is started
+            compression: zlib compression level
+        """
+
+        os.makedirs(root, exist_ok=True)
+
+        self.root: str = root
+        self.segment_bytes: int = segment_bytes
+        self.compression: int = compression
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.manifest: Manifest = Manifest(os.path.join(root, "index.sqlite"))
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS articles (hash TEXT PRIMARY KEY, "
+                "datetime INTEGER, segment INTEGER, offset INTEGER, "
+                "position INTEGER)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS articles_datetime ON articles (datetime)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS tickers (ticker TEXT, datetime INTEGER, "
+                "hash TEXT, PRIMARY KEY (ticker, datetime, hash)) WITHOUT ROWID"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+
+        # sqlite3 connections cannot be shared between threads
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            path = os.path.join(self.root, "index.sqlite")
+            connection = sqlite3.connect(path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+
+        return connection
+
+    def _segment(self, segment: int) -> str:
+
+        return os.path.join(self.root, f"segment-{segment:06d}.log")
+
+    def _append_block(self, articles: List[dict]) -> Tuple[int, int]:
+
+        segments = [
+            int(name[8:14])
+            for name in os.listdir(self.root)
+            if name.startswith("segment-") and name.endswith(".log")
+        ]
+        segment = max(segments, default=1)
+        path = self._segment(segment)
+        if os.path.exists(path) and os.path.getsize(path) >= self.segment_bytes:
+            segment += 1
+            path = self._segment(segment)
+
+        block = zlib.compress(json.dumps(articles).encode("utf-8"), self.compression)
+        with open(path, "ab") as file:
+            offset = file.tell()
+            file.write(_HEADER.pack(len(block)) + block)
+            file.flush()
+            os.fsync(file.fileno())
+
+        return segment, offset
+
+    def append(self, news, symbol: str = None) -> int:
+        """Append the articles not stored yet
+
+        The index is locked for writing before articles are deduped, so
+        processes appending the same news to one log store it once. The
+        block is written before the index is committed, so a crash in between
+        leaves an unreferenced block and the articles are appended again by
+        the next poll.
+
+        Args:
+            news: output of ``Stock.get_news`` in any output mode
+            symbol: symbol the news was fetched for, indexed besides ``related``
+
+        Returns:
+            int: number of new articles
+        """
+
+        articles = {}
+        for article in _records(news):
+            articles.setdefault(article_hash(article), article)
+
+        with self._lock:
+            connection = self._connect()
+            # other writers wait from here until the commit, so none of them
+            # appends articles found missing here
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                hashes = list(articles)
+                for i in range(0, len(hashes), _BATCH):
+                    batch = hashes[i : i + _BATCH]
+                    query = (
+                        "SELECT hash FROM articles "
+                        f"WHERE hash IN ({', '.join('?' * len(batch))})"
+                    )
+                    for (known,) in connection.execute(query, batch):
+                        del articles[known]
+
+                if articles:
+                    segment, offset = self._append_block(list(articles.values()))
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (key, article.get("datetime"), segment, offset, position)
+                            for position, (key, article) in enumerate(articles.items())
+                        ],
+                    )
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO tickers VALUES (?, ?, ?)",
+                        [
+                            (ticker, article.get("datetime"), key)
+                            for key, article in articles.items()
+                            for ticker in _tickers(article, symbol)
+                        ],
+                    )
+                    self._index(connection, articles, symbol)
+            except BaseException:
+                connection.rollback()
+                raise
+            else:
+                connection.commit()
+
+        return len(articles)
+
+    def _index(self, connection: sqlite3.Connection, articles: dict, symbol: str):
+
+        added: Dict[str, list] = {}
+        for key, article in articles.items():
+            for ticker in _tickers(article, symbol):
+                added.setdefault(ticker, []).append((key, article.get("datetime")))
+
+        for ticker, rows in added.items():
+            times = [when for _, when in rows if when is not None]
+            if not times:
+                continue
+
+            (count,) = connection.execute(
+                "SELECT COUNT(*) FROM tickers WHERE ticker = ?", (ticker,)
+            ).fetchone()
+            previous = connection.execute(
+                "SELECT hash FROM manifest WHERE dataset = 'news' AND symbol = ?",
+                (ticker,),
+            ).fetchone()
+            # articles are only added, so the XOR of their hashes is updated
+            # with the new ones instead of reading the ticker's articles again
+            digest = 0 if previous is None else int(previous[0], 16)
+            for key, _ in rows:
+                digest ^= int(key, 16)
+
+            self.manifest.update(
+                "news",
+                ticker,
+                pd.Timestamp(min(times), unit="ms"),
+                pd.Timestamp(max(times), unit="ms"),
+                count,
+                f"{digest:040x}",
+                connection,
+            )
+
+    def articles(self, ticker: str = None, start=None, end=None) -> List[dict]:
+        """Stored articles, oldest first
+
+        Args:
+            ticker: only articles mentioning this ticker. Defaults to all.
+            start: first time, inclusive
+            end: last date, inclusive
+
+        Returns:
+            List[dict]: articles as sent by the API
+        """
+
+        if ticker is None:
+            query = "SELECT segment, offset, position FROM articles a"
+            conditions, params = [], []
+        else:
+            query = (
+                "SELECT a.segment, a.offset, a.position FROM tickers t "
+                "JOIN articles a ON a.hash = t.hash"
+            )
+            conditions, params = ["t.ticker = ?"], [ticker.upper()]
+
+        # the ticker index is ordered by time, so ranges of a ticker are seeks
+        column = "a.datetime" if ticker is None else "t.datetime"
+        if start is not None:
+            conditions.append(f"{column} >= ?")
+            params.append(_epoch(pd.Timestamp(start)))
+        if end is not None:
+            # the whole end day is included
+            conditions.append(f"{column} < ?")
+            params.append(_epoch(pd.Timestamp(end).normalize() + pd.Timedelta(days=1)))
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {column}"
+
+        blocks: Dict[Tuple[int, int], list] = {}
+        articles = []
+        for segment, offset, position in self._connect().execute(query, params):
+            if (segment, offset) not in blocks:
+                blocks[segment, offset] = self._read_block(segment, offset)
+            articles.append(blocks[segment, offset][position])
+
+        return articles
+
+    def read(self, ticker: str = None, start=None, end=None) -> pd.DataFrame:
+        """Stored articles as a DataFrame, see :meth:`articles`"""
+
+        return records_to_frame(self.articles(ticker, start, end), NEWS)
+
+    def _read_block(self, segment: int, offset: int) -> list:
+
+        with open(self._segment(segment), "rb") as file:
+            file.seek(offset)
+            (size,) = _HEADER.unpack(file.read(_HEADER.size))
+            return loads(zlib.decompress(file.read(size)))
+
+    def tickers(self) -> List[str]:
+        """Indexed tickers"""
+
+        rows = self._connect().execute("SELECT DISTINCT ticker FROM tickers")
+
+        return sorted(ticker for (ticker,) in rows)
+
+    def __len__(self) -> int:
+
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM articles").fetchone()
+
+        return count
+
+    def close(self):
+
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+        self.manifest.close()
+
+
+def _epoch(timestamp: pd.Timestamp) -> int:
+
+    return int(timestamp.value // 1_000_000)
@@ -0,0 +1,345 @@
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, Iterable, List, Optional
+from iexcloud.archive.convert import to_frame
+from iexcloud.archive.manifest import Manifest
+
+FIELDS = ("open", "high", "low", "close", "volume", "uOpen", "uHigh", "uLow", "uClose")
+
+# trading days added when a date falls past the end of the arrays, ~4 years
+_GROW_DAYS = 1024
+
+
+class PriceStore(object):
+    def __init__(
+        self,
+        root: str,
+        start="2000-01-03",
+        fields: Iterable[str] = FIELDS,
+        dtype: str = "float64",
+        readonly: bool = False,
+    ):
+        """Memory-mapped price panel of symbols × trading days per field
+
+        Each field is a fixed-width ``.npy`` file holding a 2-D array with one
+        row per symbol and one column per weekday since ``start``. Holidays
+        and missing bars are NaN. A date maps to its column arithmetically,
+        so nothing is parsed when a store is opened, and processes mapping
+        the same files share their pages through the OS cache.
+
+        Options are fixed when the store is created and read from disk after.
+        ``manifest`` indexes what is stored in ``<root>/manifest.sqlite``,
+        with a hash of each symbol's rows.
+
+        Args:
+            root: directory of the store, created if missing
+            start: first date of the arrays
+            fields: price columns stored, see ``iexcloud.schema.PRICE``
+            dtype: dtype of the arrays, e.g. "float32" to halve their size
+            readonly: whether to map the files read-only
+        """
+
+        self.root: str = root
+        self.readonly: bool = readonly
+        self._lock = threading.Lock()
+        self._arrays: Dict[str, np.memmap] = {}
+
+        meta = os.path.join(root, "meta.json")
+        if os.path.exists(meta):
+            with open(meta) as file:
+                self.meta: dict = json.load(file)
+        else:
+            if readonly:
+                raise FileNotFoundError(f"No price store in {root}")
+
+            os.makedirs(root, exist_ok=True)
+            start = np.datetime64(pd.Timestamp(start).date(), "D")
+            self.meta = {
+                "start": str(np.busday_offset(start, 0, roll="forward")),
+                "days": 0,
+                "fields": list(fields),
+                "dtype": str(np.dtype(dtype)),
+                "symbols": [],
+            }
+            self._save_meta()
+
+        self._rows: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+        self.manifest: Manifest = Manifest(os.path.join(root, "manifest.sqlite"))
+        if not readonly:
+            self.repair()
+
+    @property
+    def symbols(self) -> List[str]:
+
+        return self.meta["symbols"]
+
+    @property
+    def fields(self) -> List[str]:
+
+        return self.meta["fields"]
+
+    @property
+    def start(self) -> np.datetime64:
+
+        return np.datetime64(self.meta["start"], "D")
+
+    def dates(self, start=None, end=None) -> np.ndarray:
+        """Weekdays covered by the arrays, between start and end inclusive
+
+        Returns:
+            np.ndarray: datetime64[D] dates, one per column
+        """
+
+        first, last = self._columns(start, end)
+
+        return np.busday_offset(self.start, np.arange(first, last))
+
+    def _column(self, date) -> int:
+
+        date = np.datetime64(pd.Timestamp(date).date(), "D")
+        return int(np.busday_count(self.start, date))
+
+    def _columns(self, start, end) -> tuple:
+
+        first = 0 if start is None else max(self._column(start), 0)
+        if end is None:
+            last = self.meta["days"]
+        else:
+            # an end on a weekend still includes the Friday before
+            end = np.datetime64(pd.Timestamp(end).date(), "D") + 1
+            last = min(int(np.busday_count(self.start, end)), self.meta["days"])
+
+        return first, max(first, last)
+
+    def _path(self, field: str) -> str:
+
+        return os.path.join(self.root, f"{field}.npy")
+
+    def _save_meta(self):
+
+        # replaced atomically, readers never see a partial file
+        path = os.path.join(self.root, "meta.json")
+        tmp = os.path.join(self.root, ".meta.json.tmp")
+        with open(tmp, "w") as file:
+            json.dump(self.meta, file)
+        os.replace(tmp, path)
+
+    def _open(self, field: str) -> Optional[np.memmap]:
+
+        array = self._arrays.get(field)
+        if array is None and os.path.exists(self._path(field)):
+            array = np.load(self._path(field), mmap_mode="r" if self.readonly else "r+")
+            self._arrays[field] = array
+
+        return array
+
+    def refresh(self):
+        """Reload the files after another process wrote to the store"""
+
+        with open(os.path.join(self.root, "meta.json")) as file:
+            self.meta = json.load(file)
+
+        self._rows = {s: i for i, s in enumerate(self.symbols)}
+        self._arrays = {}
+
+    def array(self, field: str) -> np.ndarray:
+        """Whole array of a field, symbols × days, mapped without copying"""
+
+        if field not in self.fields:
+            raise ValueError(f"Field {field!r} is not stored")
+
+        rows, days = len(self.symbols), self.meta["days"]
+        array = self._open(field)
+        if array is None:
+            return np.full((rows, days), np.nan, dtype=self.meta["dtype"])
+
+        # files hold spare rows and days for later writes
+        return array[:rows, :days]
+
+    def panel(
+        self, field: str, symbols: Iterable[str] = None, start=None, end=None
+    ) -> np.ndarray:
+        """Values of a field, symbols × days
+
+        Without symbols this is a view of the mapped file, so no data is read
+        until it is accessed.
+
+        Args:
+            field: stored price column, e.g. "close"
+            symbols: rows to select, in this order. Defaults to all symbols.
+            start: first date, inclusive
+            end: last date, inclusive
+
+        Returns:
+            np.ndarray: values, NaN where no bar is stored
+        """
+
+        first, last = self._columns(start, end)
+        array = self.array(field)
+
+        if symbols is None:
+            return array[:, first:last]
+
+        rows = [self._rows[symbol.upper()] for symbol in symbols]
+        return array[rows, first:last]
+
+    def frame(
+        self, field: str, symbols: Iterable[str] = None, start=None, end=None
+    ) -> pd.DataFrame:
+        """Values of a field as a DataFrame indexed by date, one column per symbol"""
+
+        symbols = self.symbols if symbols is None else [s.upper() for s in symbols]
+        values = self.panel(field, symbols, start, end)
+
+        return pd.DataFrame(
+            values.T,
+            index=pd.DatetimeIndex(self.dates(start, end), name="date"),
+            columns=symbols,
+        )
+
+    def write_prices(self, symbol: str, prices) -> int:
+        """Store daily prices of a symbol, overwriting the same dates
+
+        Args:
+            symbol: stock symbol
+            prices: output of ``Stock.get_price`` in any output mode
+
+        Raises:
+            ValueError: when a date is before the start of the store
+
+        Returns:
+            int: number of bars written
+        """
+
+        if self.readonly:
+            raise ValueError("The price store is read-only")
+
+        frame = to_frame(prices, "price")
+        if frame.empty:
+            return 0
+
+        dates = pd.to_datetime(frame["date"]).values.astype("datetime64[D]")
+        weekdays = np.is_busday(dates)
+        frame, dates = frame[weekdays], dates[weekdays]
+
+        columns = np.busday_count(self.start, dates)
+        if len(columns) and columns.min() < 0:
+            raise ValueError(f"Dates before {self.meta['start']} cannot be stored")
+
+        symbol = symbol.upper()
+        with self._lock:
+            self.manifest.begin("price", [symbol])
+            if symbol not in self._rows:
+                self._rows[symbol] = len(self.symbols)
+                self.symbols.append(symbol)
+
+            days = max(self.meta["days"], int(columns.max()) + 1 if len(columns) else 0)
+            self._reserve(len(self.symbols), days)
+
+            row = self._rows[symbol]
+            for field in self.fields:
+                if field in frame:
+                    values = frame[field].to_numpy(dtype=float, na_value=np.nan)
+                    self._arrays[field][row, columns] = values
+
+            for array in self._arrays.values():
+                array.flush()
+
+            self.meta["days"] = days
+            self._save_meta()
+
+            if len(dates):
+                self._index(symbol, dates.min(), dates.max())
+            else:
+                self.manifest.cancel("price", [symbol])
+
+        return len(columns)
+
+    def _index(self, symbol: str, start, end):
+
+        row = self._rows[symbol]
+        digest = hashlib.sha1()
+        for field in self.fields:
+            digest.update(np.ascontiguousarray(self.array(field)[row]).tobytes())
+
+        columns = self._stored(symbol)
+        stored = 0 if columns is None else len(columns)
+
+        self.manifest.update("price", symbol, start, end, stored, digest.hexdigest())
+
+    def repair(self):
+        """Rebuild the manifest entries of writes interrupted by a crash"""
+
+        with self._lock:
+            for _, symbol in self.manifest.pending("price"):
+                first = self.first_date(symbol)
+                if first is None:
+                    self.manifest.cancel("price", [symbol])
+                else:
+                    self._index(symbol, first, self.last_date(symbol))
+
+    def _reserve(self, rows: int, days: int):
+
+        for field in self.fields:
+            array = self._open(field)
+            size = (0, 0) if array is None else array.shape
+            if size[0] >= rows and size[1] >= days:
+                continue
+
+            # rows double and days grow by years, so files are rarely rewritten
+            shape = (
+                max(rows, 2 * size[0], 16) if rows > size[0] else size[0],
+                days + _GROW_DAYS if days > size[1] else size[1],
+            )
+            tmp = os.path.join(self.root, f".{field}.npy.tmp")
+            grown = np.lib.format.open_memmap(
+                tmp, mode="w+", dtype=self.meta["dtype"], shape=shape
+            )
+            grown[:] = np.nan
+            if array is not None:
+                grown[: size[0], : size[1]] = array
+            grown.flush()
+            del grown
+
+            self._arrays.pop(field, None)
+            os.replace(tmp, self._path(field))
+            self._open(field)
+
+    def first_date(self, symbol: str) -> Optional[pd.Timestamp]:
+        """First date with a close of a symbol, see :meth:`last_date`"""
+
+        columns = self._stored(symbol)
+
+        return None if columns is None else self._date(columns[0])
+
+    def last_date(self, symbol: str) -> Optional[pd.Timestamp]:
+        """Last date with a close of a symbol
+
+        Returns:
+            pd.Timestamp: last date, or None when nothing is stored
+        """
+
+        columns = self._stored(symbol)
+
+        return None if columns is None else self._date(columns[-1])
+
+    def _stored(self, symbol: str) -> Optional[np.ndarray]:
+
+        row = self._rows.get(symbol.upper())
+        field = "close" if "close" in self.fields else self.fields[0]
+        if row is None:
+            return None
+
+        (columns,) = np.nonzero(~np.isnan(self.array(field)[row]))
+
+        return columns if len(columns) else None
+
+    def _date(self, column: int) -> pd.Timestamp:
+
+        return pd.Timestamp(np.busday_offset(self.start, column))
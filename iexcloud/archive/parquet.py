@@ -0,0 +1,276 @@
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+from typing import Iterable, List, Optional
+from iexcloud.archive.convert import to_frame
+from iexcloud.archive.manifest import Manifest, content_hash
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None
+
+PRICES = "prices"
+
+# footer key holding the content hash of a partition
+_HASH = b"iexcloud.hash"
+
+
+class ParquetArchive(object):
+    def __init__(self, root: str):
+        """Daily price history in a Parquet dataset partitioned by symbol and year
+
+        Files are laid out as ``<root>/prices/symbol=KO/year=2020/part-0.parquet``
+        so reads filtering on symbols and dates only open matching files. A
+        partition is rewritten atomically when rows are appended to it; one
+        process should write to an archive at a time. ``manifest`` indexes
+        what is archived in ``<root>/manifest.sqlite``: a write is recorded
+        as pending before partitions are replaced and confirmed after, and
+        writes left pending by a crash are repaired when the archive opens.
+
+        Args:
+            root: directory of the archive, created if missing
+
+        Raises:
+            ImportError: when pyarrow is not installed
+        """
+
+        if pa is None:  # pragma: no cover
+            raise ImportError("Parquet archives require pyarrow: pip install pyarrow")
+
+        self.root: str = root
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.join(root, PRICES), exist_ok=True)
+        self.manifest: Manifest = Manifest(os.path.join(root, "manifest.sqlite"))
+        self.repair()
+
+    def _symbol_dir(self, symbol: str) -> str:
+
+        if not symbol or os.sep in symbol or symbol.startswith("."):
+            raise ValueError(f"Invalid symbol {symbol!r}")
+
+        return os.path.join(self.root, PRICES, f"symbol={symbol.upper()}")
+
+    def _partition(self, symbol: str, year: int) -> str:
+
+        return os.path.join(self._symbol_dir(symbol), f"year={year}", "part-0.parquet")
+
+    def write_prices(self, symbol: str, prices) -> int:
+        """Append daily prices of a symbol, replacing rows with the same date
+
+        Args:
+            symbol: stock symbol
+            prices: output of ``Stock.get_price`` in any output mode
+
+        Returns:
+            int: number of dates not archived before
+        """
+
+        frame = to_frame(prices, "price")
+        if frame.empty:
+            return 0
+
+        # the symbol is the partition key, so it is not stored in the files
+        frame = frame.drop(columns=["symbol"], errors="ignore")
+        frame["date"] = pd.to_datetime(frame["date"]).astype("datetime64[ms]")
+        frame = frame.dropna(subset=["date"])
+
+        added = 0
+        with self._lock:
+            self.manifest.begin("price", [symbol])
+            for year, rows in frame.groupby(frame["date"].dt.year):
+                path = self._partition(symbol, year)
+
+                before = 0
+                if os.path.exists(path):
+                    existing = pd.read_parquet(path)
+                    before = len(existing)
+                    rows = pd.concat([existing, rows], ignore_index=True)
+
+                rows = (
+                    rows.drop_duplicates("date", keep="last")
+                    .sort_values("date")
+                    .reset_index(drop=True)
+                )
+                _write_atomic(rows, path)
+                added += len(rows) - before
+
+            self._index(symbol, frame["date"].min(), frame["date"].max())
+
+        return added
+
+    def _index(self, symbol: str, start, end):
+
+        # partitions hash their content in their footer, so the hash of the
+        # symbol only reads footers
+        digest = hashlib.sha1()
+        archived = 0
+        for year in self.years(symbol):
+            path = self._partition(symbol, year)
+            metadata = pq.read_metadata(path)
+            archived += metadata.num_rows
+            partition = (metadata.metadata or {}).get(_HASH)
+            if partition is None:
+                # written before partitions were hashed
+                partition = content_hash(pd.read_parquet(path)).encode()
+            digest.update(b"%d:%s;" % (year, partition))
+
+        self.manifest.update("price", symbol, start, end, archived, digest.hexdigest())
+
+    def repair(self):
+        """Rebuild the manifest entries of writes interrupted by a crash"""
+
+        with self._lock:
+            symbols = [symbol for _, symbol in self.manifest.pending("price")]
+            for symbol in symbols:
+                dates = self.read_prices([symbol], columns=[])["date"]
+                if dates.empty:
+                    self.manifest.cancel("price", [symbol])
+                else:
+                    self._index(symbol, dates.min(), dates.max())
+
+    def symbols(self) -> List[str]:
+        """Archived symbols"""
+
+        return sorted(
+            name.split("=", 1)[1]
+            for name in os.listdir(os.path.join(self.root, PRICES))
+            if name.startswith("symbol=")
+        )
+
+    def years(self, symbol: str) -> List[int]:
+        """Archived years of a symbol"""
+
+        path = self._symbol_dir(symbol)
+        if not os.path.isdir(path):
+            return []
+
+        return sorted(
+            int(name.split("=", 1)[1])
+            for name in os.listdir(path)
+            if name.startswith("year=")
+        )
+
+    def last_date(self, symbol: str) -> Optional[pd.Timestamp]:
+        """Last archived date of a symbol, from the manifest when indexed
+
+        Returns:
+            pd.Timestamp: last date, or None when nothing is archived
+        """
+
+        entry = self.manifest.get("price", symbol)
+        if entry is not None:
+            return entry.end
+
+        # archived before the manifest: only the latest partition is read
+        years = self.years(symbol)
+        if not years:
+            return None
+
+        dates = pd.read_parquet(self._partition(symbol, years[-1]), columns=["date"])
+
+        return dates["date"].max()
+
+    def read_prices(
+        self,
+        symbols: Iterable[str] = None,
+        start=None,
+        end=None,
+        columns: List[str] = None,
+    ) -> pd.DataFrame:
+        """Read archived prices, opening only the partitions that can match
+
+        Example:
+            >>> archive.read_prices(["AAPL", "KO"], "2019-01-01", "2019-12-31")
+
+        Args:
+            symbols: symbols to read. Defaults to all.
+            start: first date, inclusive
+            end: last date, inclusive
+            columns: columns to read besides symbol and date. Defaults to all.
+
+        Returns:
+            pd.DataFrame: prices sorted by symbol and date
+        """
+
+        start = None if start is None else pd.Timestamp(start)
+        end = None if end is None else pd.Timestamp(end)
+
+        predicate = None
+        if symbols is not None:
+            symbols = [symbol.upper() for symbol in symbols]
+            predicate = _and(predicate, ds.field("symbol").isin(symbols))
+        if start is not None:
+            predicate = _and(predicate, ds.field("year") >= start.year)
+            predicate = _and(predicate, ds.field("date") >= _timestamp(start))
+        if end is not None:
+            predicate = _and(predicate, ds.field("year") <= end.year)
+            predicate = _and(predicate, ds.field("date") <= _timestamp(end))
+
+        dataset = self._dataset(PRICES, predicate)
+        if dataset is None:
+            return pd.DataFrame(columns=["symbol", "date", *(columns or [])])
+
+        if columns is not None:
+            columns = ["symbol", "date", *(c for c in columns if c != "date")]
+        else:
+            columns = ["symbol", *(n for n in dataset.schema.names if n != "symbol")]
+            columns.remove("year")
+
+        frame = dataset.to_table(columns=columns, filter=predicate).to_pandas()
+
+        return frame.sort_values(["symbol", "date"], ignore_index=True)
+
+    def _dataset(self, name: str, predicate) -> Optional["ds.Dataset"]:
+
+        partitioning = ds.partitioning(
+            pa.schema([("symbol", pa.string()), ("year", pa.int32())]), flavor="hive"
+        )
+        base = os.path.join(self.root, name)
+        dataset = ds.dataset(base, format="parquet", partitioning=partitioning)
+
+        # partitions are pruned from their paths, before any file is opened
+        fragments = list(dataset.get_fragments(filter=predicate))
+        if not fragments:
+            return None
+
+        # columns may differ between files, e.g. fields added by the API later
+        schema = pa.unify_schemas(
+            [fragment.physical_schema for fragment in fragments] + [partitioning.schema]
+        )
+
+        return ds.dataset(
+            [fragment.path for fragment in fragments],
+            schema=schema,
+            format="parquet",
+            partitioning=partitioning,
+            partition_base_dir=base,
+        )
+
+
+def _and(predicate, condition):
+
+    return condition if predicate is None else predicate & condition
+
+
+def _timestamp(value: pd.Timestamp) -> "pa.Scalar":
+
+    return pa.scalar(value.to_datetime64().astype("datetime64[ms]"))
+
+
+def _write_atomic(frame: pd.DataFrame, path: str):
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # the leading dot hides the partial file from dataset discovery
+    tmp = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), _HASH: content_hash(frame).encode()}
+    pq.write_table(table.replace_schema_metadata(metadata), tmp)
+    os.replace(tmp, path)
@@ -0,0 +1,344 @@
+import hashlib
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from typing import Dict, Iterable, Iterator, List, Optional
+from iexcloud.archive.convert import TABLES, table_of, to_frame
+from iexcloud.archive.manifest import Manifest
+
+_AFFINITIES = {"float": "REAL", "int": "INTEGER", "bool": "INTEGER"}
+_DTYPES = {"float": "float64", "int": "Int64", "bool": "boolean"}
+
+# keys looked up per query, below SQLite's default limit of 999 parameters
+_LOOKUP = 400
+
+
+def _quote(column: str) -> str:
+
+    return f'"{column}"'
+
+
+class SQLiteArchive(object):
+    def __init__(self, path: str):
+        """Prices, corporate actions, earnings and news in one SQLite file
+
+        Each dataset has a table keyed by symbol and date (or fiscal period,
+        or time and headline for news) holding the columns of its schema,
+        see ``iexcloud.schema``; other columns are not stored. Dates are ISO
+        strings. Writes are upserts batched with ``executemany`` in one
+        transaction, so rewriting a range is idempotent. The ``manifest``
+        table is updated in the same transaction, with an order-independent
+        digest of the stored rows of the symbol.
+
+        Args:
+            path: database file, created if missing
+        """
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path: str = path
+        self._local = threading.local()
+        self.manifest: Manifest = Manifest(path)
+
+        with self._connect() as connection:
+            for table, schema, keys, date in TABLES.values():
+                columns = ", ".join(
+                    f"{_quote(column)} {_AFFINITIES.get(kind, 'TEXT')}"
+                    + (" NOT NULL" if column in keys else "")
+                    for column, kind in schema.items()
+                )
+                key = ", ".join(_quote(column) for column in ("symbol", *keys))
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} (symbol TEXT NOT NULL, "
+                    f"{columns}, PRIMARY KEY ({key})) WITHOUT ROWID"
+                )
+                # cross-sectional reads, e.g. every symbol on a date
+                connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_{date} "
+                    f"ON {table} ({_quote(date)})"
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+
+        # sqlite3 connections cannot be shared between threads
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+
+        return connection
+
+    def write(self, dataset: str, symbol: str, data) -> int:
+        """Upsert the output of a ``Stock.get_*`` method
+
+        Args:
+            dataset: {"price", "dividend", "split", "earning", "news"}
+            symbol: stock symbol
+            data: output of the method in any output mode
+
+        Returns:
+            int: number of rows written
+        """
+
+        return self.write_many(dataset, {symbol: data})
+
+    def write_many(self, dataset: str, outputs: Dict[str, object]) -> int:
+        """Upsert the outputs of many symbols in a single transaction
+
+        Args:
+            dataset: {"price", "dividend", "split", "earning", "news"}
+            outputs: output of the ``Stock.get_*`` method keyed by symbol
+
+        Returns:
+            int: number of rows written
+        """
+
+        table, schema, keys, date = table_of(dataset)
+        columns = ["symbol", *schema]
+        updates = ", ".join(
+            f"{_quote(column)} = excluded.{_quote(column)}"
+            for column in schema
+            if column not in keys
+        )
+        statement = (
+            f"INSERT INTO {table} ({', '.join(map(_quote, columns))}) "
+            f"VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT ({', '.join(map(_quote, ('symbol', *keys)))}) "
+            f"DO UPDATE SET {updates}"
+        )
+
+        positions = [columns.index(key) for key in keys]
+        select = f"SELECT {', '.join(map(_quote, columns))} FROM {table}"
+        count = f"SELECT COUNT(*) FROM {table} WHERE symbol = ?"
+
+        written = 0
+        with self._connect() as connection:
+            for symbol, data in outputs.items():
+                frame = to_frame(data, dataset)
+                rows = _rows(frame, symbol.upper(), schema, keys)
+                if not rows:
+                    continue
+
+                # the digest is a XOR of row digests: the rows replaced by the
+                # upsert are taken out and the stored ones put in, instead of
+                # reading every row of the symbol again. It is rebuilt when
+                # the manifest missed rows, e.g. written without a date.
+                (before,) = connection.execute(count, (symbol.upper(),)).fetchone()
+                previous = connection.execute(
+                    "SELECT rows, hash FROM manifest WHERE dataset = ? AND symbol = ?",
+                    (dataset, symbol.upper()),
+                ).fetchone()
+                written_keys = list(
+                    dict.fromkeys(tuple(row[i] for i in positions) for row in rows)
+                )
+                incremental = previous is not None and previous[0] == before
+                if incremental:
+                    digest = int(previous[1], 16) ^ _digest(
+                        _lookup(connection, select, keys, symbol.upper(), written_keys)
+                    )
+
+                connection.executemany(statement, rows)
+                written += len(rows)
+
+                (archived,) = connection.execute(count, (symbol.upper(),)).fetchone()
+                if incremental:
+                    digest ^= _digest(
+                        _lookup(connection, select, keys, symbol.upper(), written_keys)
+                    )
+                else:
+                    digest = _digest(
+                        connection.execute(
+                            f"{select} WHERE symbol = ?", (symbol.upper(),)
+                        )
+                    )
+
+                dates = pd.to_datetime(frame[date]) if date in frame else None
+                if dates is not None and dates.notna().any():
+                    self.manifest.update(
+                        dataset,
+                        symbol,
+                        dates.min(),
+                        dates.max(),
+                        archived,
+                        f"{digest:040x}",
+                        connection,
+                    )
+
+        return written
+
+    def write_prices(self, symbol: str, prices) -> int:
+        """Upsert the output of ``Stock.get_price``, see :meth:`write`"""
+
+        return self.write("price", symbol, prices)
+
+    def last_date(self, symbol: str) -> Optional[pd.Timestamp]:
+        """Last archived price date of a symbol
+
+        Returns:
+            pd.Timestamp: last date, or None when nothing is archived
+        """
+
+        (date,) = (
+            self._connect()
+            .execute("SELECT MAX(date) FROM prices WHERE symbol = ?", (symbol.upper(),))
+            .fetchone()
+        )
+
+        return None if date is None else pd.Timestamp(date)
+
+    def read(
+        self,
+        dataset: str,
+        symbols: Iterable[str] = None,
+        start=None,
+        end=None,
+    ) -> pd.DataFrame:
+        """Read archived rows of a dataset
+
+        Args:
+            dataset: {"price", "dividend", "split", "earning", "news"}
+            symbols: symbols to read. Defaults to all.
+            start: first date, inclusive
+            end: last date, inclusive
+
+        Returns:
+            pd.DataFrame: rows sorted by symbol and date
+        """
+
+        table, schema, keys, date = table_of(dataset)
+
+        conditions, params = [], []
+        if symbols is not None:
+            symbols = [symbol.upper() for symbol in symbols]
+            conditions.append(f"symbol IN ({', '.join('?' * len(symbols))})")
+            params.extend(symbols)
+        if start is not None:
+            conditions.append(f"{_quote(date)} >= ?")
+            params.append(_format(pd.Timestamp(start), date))
+        if end is not None:
+            # ISO strings compare like dates; the whole end day is included
+            conditions.append(f"{_quote(date)} < ?")
+            params.append(_format(pd.Timestamp(end) + pd.Timedelta(days=1), date))
+
+        query = f"SELECT * FROM {table}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY symbol, {_quote(date)}"
+
+        frame = pd.read_sql_query(query, self._connect(), params=params)
+
+        # columns holding only NULLs come back as objects
+        for column, kind in schema.items():
+            if kind == "datetime":
+                frame[column] = pd.to_datetime(frame[column])
+            elif kind in _DTYPES:
+                frame[column] = frame[column].astype(_DTYPES[kind])
+
+        return frame
+
+    def read_prices(self, symbols: Iterable[str] = None, start=None, end=None):
+        """Read archived prices, see :meth:`read`"""
+
+        return self.read("price", symbols, start, end)
+
+    def read_dividends(self, symbols: Iterable[str] = None, start=None, end=None):
+        """Read archived dividends by ex-date, see :meth:`read`"""
+
+        return self.read("dividend", symbols, start, end)
+
+    def read_splits(self, symbols: Iterable[str] = None, start=None, end=None):
+        """Read archived splits by ex-date, see :meth:`read`"""
+
+        return self.read("split", symbols, start, end)
+
+    def read_earnings(self, symbols: Iterable[str] = None, start=None, end=None):
+        """Read archived earnings by report date, see :meth:`read`"""
+
+        return self.read("earning", symbols, start, end)
+
+    def read_news(self, symbols: Iterable[str] = None, start=None, end=None):
+        """Read archived news by publication time, see :meth:`read`"""
+
+        return self.read("news", symbols, start, end)
+
+    def close(self):
+
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+        self.manifest.close()
+
+
+def _format(dates, column: str):
+
+    # news are timestamped, other datasets are daily
+    fmt = "%Y-%m-%d %H:%M:%S" if column == "datetime" else "%Y-%m-%d"
+
+    return (
+        dates.strftime(fmt)
+        if isinstance(dates, pd.Timestamp)
+        else dates.dt.strftime(fmt)
+    )
+
+
+def _digest(rows: Iterable[tuple]) -> int:
+
+    # XOR of the row digests, independent of the order rows are stored in
+    digest = 0
+    for row in rows:
+        digest ^= int.from_bytes(
+            hashlib.sha1(repr(row).encode("utf-8")).digest(), "big"
+        )
+
+    return digest
+
+
+def _lookup(
+    connection: sqlite3.Connection,
+    select: str,
+    keys: tuple,
+    symbol: str,
+    values: List[tuple],
+) -> Iterator[tuple]:
+
+    # stored rows of a symbol with the given keys, found through the primary key
+    names = ", ".join(map(_quote, keys))
+    placeholder = f"({', '.join('?' * len(keys))})"
+
+    for start in range(0, len(values), _LOOKUP):
+        batch = values[start : start + _LOOKUP]
+        yield from connection.execute(
+            f"{select} WHERE symbol = ? AND ({names}) IN "
+            f"(VALUES {', '.join([placeholder] * len(batch))})",
+            (symbol, *(value for key in batch for value in key)),
+        )
+
+
+def _rows(frame: pd.DataFrame, symbol: str, schema: dict, keys: tuple) -> List[tuple]:
+
+    frame = frame.dropna(subset=[key for key in keys if key in frame])
+    if any(key not in frame for key in keys):
+        return []
+
+    values = [[symbol] * len(frame)]
+    for column in schema:
+        if column not in frame:
+            values.append([None] * len(frame))
+            continue
+
+        series = frame[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            series = _format(series, column)
+
+        values.append(series.astype(object).where(series.notna(), None).tolist())
+
+    return list(zip(*values))
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from typing import Optional
+from iexcloud.client import Client
+from iexcloud.stock import Stock
+
+# chart ranges going back a calendar offset, smallest first
+RANGES = (
+    ("1m", pd.DateOffset(months=1)),
+    ("3m", pd.DateOffset(months=3)),
+    ("6m", pd.DateOffset(months=6)),
+    ("1y", pd.DateOffset(years=1)),
+    ("2y", pd.DateOffset(years=2)),
+    ("5y", pd.DateOffset(years=5)),
+)
+
+
+def plan_range(last_date=None, today=None) -> Optional[str]:
+    """Smallest chart range covering the days after the last archived date
+
+    Args:
+        last_date: last archived date, None when nothing is archived
+        today: date of the sync. Defaults to today.
+
+    Returns:
+        str: time range for ``Stock.get_price``, or None when up to date
+    """
+
+    if last_date is None:
+        return "max"
+
+    last_date = pd.Timestamp(last_date).normalize()
+    today = pd.Timestamp.today() if today is None else pd.Timestamp(today)
+    today = today.normalize()
+
+    # weekdays are an upper bound of the trading days, holidays aside
+    missing = np.busday_count(
+        (last_date + pd.Timedelta(days=1)).date(),
+        (today + pd.Timedelta(days=1)).date(),
+    )
+    if missing <= 0:
+        return None
+    if missing <= 5:
+        return "5d"
+
+    starts = [(today - offset, name) for name, offset in RANGES]
+    starts.append((today.replace(month=1, day=1), "ytd"))
+
+    covering = [(start, name) for start, name in starts if start <= last_date]
+    if not covering:
+        return "max"
+
+    # the latest start is the smallest range
+    return max(covering)[1]
+
+
+def sync_prices(symbol: str, archive, client: Client = None, today=None) -> int:
+    """Fetch the prices missing from an archive and merge them into it
+
+    Only the smallest chart range covering the gap since the last archived
+    date is requested, e.g. "5d" for a daily run. Syncing twice is harmless:
+    rows are deduped on date.
+
+    Args:
+        symbol: stock symbol
+        archive: archive with ``last_date`` and ``write_prices``, e.g.
+            ``ParquetArchive``
+        client: client to use. Defaults to the shared one.
+        today: date of the sync. Defaults to today.
+
+    Returns:
+        int: number of dates added
+    """
+
+    last_date = archive.last_date(symbol)
+    time_range = plan_range(last_date, today)
+    if time_range is None:
+        return 0
+
+    prices = Stock(symbol, "records", client).get_price(time_range)
+
+    # rows already archived are dropped so older partitions are not rewritten
+    if last_date is not None:
+        prices = [row for row in prices if pd.Timestamp(row["date"]) > last_date]
+
+    return archive.write_prices(symbol, prices)
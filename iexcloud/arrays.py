@@ -0,0 +1,107 @@
+import numpy as np
+
+from typing import Dict, List, Union
+from iexcloud.parse import columns_of, is_date_column
+
+_INT32 = np.iinfo(np.int32)
+
+
+def _to_datetime(values: list) -> np.ndarray:
+
+    if any(isinstance(value, float) for value in values):
+        values = [None if value is None else int(value) for value in values]
+
+    try:
+        return np.array(values, dtype="datetime64[ms]")
+    except ValueError:
+        return np.array(values, dtype=object)
+
+
+def _to_number(values: list, dtype: str) -> np.ndarray:
+
+    try:
+        return np.array(values, dtype=dtype)
+    except (TypeError, ValueError, OverflowError):
+        pass
+
+    # missing values or numbers sent as strings; ints fall back to float so
+    # missing values can be NaN
+    floats = np.empty(len(values), dtype="float32" if dtype == "float32" else float)
+    for i, value in enumerate(values):
+        try:
+            floats[i] = float(value)
+        except (TypeError, ValueError):
+            floats[i] = np.nan
+
+    return floats
+
+
+def _to_int(values: list, compact: bool) -> np.ndarray:
+
+    # ints with missing values come back as float64, exact up to 2**53
+    array = _to_number(values, "int64")
+
+    # narrowing is checked, as casting past 2**31 wraps silently
+    if (
+        compact
+        and array.dtype == np.int64
+        and (not len(array) or _INT32.min <= array.min() <= array.max() <= _INT32.max)
+    ):
+        return array.astype("int32")
+
+    return array
+
+
+def _to_array(values: list, kind: str, compact: bool) -> np.ndarray:
+
+    if kind == "datetime":
+        return _to_datetime(values)
+    elif kind == "float":
+        return _to_number(values, "float32" if compact else "float64")
+    elif kind == "int":
+        return _to_int(values, compact)
+    elif kind == "bool" and all(value is not None for value in values):
+        return np.array(values, dtype=bool)
+    else:
+        return np.array(values, dtype=object)
+
+
+def records_to_arrays(
+    records: Union[List[dict], dict],
+    schema: Dict[str, str] = None,
+    compact: bool = False,
+) -> Dict[str, np.ndarray]:
+    """Build one NumPy array per column from decoded records, without pandas
+
+    Declared columns get their type: datetime64[ms] for dates, float64/int64
+    for numbers, or in compact mode float32 and int32 when the values fit.
+    Ints with missing values become float64 holding NaN. Strings and undeclared
+    columns are object arrays, except undeclared date columns which are parsed
+    like declared ones.
+
+    Args:
+        records: list of records, or a single record
+        schema: column name -> kind, see ``iexcloud.schema``
+        compact: whether to use float32 for floats and int32 for ints that
+            fit in it
+
+    Returns:
+        Dict[str, np.ndarray]: arrays keyed by column name
+    """
+
+    if isinstance(records, dict):
+        records = [records]
+
+    schema = schema or {}
+    arrays = {}
+    for column in columns_of(records):
+        values = [record.get(column) for record in records]
+
+        if column in schema:
+            arrays[column] = _to_array(values, schema[column], compact)
+        elif is_date_column(column):
+            arrays[column] = _to_datetime(values)
+        else:
+            arrays[column] = np.array(values)
+
+    return arrays
@@ -0,0 +1,136 @@
+from typing import Dict, Iterable, List
+from iexcloud.client import Client, get_client
+from iexcloud.stream import iter_response
+from iexcloud.stock import Stock
+
+# Maximum symbols and data types IEX accepts in one batch request
+MAX_SYMBOLS = 100
+MAX_TYPES = 10
+
+# Stock attribute -> batch data type
+TYPES = {
+    "dividend": "dividends",
+    "earning": "earnings",
+    "logo": "logo",
+    "news": "news",
+    "peer": "peers",
+    "price": "chart",
+    "profile": "company",
+    "split": "splits",
+}
+
+
+def _chunk(items: List, size: int) -> List[List]:
+
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+class StockBatch(object):
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        output: str = "pandas",
+        client: Client = None,
+        compact: bool = False,
+    ):
+        """Fetch several data types for many symbols through /stock/market/batch
+
+        Args:
+            symbols: stock symbols
+            output: output format, as in ``Stock``.
+            client: client to use. Defaults to the shared one.
+            compact: whether pandas outputs use float32/int32, as in ``Stock``.
+        """
+
+        self.symbols: List[str] = list(symbols)
+        self.output: str = output
+        self.client: Client = client if client is not None else get_client()
+        self.stocks: Dict[str, Stock] = {
+            symbol: Stock(symbol, output, client=self.client, compact=compact)
+            for symbol in self.symbols
+        }
+
+    def plan(self, datasets: Iterable[str]) -> List[dict]:
+        """Split a symbols x datasets request into the fewest batch calls
+
+        Args:
+            datasets: names of ``Stock`` attributes, e.g. ["price", "dividend"]
+
+        Raises:
+            ValueError: when a dataset has no batch data type
+
+        Returns:
+            List[dict]: query parameters ``symbols`` and ``types`` of each call
+        """
+
+        types = []
+        for dataset in datasets:
+            if dataset not in TYPES:
+                raise ValueError(
+                    f"Dataset should be one of {', '.join(sorted(TYPES))}, "
+                    f"got '{dataset}'"
+                )
+            if TYPES[dataset] not in types:
+                types.append(TYPES[dataset])
+
+        return [
+            {"symbols": ",".join(symbols), "types": ",".join(type_chunk)}
+            for symbols in _chunk(self.symbols, MAX_SYMBOLS)
+            for type_chunk in _chunk(types, MAX_TYPES)
+        ]
+
+    def fetch(
+        self, datasets: Iterable[str], time_range: str = None, last: int = None
+    ) -> Dict[str, Dict[str, object]]:
+        """Fetch datasets for every symbol and fill the matching ``Stock`` attributes
+
+        Args:
+            datasets: names of ``Stock`` attributes, e.g. ["price", "dividend"]
+            time_range: range of "price", "dividend" and "split", as accepted by
+                the matching ``Stock.get_*`` method
+            last: number of items of "news" and "earning"
+
+        Returns:
+            Dict[str, Dict[str, object]]: output keyed by symbol then dataset.
+                Symbols IEX does not know are left out.
+        """
+
+        datasets = list(datasets)
+        params = {}
+        if time_range is not None:
+            params["range"] = time_range
+        if last is not None:
+            params["last"] = last
+
+        result = {}
+        for call in self.plan(datasets):
+            # the payload is decoded one symbol at a time to bound memory
+            response = self.client.stream("/stock/market/batch", {**call, **params})
+            symbols = {symbol.upper(): symbol for symbol in call["symbols"].split(",")}
+
+            for key, data in iter_response(response):
+                symbol = symbols.get(key)
+                if symbol is None:
+                    continue
+
+                stock = self.stocks[symbol]
+                outputs = result.setdefault(symbol, {})
+                for dataset in datasets:
+                    if TYPES[dataset] in data:
+                        output = self._to_output(stock, dataset, data[TYPES[dataset]])
+                        setattr(stock, dataset, output)
+                        outputs[dataset] = output
+
+        return result
+
+    @staticmethod
+    def _to_output(stock: Stock, dataset: str, data):
+
+        if dataset == "logo":
+            return data["url"]
+        elif dataset in ("peer", "profile"):
+            return data
+        elif dataset == "earning":
+            return stock._records_to_output(data, "earnings", dataset)
+        else:
+            return stock._records_to_output(data, dataset=dataset)
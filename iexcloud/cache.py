@@ -0,0 +1,403 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Dict, Tuple
+from urllib.parse import urlencode
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# reads of a SQLiteCache record their access times in batches of this many
+# entries, or after this many seconds
+ACCESS_BATCH = 256
+ACCESS_INTERVAL = 10.0
+
+# Seconds a response stays fresh, keyed by a glob of the API path. The first
+# matching pattern wins; paths matching none are not cached.
+DEFAULT_TTLS = {
+    "/stock/*/logo": 7 * DAY,
+    "/stock/*/company": DAY,
+    "/stock/*/peers": DAY,
+    "/stock/*/dividends/*": 6 * HOUR,
+    "/stock/*/splits/*": 6 * HOUR,
+    "/stock/*/earnings/*": 6 * HOUR,
+    "/stock/*/chart/*dm": MINUTE,
+    "/stock/*/chart/1mm": MINUTE,
+    "/stock/*/chart/*": HOUR,
+    "/stock/*/news/*": MINUTE,
+    "/ref-data/*": DAY,
+}
+
+
+def cache_key(url: str, params: dict = None) -> str:
+    """Key of a request: url and sorted query parameters, without the token
+
+    The url includes the sandbox or production host, so the two never share
+    entries.
+
+    Args:
+        url: requested url
+        params: query parameters
+
+    Returns:
+        str: cache key
+    """
+
+    params = sorted((k, v) for k, v in (params or {}).items() if k != "token")
+
+    return f"{url}?{urlencode(params)}" if params else url
+
+
+class Cache(object):
+    def __init__(self, ttls: Dict[str, float] = None, default_ttl: float = 0):
+        """Base of the response caches used by ``Client`` and ``AsyncClient``
+
+        Caches store the raw payload of successful responses, so every output
+        mode benefits. Subclasses implement ``get`` and ``set``.
+
+        Args:
+            ttls: seconds a response stays fresh keyed by a glob of the API path.
+                Defaults to ``DEFAULT_TTLS``.
+            default_ttl: seconds for paths matching no pattern. 0 disables
+                caching them.
+        """
+
+        self.ttls: Dict[str, float] = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl: float = default_ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def ttl(self, path: str) -> float:
+        """Seconds a response of an API path stays fresh
+
+        Args:
+            path: API path, e.g. "/stock/KO/chart/1m"
+
+        Returns:
+            float: time to live, 0 when the path is not cached
+        """
+
+        for pattern, ttl in self.ttls.items():
+            if fnmatchcase(path, pattern):
+                return ttl
+
+        return self.default_ttl
+
+    def get(self, key: str) -> bytes:
+        """Look up a fresh payload
+
+        Args:
+            key: cache key
+
+        Returns:
+            bytes: payload, or None on a miss
+        """
+
+        raise NotImplementedError
+
+    def set(self, key: str, content: bytes, ttl: float):
+        """Store a payload
+
+        Args:
+            key: cache key
+            content: payload
+            ttl: seconds the payload stays fresh
+        """
+
+        raise NotImplementedError
+
+    def clear(self):
+
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class MemoryCache(Cache):
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttls: Dict[str, float] = None,
+        default_ttl: float = 0,
+    ):
+        """In-process cache with per-endpoint TTLs, evicting least recently used
+
+        Args:
+            max_bytes: cap on the total size of stored payloads
+            ttls: seconds a response stays fresh keyed by a glob of the API path.
+                Defaults to ``DEFAULT_TTLS``.
+            default_ttl: seconds for paths matching no pattern
+        """
+
+        super().__init__(ttls, default_ttl)
+        self.max_bytes: int = max_bytes
+        self.size: int = 0
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes:
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires, content = entry
+            if expires <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return content
+
+    def set(self, key: str, content: bytes, ttl: float):
+
+        if len(content) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + ttl, content)
+            self.size += len(content)
+
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str):
+
+        _, content = self._entries.pop(key)
+        self.size -= len(content)
+
+    def clear(self):
+
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+
+        return len(self._entries)
+
+    def stats(self) -> dict:
+
+        return {**super().stats(), "entries": len(self._entries), "bytes": self.size}
+
+
+class SQLiteCache(Cache):
+    def __init__(
+        self,
+        path: str = None,
+        max_bytes: int = 1024 * 1024 * 1024,
+        ttls: Dict[str, float] = None,
+        default_ttl: float = 0,
+        compression: int = 6,
+    ):
+        """Persistent cache in a SQLite database shared by processes
+
+        The database runs in WAL mode, so several processes can read while one
+        writes. Payloads are stored zlib-compressed. When the stored size goes
+        over ``max_bytes`` expired entries, then the least recently read ones
+        are evicted. Reads record their access time in batches, so they
+        rarely take the write lock.
+
+        Args:
+            path: database file. Defaults to ~/.cache/iexcloud/responses.sqlite
+            max_bytes: cap on the total compressed size of stored payloads
+            ttls: seconds a response stays fresh keyed by a glob of the API path.
+                Defaults to ``DEFAULT_TTLS``.
+            default_ttl: seconds for paths matching no pattern
+            compression: zlib compression level
+        """
+
+        super().__init__(ttls, default_ttl)
+
+        if path is None:
+            path = os.path.join(
+                os.path.expanduser("~"), ".cache", "iexcloud", "responses.sqlite"
+            )
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path: str = path
+        self.max_bytes: int = max_bytes
+        self.compression: int = compression
+        self._local = threading.local()
+        self._accessed: Dict[str, float] = {}
+        self._flushed: float = time.monotonic()
+        self._lock = threading.Lock()
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, expires REAL, accessed REAL, "
+                "size INTEGER, content BLOB)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed "
+                "ON responses (accessed)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)"
+            )
+            # running total of the stored sizes, so writes never scan the table
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses_size "
+                "(id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER)"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO responses_size "
+                "SELECT 0, COALESCE(SUM(size), 0) FROM responses"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+
+        # sqlite3 connections cannot be shared between threads
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+
+        return connection
+
+    def get(self, key: str) -> bytes:
+
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT expires, content FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        expires, content = row
+        if expires <= now:
+            with connection:
+                self._delete(connection, "key = ?", (key,))
+            self.misses += 1
+            return None
+
+        # reads only take the write lock when their access times are flushed
+        with self._lock:
+            self._accessed[key] = now
+            flush = (
+                len(self._accessed) >= ACCESS_BATCH
+                or time.monotonic() - self._flushed >= ACCESS_INTERVAL
+            )
+        if flush:
+            with connection:
+                self._flush(connection)
+
+        self.hits += 1
+        return zlib.decompress(content)
+
+    def set(self, key: str, content: bytes, ttl: float):
+
+        content = zlib.compress(content, self.compression)
+        if len(content) > self.max_bytes:
+            return
+
+        now = time.time()
+        connection = self._connect()
+        with connection:
+            # the size is read and updated in one write transaction
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, now + ttl, now, len(content), content),
+            )
+            size = self._grow(connection, len(content) - (row[0] if row else 0))
+            if size > self.max_bytes:
+                self._evict(connection, size, now)
+
+    def _flush(self, connection: sqlite3.Connection):
+
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+            self._flushed = time.monotonic()
+
+        connection.executemany(
+            "UPDATE responses SET accessed = ? WHERE key = ?",
+            [(when, key) for key, when in accessed.items()],
+        )
+
+    def _grow(self, connection: sqlite3.Connection, delta: int) -> int:
+
+        connection.execute("UPDATE responses_size SET size = size + ?", (delta,))
+
+        return connection.execute("SELECT size FROM responses_size").fetchone()[0]
+
+    def _delete(self, connection: sqlite3.Connection, where: str, params: tuple):
+
+        (size,) = connection.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM responses WHERE {where}", params
+        ).fetchone()
+        connection.execute(f"DELETE FROM responses WHERE {where}", params)
+        self._grow(connection, -size)
+
+    def _evict(self, connection: sqlite3.Connection, size: int, now: float):
+
+        # expired entries go first, then the least recently read ones
+        self._delete(connection, "expires <= ?", (now,))
+        size = self._grow(connection, 0)
+        if size <= self.max_bytes:
+            return
+
+        self._flush(connection)
+        keys = []
+        freed = 0
+        rows = connection.execute("SELECT key, size FROM responses ORDER BY accessed")
+        for key, entry_size in rows:
+            if size - freed <= self.max_bytes:
+                break
+            keys.append((key,))
+            freed += entry_size
+
+        connection.executemany("DELETE FROM responses WHERE key = ?", keys)
+        self._grow(connection, -freed)
+        self.evictions += len(keys)
+
+    def clear(self):
+
+        with self._connect() as connection:
+            connection.execute("DELETE FROM responses")
+            connection.execute("UPDATE responses_size SET size = 0")
+
+    def __len__(self) -> int:
+
+        return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self) -> dict:
+
+        entries, size = (
+            self._connect()
+            .execute(
+                "SELECT (SELECT COUNT(*) FROM responses), size FROM responses_size"
+            )
+            .fetchone()
+        )
+
+        return {**super().stats(), "entries": entries, "bytes": size}
@@ -0,0 +1,284 @@
+import time
+import requests
+
+from urllib.parse import urlsplit
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from iexcloud.config import get_token, get_url
+from iexcloud.cache import Cache, cache_key
+from iexcloud.ratelimit import RateLimiter, get_rate_limiter, retry_after
+from iexcloud.retry import RetryPolicies
+from iexcloud.singleflight import SingleFlight
+
+# Headers of responses served from a cache
+CACHED_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+
+def build_response(
+    url: str, status_code: int, content: bytes, headers: dict = None, reason=None
+) -> Response:
+    """Wrap a payload fetched outside of requests into a ``Response``
+
+    Lets the endpoint classes treat every transport the same way.
+
+    Args:
+        url: requested url
+        status_code: HTTP status code
+        content: raw response body
+        headers: response headers
+        reason: HTTP reason phrase
+
+    Returns:
+        Response: response carrying the payload
+    """
+
+    response = Response()
+    response.url = url
+    response.status_code = status_code
+    response.reason = reason
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.encoding = get_encoding_from_headers(response.headers) or "utf-8"
+    response._content = content
+
+    return response
+
+
+class Client(object):
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        timeout: float = None,
+        base_url: str = None,
+        rate_limiter: RateLimiter = None,
+        max_throttle_retries: int = 3,
+        retry: RetryPolicies = None,
+        single_flight: bool = True,
+        cache: Cache = None,
+    ):
+        """Keep-alive HTTP transport shared by the endpoint classes
+
+        Args:
+            pool_connections: number of per-host connection pools to keep.
+            pool_maxsize: maximum number of connections kept alive per host.
+            pool_block: whether to block when a host's pool is exhausted
+                instead of opening a throwaway connection.
+            timeout: seconds to wait for the server. Defaults to no timeout.
+            base_url: override of the API url. Defaults to ``get_url()``, which
+                is resolved on every request so ``set_mode`` keeps working.
+            rate_limiter: limiter every request passes through. Defaults to the
+                process-wide one configured by ``set_rate_limit``.
+            max_throttle_retries: number of times a request rejected with 429 is
+                sent again after the limiter's pause.
+            retry: retry policies and circuit breakers. Defaults to
+                ``RetryPolicies()``.
+            single_flight: whether concurrent identical requests share one call
+            cache: response cache, e.g. ``MemoryCache()``. Defaults to none.
+        """
+
+        self.pool_connections: int = pool_connections
+        self.pool_maxsize: int = pool_maxsize
+        self.pool_block: bool = pool_block
+        self.timeout: float = timeout
+        self.base_url: str = base_url
+        self.rate_limiter: RateLimiter = (
+            rate_limiter if rate_limiter is not None else get_rate_limiter()
+        )
+        self.max_throttle_retries: int = max_throttle_retries
+        self.retry: RetryPolicies = retry if retry is not None else RetryPolicies()
+        self.flight: SingleFlight = SingleFlight() if single_flight else None
+        self.cache: Cache = cache
+        self.session: requests.Session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    @property
+    def url(self) -> str:
+
+        return self.base_url if self.base_url is not None else get_url()
+
+    def get(self, path: str, params: dict = None) -> Response:
+        """Send a GET request for an API path
+
+        Args:
+            path: API path starting with "/", e.g. "/stock/KO/chart/1m"
+            params: extra query parameters. The token is added automatically.
+
+        Raises:
+            CircuitOpenError: when the host's circuit breaker is open
+            RequestException: when the request fails and is not retried
+
+        Returns:
+            Response: response of the request
+        """
+
+        query = {"token": get_token()}
+        if params is not None:
+            query.update(params)
+
+        url = self.url
+        key = cache_key(url + path, query)
+        ttl = self.cache.ttl(path) if self.cache is not None else 0
+
+        if ttl > 0:
+            content = self.cache.get(key)
+            if content is not None:
+                return build_response(url + path, 200, content, CACHED_HEADERS)
+
+        if self.flight is None:
+            response = self._request(url, path, query)
+        else:
+            response = self.flight.do(
+                (key, query["token"]), lambda: self._request(url, path, query)
+            )
+
+        if ttl > 0 and response.status_code == 200:
+            self.cache.set(key, response.content, ttl)
+
+        return response
+
+    def stream(self, path: str, params: dict = None) -> Response:
+        """Send a GET request whose body is read lazily
+
+        The request goes through rate limiting and retries but skips the cache
+        and single-flight. Pass the response to ``iexcloud.stream`` helpers or
+        close it after use.
+
+        Args:
+            path: API path starting with "/", e.g. "/stock/KO/chart/max"
+            params: extra query parameters. The token is added automatically.
+
+        Returns:
+            Response: response with an unread body
+        """
+
+        query = {"token": get_token()}
+        if params is not None:
+            query.update(params)
+
+        return self._request(self.url, path, query, stream=True)
+
+    def _request(
+        self, url: str, path: str, query: dict, stream: bool = False
+    ) -> Response:
+
+        policy = self.retry.policy(path)
+        breaker = self.retry.breaker(urlsplit(url).netloc)
+        attempt = throttles = 0
+
+        while True:
+            trial = breaker.allow()
+
+            try:
+                self.rate_limiter.acquire()
+                response = self.session.get(
+                    url + path, params=query, timeout=self.timeout, stream=stream
+                )
+            except Exception as error:
+                breaker.record_failure()
+                if not policy.should_retry(attempt, error=error):
+                    raise
+            else:
+                if response.status_code == 429:
+                    self.rate_limiter.throttle(retry_after(response))
+                    if throttles < self.max_throttle_retries:
+                        throttles += 1
+                        response.close()
+                        continue
+                    return response
+
+                self.rate_limiter.succeed()
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+
+                if not policy.should_retry(attempt, response=response):
+                    return response
+
+                response.close()
+            finally:
+                # a throttled or interrupted trial leaves the circuit half-open
+                if trial:
+                    breaker.release()
+
+            time.sleep(policy.delay(attempt))
+            attempt += 1
+
+    def stats(self) -> dict:
+        """Counters of the rate limiter, retries, circuit breakers, single-flight
+        and cache
+
+        Returns:
+            dict: counters for tuning the client
+        """
+
+        return {
+            "throttled": self.rate_limiter.throttled,
+            "rate": self.rate_limiter.rate,
+            **self.retry.stats(),
+            "single_flight": self.flight.stats() if self.flight else None,
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+    def close(self):
+        """Close all pooled connections"""
+
+        self.session.close()
+
+
+_client = None
+
+
+def get_client() -> Client:
+    """Retrieve the process-wide client, creating it on first use
+
+    Returns:
+        Client: shared client
+    """
+
+    global _client
+
+    if _client is None:
+        _client = Client()
+
+    return _client
+
+
+def set_client(client: Client = None, **kwargs) -> Client:
+    """Replace the process-wide client
+
+    Args:
+        client: client to share. When omitted, a new ``Client`` is built from
+            ``kwargs``, e.g. ``set_client(pool_maxsize=32)``.
+
+    Returns:
+        Client: the new shared client
+    """
+
+    global _client
+
+    if client is None:
+        client = Client(**kwargs)
+
+    if _client is not None and _client is not client:
+        _client.close()
+
+    _client = client
+
+    return client
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+
+from typing import Dict, List, Union
+from iexcloud.parse import columns_of, is_date_column
+
+# pandas < 2 reads the format literally and would turn every date into NaT,
+# while it already parses mixed ISO strings when left to infer
+_ISO = {"format": "ISO8601"} if int(pd.__version__.split(".")[0]) >= 2 else {}
+
+_INT32 = np.iinfo(np.int32)
+
+
+def _to_datetime(values: list) -> pd.Series:
+
+    if any(isinstance(value, (int, float)) for value in values):
+        return pd.Series(pd.to_datetime(values, unit="ms", errors="coerce"))
+
+    return pd.Series(pd.to_datetime(values, errors="coerce", **_ISO))
+
+
+def _to_number(values: list, dtype: str) -> pd.Series:
+
+    try:
+        return pd.Series(np.array(values, dtype=dtype))
+    except (TypeError, ValueError, OverflowError):
+        pass
+
+    # missing values or numbers sent as strings
+    series = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+
+    if dtype.startswith("float"):
+        return series.astype(dtype)
+    elif series.isna().any():
+        return series.astype(dtype.capitalize())
+
+    return series.astype(dtype)
+
+
+def _to_int(values: list, compact: bool) -> pd.Series:
+
+    series = _to_number(values, "int64")
+
+    # split-adjusted volumes of long histories exceed int32, so columns are
+    # only narrowed when every value fits
+    if compact and series.dropna().between(_INT32.min, _INT32.max).all():
+        return series.astype(str(series.dtype).replace("64", "32"))
+
+    return series
+
+
+def _to_column(values: list, kind: str, compact: bool) -> pd.Series:
+
+    if kind == "datetime":
+        return _to_datetime(values)
+    elif kind == "float":
+        return _to_number(values, "float32" if compact else "float64")
+    elif kind == "int":
+        return _to_int(values, compact)
+    elif kind == "bool":
+        if any(value is None for value in values):
+            return pd.Series(values, dtype="boolean")
+        return pd.Series(values, dtype=bool)
+    elif kind == "category":
+        return pd.Series(values, dtype="category")
+    else:
+        return pd.Series(values)
+
+
+def records_to_frame(
+    records: Union[List[dict], dict],
+    schema: Dict[str, str] = None,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """Build a DataFrame from decoded records without serialising them again
+
+    With a schema (see ``iexcloud.schema``) each column is built straight with
+    its declared type. Columns missing from the schema, or all columns without
+    one, have their type inferred, and date columns are converted the way
+    ``pd.read_json`` does: ISO strings are parsed and numbers are read as
+    millisecond epochs.
+
+    Args:
+        records: list of records, or a single record
+        schema: column name -> kind
+        compact: whether to use float32 for floats and int32 for ints that
+            fit in it
+
+    Returns:
+        pd.DataFrame: records as rows
+    """
+
+    if isinstance(records, dict):
+        records = [records]
+
+    if schema is not None:
+        columns = {}
+        for column in columns_of(records):
+            values = [record.get(column) for record in records]
+            if column in schema:
+                columns[column] = _to_column(values, schema[column], compact)
+            else:
+                columns[column] = _infer_column(column, values)
+
+        return pd.DataFrame(columns, index=pd.RangeIndex(len(records)))
+
+    frame = pd.DataFrame.from_records(records)
+
+    for column in frame.columns:
+        if is_date_column(column):
+            frame[column] = _convert_date(frame[column])
+
+    return frame
+
+
+def _convert_date(values: pd.Series) -> pd.Series:
+
+    unit = "ms" if pd.api.types.is_numeric_dtype(values) else None
+
+    try:
+        return pd.to_datetime(values, unit=unit)
+    except (TypeError, ValueError):
+        return values
+
+
+def _infer_column(column: str, values: list) -> pd.Series:
+
+    series = pd.Series(values)
+    if series.dtype == np.dtype(object):
+        series = series.infer_objects()
+
+    return _convert_date(series) if is_date_column(column) else series
@@ -0,0 +1,58 @@
+import json
+
+from typing import List, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Columns pd.read_json converts to datetimes by default, which the previous
+# parser relied on
+DATE_COLUMNS = ("date", "datetime", "modified", "timestamp")
+DATE_SUFFIXES = ("_at", "_time")
+
+
+def loads(content: Union[bytes, str]):
+    """Decode a JSON payload with the fastest available decoder
+
+    orjson is used when installed, the standard library otherwise.
+
+    Args:
+        content: JSON payload
+
+    Returns:
+        object: decoded payload
+    """
+
+    if orjson is not None:
+        return orjson.loads(content)
+
+    return json.loads(content)
+
+
+def is_date_column(column: str) -> bool:
+
+    return (
+        column in DATE_COLUMNS
+        or column.endswith(DATE_SUFFIXES)
+        or column.startswith("timestamp")
+    )
+
+
+def columns_of(records: List[dict]) -> List[str]:
+    """Keys of the records in order of first appearance
+
+    Args:
+        records: list of records
+
+    Returns:
+        List[str]: column names
+    """
+
+    columns = dict.fromkeys(records[0]) if records else {}
+    for record in records[1:]:
+        if len(record) != len(columns) or any(key not in columns for key in record):
+            columns.update(dict.fromkeys(record))
+
+    return list(columns)
@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import time
+
+from email.utils import parsedate_to_datetime
+from requests import Response
+
+
+class RateLimiter(object):
+    def __init__(
+        self,
+        rate: float = 100.0,
+        burst: int = None,
+        min_rate: float = 1.0,
+        recovery: float = 0.05,
+    ):
+        """Thread-safe token bucket that backs off on HTTP 429
+
+        Each request takes one token. Tokens refill at ``rate`` per second up to
+        ``burst``. A 429 halves the rate and pauses every caller until the
+        server's ``Retry-After``; each later success adds back ``recovery`` of
+        the configured rate until it is reached again.
+
+        Args:
+            rate: sustained requests per second. None disables throttling, but
+                429 pauses are still honoured.
+            burst: maximum number of tokens. Defaults to one second of ``rate``.
+            min_rate: floor of the adapted rate
+            recovery: share of ``rate`` restored after each success
+        """
+
+        self.min_rate: float = min_rate
+        self.recovery: float = recovery
+        self.throttled: int = 0
+        self._updated: float = time.monotonic()
+        self._paused_until: float = 0.0
+        self._lock = threading.Lock()
+        self.configure(rate, burst)
+
+    def configure(self, rate: float = 100.0, burst: int = None):
+        """Change the configured rate and burst
+
+        Args:
+            rate: sustained requests per second. None disables throttling.
+            burst: maximum number of tokens. Defaults to one second of ``rate``.
+        """
+
+        with self._lock:
+            self.max_rate: float = rate
+            self.rate: float = rate
+            self.burst: float = burst if burst is not None else max(1.0, rate or 1.0)
+            self._tokens: float = self.burst
+
+    def reserve(self) -> float:
+        """Take a token
+
+        Returns:
+            float: seconds the caller has to wait before sending its request
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            pause = max(0.0, self._paused_until - now)
+
+            if self.rate is None:
+                return pause
+
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return pause
+
+            return max(pause, -self._tokens / self.rate)
+
+    def acquire(self):
+        """Block until a request may be sent"""
+
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request may be sent"""
+
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def throttle(self, retry_after: float = None):
+        """Record a 429 response
+
+        Args:
+            retry_after: seconds the server asked to wait. Defaults to the time
+                of one token at the reduced rate.
+        """
+
+        with self._lock:
+            self.throttled += 1
+
+            if self.rate is not None:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._tokens = min(self._tokens, 0.0)
+
+            if retry_after is None:
+                retry_after = 1.0 / self.rate if self.rate is not None else 1.0
+
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def succeed(self):
+        """Record an accepted request, recovering the rate after a 429"""
+
+        if self.rate is None or self.rate >= self.max_rate:
+            return
+
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery)
+
+
+def retry_after(response: Response) -> float:
+    """Read the Retry-After header of a response
+
+    Args:
+        response: response of a request
+
+    Returns:
+        float: seconds to wait, or None when the header is missing or invalid
+    """
+
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Retrieve the process-wide rate limiter
+
+    Returns:
+        RateLimiter: shared rate limiter
+    """
+
+    return _limiter
+
+
+def set_rate_limit(rate: float = 100.0, burst: int = None) -> RateLimiter:
+    """Configure the process-wide rate limiter used by every client
+
+    Args:
+        rate: sustained requests per second. None disables throttling.
+        burst: maximum number of requests sent back to back. Defaults to one
+            second of ``rate``.
+
+    Returns:
+        RateLimiter: the shared rate limiter
+    """
+
+    _limiter.configure(rate, burst)
+
+    return _limiter
@@ -1,72 +1,108 @@
-from typing import List
-import requests
+import threading
+import time
 
-from iexcloud.constants import IEX_CLOUD, IEX_TOKEN
+from typing import List
+from iexcloud.client import Client, get_client
+from iexcloud.parse import loads
+from iexcloud.stream import iter_response
 
 
 class Reference(object):
-    def __init__(self):
+    def __init__(self, client: Client = None, ttl: float = 60):
+        """Account metadata and the symbol universe, loaded on first access
 
-        self.msg_limit: int = self.get_msg_limit()
-        self.msg_used: int = self.get_msg_used()
-        self.msg_balance: int = self.msg_limit - self.msg_used
-        self.symbols: List[str] = self.get_symbols()
+        Nothing is requested up front. The message limit, usage and balance
+        come from a single metadata call cached for ``ttl`` seconds, and the
+        symbol list is downloaded the first time ``symbols`` is read.
 
-    @staticmethod
-    def get_msg_limit() -> int:
-        """https://iexcloud.io/docs/api/#metadata
+        Args:
+            client: client to use. Defaults to the shared one.
+            ttl: seconds the account metadata stays fresh
+        """
 
-        Parameters
-        ----------
+        self.client: Client = client if client is not None else get_client()
+        self.ttl: float = ttl
+        self._metadata: dict = None
+        self._expires: float = 0.0
+        self._symbols: List[str] = None
+        self._lock = threading.Lock()
 
-        Returns
-        -------
+    def get_metadata(self, refresh: bool = False) -> dict:
+        """https://iexcloud.io/docs/api/#metadata
 
+        Args:
+            refresh: whether to ignore the cached metadata
+
+        Returns:
+            dict: account metadata, e.g. messageLimit and messagesUsed
         """
 
-        api_url = f"{IEX_CLOUD}/account/metadata?token={IEX_TOKEN}"
-        response = requests.get(api_url)
+        with self._lock:
+            if refresh or self._metadata is None or time.monotonic() >= self._expires:
+                response = self.client.get("/account/metadata")
+                response.raise_for_status()
 
-        if response:
-            return response.json()["messageLimit"]
+                self._metadata = loads(response.content)
+                self._expires = time.monotonic() + self.ttl
 
-    @staticmethod
-    def get_msg_used() -> int:
-        """https://iexcloud.io/docs/api/#metadata
+            return self._metadata
+
+    def get_msg_limit(self) -> int:
+        """Messages allowed in the billing period, see :meth:`get_metadata`"""
+
+        return self.get_metadata()["messageLimit"]
+
+    def get_msg_used(self) -> int:
+        """Messages used in the billing period, see :meth:`get_metadata`"""
+
+        return self.get_metadata()["messagesUsed"]
+
+    @property
+    def msg_limit(self) -> int:
+
+        return self.get_msg_limit()
+
+    @property
+    def msg_used(self) -> int:
+
+        return self.get_msg_used()
+
+    @property
+    def msg_balance(self) -> int:
+
+        metadata = self.get_metadata()
 
-        Parameters
-        ----------
+        return metadata["messageLimit"] - metadata["messagesUsed"]
 
-        Returns
-        -------
+    def get_symbols(self) -> List[str]:
+        """Download the symbols supported by IEX Cloud
 
+        Returns:
+            List[str]: symbols
         """
 
-        api_url = f"{IEX_CLOUD}/account/metadata?token={IEX_TOKEN}"
-        response = requests.get(api_url)
+        # the list is large, so records are decoded one at a time
+        response = self.client.stream("/ref-data/iex/symbols")
+        self._symbols = [symbol["symbol"] for symbol in iter_response(response)]
 
-        if response:
-            return response.json()["messagesUsed"]
+        return self._symbols
 
-    @staticmethod
-    def get_symbols():
+    @property
+    def symbols(self) -> List[str]:
 
-        api_url = f"{IEX_CLOUD}/ref-data/iex/symbols?token={IEX_TOKEN}"
-        response = requests.get(api_url)
+        if self._symbols is None:
+            return self.get_symbols()
 
-        if response:
-            return [symbol["symbol"] for symbol in response.json()]
+        return self._symbols
 
     def update_msg_limit(self):
 
-        self.msg_limit = self.get_msg_limit()
+        self.get_metadata(refresh=True)
 
     def update_msg_used(self):
 
-        self.msg_used = self.get_msg_used()
+        self.get_metadata(refresh=True)
 
     def update_msg_balance(self):
 
-        self.msg_limit = self.get_msg_limit()
-        self.msg_used = self.get_msg_used()
-        self.msg_balance = self.msg_limit - self.msg_usess
+        self.get_metadata(refresh=True)
@@ -0,0 +1,118 @@
+import json
+
+from typing import TYPE_CHECKING, Dict, List, Union
+from iexcloud.parse import loads
+from iexcloud.schema import SCHEMAS
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+
+
+class Result(object):
+    def __init__(
+        self,
+        content: bytes,
+        attribute: str = None,
+        dataset: str = None,
+        compact: bool = False,
+    ):
+        """Raw payload of a ``Stock`` endpoint, decoded on first access
+
+        Each representation is built the first time it is requested and
+        memoised, so only the ones actually used are paid for.
+
+        Args:
+            content: raw response body
+            attribute: key of the payload holding the records, if any
+            dataset: ``Stock`` attribute name selecting the schema, e.g. "price"
+            compact: whether outputs use compact dtypes, see ``Stock``
+        """
+
+        self.content: bytes = content
+        self.attribute: str = attribute
+        self.dataset: str = dataset
+        self.compact: bool = compact
+        self._outputs: dict = {}
+
+    @classmethod
+    def from_records(
+        cls, records: Union[List[dict], dict], dataset: str = None, compact=False
+    ) -> "Result":
+        """Wrap records that are already decoded, e.g. a batch or stream chunk"""
+
+        result = cls(None, dataset=dataset, compact=compact)
+        result._outputs["records"] = records
+
+        return result
+
+    def _get(self, name: str, build):
+
+        if name not in self._outputs:
+            self._outputs[name] = build()
+
+        return self._outputs[name]
+
+    def json(self) -> str:
+        """Records as JSON text, the raw body when no attribute is extracted"""
+
+        def build():
+            if self.content is not None and self.attribute is None:
+                return self.content.decode("utf-8")
+            return json.dumps(self.records())
+
+        return self._get("json", build)
+
+    def records(self) -> Union[List[dict], dict]:
+        """Decoded records"""
+
+        def build():
+            records = loads(self.content)
+            return records if self.attribute is None else records[self.attribute]
+
+        return self._get("records", build)
+
+    def to_pandas(self) -> "pd.DataFrame":
+        """Records as a DataFrame typed by the dataset schema"""
+
+        def build():
+            from iexcloud.frames import records_to_frame
+
+            return records_to_frame(self.records(), self.schema, self.compact)
+
+        return self._get("pandas", build)
+
+    def to_arrow(self) -> "pa.Table":
+        """Records as a pyarrow Table typed by the dataset schema
+
+        Raises:
+            ImportError: when pyarrow is not installed
+        """
+
+        def build():
+            from iexcloud.tables import records_to_table
+
+            return records_to_table(self.records(), self.schema, self.compact)
+
+        return self._get("arrow", build)
+
+    def to_numpy(self) -> Dict[str, "np.ndarray"]:
+        """Records as one NumPy array per column"""
+
+        def build():
+            from iexcloud.arrays import records_to_arrays
+
+            return records_to_arrays(self.records(), self.schema, self.compact)
+
+        return self._get("numpy", build)
+
+    @property
+    def schema(self) -> Dict[str, str]:
+
+        return SCHEMAS.get(self.dataset)
+
+    def __repr__(self) -> str:
+
+        decoded = ", ".join(self._outputs) or "none"
+        return f"Result(dataset={self.dataset!r}, decoded={decoded})"
@@ -0,0 +1,246 @@
+import asyncio
+import random
+import threading
+import time
+
+from fnmatch import fnmatchcase
+from typing import Dict, Iterable
+from requests import Response
+from requests.exceptions import ConnectionError, RequestException, Timeout
+
+# Errors raised by the transports that are worth sending again
+TRANSIENT_ERRORS = (ConnectionError, Timeout, asyncio.TimeoutError)
+
+
+class CircuitOpenError(RequestException):
+    """Raised instead of sending a request while a host's circuit is open"""
+
+
+class RetryPolicy(object):
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        statuses: Iterable[int] = (500, 502, 503, 504),
+    ):
+        """When and how long to wait before sending a failed request again
+
+        Only connection errors, timeouts and ``statuses`` are retried. Anything
+        else, such as 402 (out of credits) or 403 (bad token), fails fast.
+
+        Args:
+            max_retries: maximum number of retries of a request
+            backoff: base of the exponential backoff in seconds
+            max_backoff: cap of a single wait in seconds
+            statuses: HTTP statuses to retry
+        """
+
+        self.max_retries: int = max_retries
+        self.backoff: float = backoff
+        self.max_backoff: float = max_backoff
+        self.statuses: frozenset = frozenset(statuses)
+        self.retries: int = 0
+        self.exhausted: int = 0
+
+    def should_retry(
+        self, attempt: int, response: Response = None, error: Exception = None
+    ) -> bool:
+        """Decide whether to retry and count the decision
+
+        Args:
+            attempt: number of retries already made
+            response: response of the attempt, if any
+            error: exception raised by the attempt, if any
+
+        Returns:
+            bool: whether to send the request again
+        """
+
+        if error is not None:
+            transient = isinstance(error, TRANSIENT_ERRORS)
+        else:
+            transient = response.status_code in self.statuses
+
+        if not transient:
+            return False
+
+        if attempt >= self.max_retries:
+            self.exhausted += 1
+            return False
+
+        self.retries += 1
+        return True
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before a retry, with full jitter
+
+        Args:
+            attempt: number of retries already made
+
+        Returns:
+            float: seconds to wait
+        """
+
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def stats(self) -> dict:
+
+        return {"retries": self.retries, "exhausted": self.exhausted}
+
+
+class CircuitBreaker(object):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """Stop sending requests to a host after consecutive failures
+
+        After ``failure_threshold`` consecutive failures the circuit opens and
+        requests fail with ``CircuitOpenError``. Once ``reset_timeout`` has
+        passed one trial request is let through: success closes the circuit,
+        failure opens it again, and a trial that is throttled or interrupted
+        is released so the next request becomes the trial.
+
+        Args:
+            failure_threshold: consecutive failures that open the circuit
+            reset_timeout: seconds the circuit stays open
+        """
+
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self.state: str = self.CLOSED
+        self.failures: int = 0
+        self.opened: int = 0
+        self.rejected: int = 0
+        self._opened_at: float = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Check that a request may be sent
+
+        Raises:
+            CircuitOpenError: when the circuit is open
+
+        Returns:
+            bool: whether the request is the trial of a half-open circuit, to
+            be resolved with ``record_success``, ``record_failure`` or
+            ``release``
+        """
+
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+
+            if (
+                self.state == self.OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                self.state = self.HALF_OPEN
+                return True
+
+            self.rejected += 1
+
+        raise CircuitOpenError("Circuit is open after repeated failures")
+
+    def record_success(self):
+
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self):
+
+        with self._lock:
+            self.failures += 1
+
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opened += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        """Give back a trial that neither succeeded nor failed, e.g. a 429
+
+        The circuit reopens without restarting its timeout, so the next request
+        is let through as the trial. Does nothing once the trial is resolved.
+        """
+
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def stats(self) -> dict:
+
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class RetryPolicies(object):
+    def __init__(
+        self,
+        default: RetryPolicy = None,
+        endpoints: Dict[str, RetryPolicy] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        """Retry policies per endpoint and circuit breakers per host
+
+        Args:
+            default: policy of endpoints without their own. Defaults to
+                ``RetryPolicy()``.
+            endpoints: policies keyed by a glob of the API path, e.g.
+                ``{"/stock/*/news/*": RetryPolicy(max_retries=0)}``. The first
+                matching pattern wins.
+            failure_threshold: consecutive failures that open a host's circuit
+            reset_timeout: seconds a host's circuit stays open
+        """
+
+        self.default: RetryPolicy = default if default is not None else RetryPolicy()
+        self.endpoints: Dict[str, RetryPolicy] = dict(endpoints or {})
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def policy(self, path: str) -> RetryPolicy:
+
+        for pattern, policy in self.endpoints.items():
+            if fnmatchcase(path, pattern):
+                return policy
+
+        return self.default
+
+    def breaker(self, host: str) -> CircuitBreaker:
+
+        with self._lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout
+                )
+
+            return self.breakers[host]
+
+    def stats(self) -> dict:
+        """Counters of the policies and breakers, for tuning
+
+        Returns:
+            dict: retry counters keyed by endpoint pattern ("default" for the
+                default policy) and breaker state keyed by host
+        """
+
+        retries = {"default": self.default.stats()}
+        retries.update(
+            {pattern: policy.stats() for pattern, policy in self.endpoints.items()}
+        )
+
+        return {
+            "retries": retries,
+            "breakers": {host: cb.stats() for host, cb in self.breakers.items()},
+        }
@@ -0,0 +1,93 @@
+"""Column types of the ``Stock`` endpoints
+
+Kinds:
+
+    - datetime: ISO date string or millisecond epoch, parsed to datetime64
+    - float: float64, float32 in compact mode
+    - int: int64, int32 in compact mode. Nullable when values are missing.
+    - bool: bool. Nullable when values are missing.
+    - category: low-cardinality string stored as pandas categorical
+    - string: free text kept as Python strings
+"""
+
+from typing import Dict
+
+PRICE = {
+    "date": "datetime",
+    "open": "float",
+    "close": "float",
+    "high": "float",
+    "low": "float",
+    "volume": "int",
+    "uOpen": "float",
+    "uClose": "float",
+    "uHigh": "float",
+    "uLow": "float",
+    "uVolume": "int",
+    "change": "float",
+    "changePercent": "float",
+    "label": "string",
+    "changeOverTime": "float",
+    "minute": "string",
+    "average": "float",
+    "notional": "float",
+    "numberOfTrades": "int",
+}
+
+DIVIDEND = {
+    "exDate": "datetime",
+    "paymentDate": "datetime",
+    "recordDate": "datetime",
+    "declaredDate": "datetime",
+    "amount": "float",
+    "flag": "category",
+    "currency": "category",
+    "description": "string",
+    "frequency": "category",
+    "date": "datetime",
+}
+
+SPLIT = {
+    "exDate": "datetime",
+    "declaredDate": "datetime",
+    "ratio": "float",
+    "toFactor": "float",
+    "fromFactor": "float",
+    "description": "string",
+    "date": "datetime",
+}
+
+EARNING = {
+    "actualEPS": "float",
+    "consensusEPS": "float",
+    "announceTime": "category",
+    "numberOfEstimates": "int",
+    "EPSSurpriseDollar": "float",
+    "EPSReportDate": "datetime",
+    "fiscalPeriod": "category",
+    "fiscalEndDate": "datetime",
+    "yearAgo": "float",
+    "yearAgoChangePercent": "float",
+    "currency": "category",
+}
+
+NEWS = {
+    "datetime": "datetime",
+    "headline": "string",
+    "source": "category",
+    "url": "string",
+    "summary": "string",
+    "related": "string",
+    "image": "string",
+    "lang": "category",
+    "hasPaywall": "bool",
+}
+
+# Stock attribute -> schema
+SCHEMAS: Dict[str, Dict[str, str]] = {
+    "price": PRICE,
+    "dividend": DIVIDEND,
+    "split": SPLIT,
+    "earning": EARNING,
+    "news": NEWS,
+}
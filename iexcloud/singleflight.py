@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable
+
+# result of a flight whose leader was cancelled, telling followers to retry
+_RETRY = object()
+
+
+class SingleFlight(object):
+    def __init__(self):
+        """Share one call between threads asking for the same key at once
+
+        While a call for a key is in flight, other callers with the same key
+        wait for it and receive its result or exception instead of making
+        their own call.
+        """
+
+        self.calls: int = 0
+        self.shared: int = 0
+        self._flights: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], object]):
+        """Call ``func`` unless a call for ``key`` is already in flight
+
+        Args:
+            key: identity of the call
+            func: function making the call
+
+        Returns:
+            object: result of the shared call
+        """
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+
+            if leader:
+                flight = self._flights[key] = Future()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            return flight.result()
+
+        try:
+            result = func()
+        except BaseException as error:
+            flight.set_exception(error)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    def stats(self) -> dict:
+
+        return {"calls": self.calls, "shared": self.shared}
+
+
+class AsyncSingleFlight(object):
+    def __init__(self):
+        """asyncio counterpart of ``SingleFlight`` sharing calls between tasks
+
+        Cancelling the task leading a call does not cancel its followers: one
+        of them makes the call again and the others share it.
+        """
+
+        self.calls: int = 0
+        self.shared: int = 0
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable]):
+        """Await ``func()`` unless a call for ``key`` is already in flight
+
+        Args:
+            key: identity of the call
+            func: coroutine function making the call
+
+        Returns:
+            object: result of the shared call
+        """
+
+        while True:
+            flight = self._flights.get(key)
+            if flight is None:
+                break
+
+            self.shared += 1
+            result = await asyncio.shield(flight)
+            if result is not _RETRY:
+                return result
+
+        flight = self._flights[key] = asyncio.get_event_loop().create_future()
+        self.calls += 1
+
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            flight.set_result(_RETRY)
+            raise
+        except BaseException as error:
+            flight.set_exception(error)
+            # followers re-raise the error themselves; mark it as retrieved so
+            # a call nobody shared does not log "exception never retrieved"
+            flight.exception()
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
+
+    def stats(self) -> dict:
+
+        return {"calls": self.calls, "shared": self.shared}
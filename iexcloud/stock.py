@@ -1,17 +1,55 @@
-import pandas as pd
-import requests
 import json
 
-from typing import Union, List
+from typing import TYPE_CHECKING, Iterator, Union, List
 from requests import Response
-from iexcloud.config import get_token, get_url
+from iexcloud.client import Client, get_client
+from iexcloud.parse import loads
+from iexcloud.result import Result
+from iexcloud.schema import SCHEMAS
+from iexcloud.stream import iter_chunks, iter_response
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+OUTPUTS = ("pandas", "json", "arrow", "numpy", "records", "result")
 
 
 class Stock(object):
-    def __init__(self, symbol: str, output="pandas"):
+    def __init__(
+        self,
+        symbol: str,
+        output="pandas",
+        client: Client = None,
+        compact: bool = False,
+    ):
+        """Historical data, corporate actions, news and reference data of a stock
+
+        Args:
+            symbol: stock symbol
+            output: {"pandas", "json", "arrow", "numpy", "records", "result"}.
+                Output format. "arrow" returns pyarrow Tables and requires
+                pyarrow. "numpy" returns a dict of NumPy arrays per column and
+                "records" the decoded list of dicts; neither imports pandas.
+                "result" returns a ``Result`` keeping the raw payload and
+                decoding it on first access.
+            client: client to use. Defaults to the shared one.
+            compact: whether pandas, arrow and numpy outputs use float32 for
+                floats, and pandas and numpy outputs int32 for ints whose
+                values fit
+
+        Raises:
+            ValueError: when output is not one of the supported formats
+        """
+
+        if output not in OUTPUTS:
+            raise ValueError(
+                "Output should be one of " + ", ".join(f"'{o}'" for o in OUTPUTS)
+            )
 
         self.symbol: str = symbol
         self.output: str = output
+        self.compact: bool = compact
+        self.client: Client = client if client is not None else get_client()
         self.dividend = None
         self.earning = None
         self.logo = None
@@ -22,29 +60,56 @@ class Stock(object):
         self.sentiment = None
         self.split = None
 
-    def _create_output(self, response: Response, attribute: str = None):
+    def _create_output(
+        self, response: Response, attribute: str = None, dataset: str = None
+    ):
 
         if response:
 
             if self.output == "json":
                 return response.text
-            elif self.output == "pandas":
-                return self._response_text_to_pd(response.text, attribute)
+            elif self.output == "result":
+                return Result(response.content, attribute, dataset, self.compact)
+
+            return self._records_to_output(loads(response.content), attribute, dataset)
 
         else:  # pragma: no cover
             raise response.raise_for_status()
 
-    def _response_text_to_pd(self, response_text: str, attribute: str = None):
+    def _records_to_output(self, records, attribute: str = None, dataset: str = None):
 
-        response_text = response_text.replace("'", '"')
+        if self.output == "json":
+            return json.dumps(records)
 
         if attribute is not None:
-            response_text = json.loads(response_text)[attribute]
-            response_text = json.dumps(response_text)
+            records = records[attribute]
+
+        if self.output == "result":
+            return Result.from_records(records, dataset, self.compact)
+
+        # builders are imported on first use so that pandas, NumPy and pyarrow
+        # are only loaded by the output modes that need them
+        if self.output == "records":
+            return records
+        elif self.output == "pandas":
+            from iexcloud.frames import records_to_frame
+
+            return records_to_frame(records, SCHEMAS.get(dataset), self.compact)
+        elif self.output == "arrow":
+            from iexcloud.tables import records_to_table
+
+            return records_to_table(records, SCHEMAS.get(dataset), self.compact)
+        elif self.output == "numpy":
+            from iexcloud.arrays import records_to_arrays
 
-        return pd.read_json(response_text)
+            return records_to_arrays(records, SCHEMAS.get(dataset), self.compact)
 
-    def get_dividend(self, time_range: str) -> Union[pd.DataFrame, str]:
+    @staticmethod
+    def _load_json(response: Response):
+
+        return loads(response.content)
+
+    def get_dividend(self, time_range: str) -> Union["pd.DataFrame", str]:
         """basic dividend data for US equities, ETFs, and Mutual Funds.
 
         Args:
@@ -73,15 +138,14 @@ class Stock(object):
                 - frequency( (string) )Frequency of the dividend
         """
 
-        api_url = f"{get_url()}/stock/{self.symbol}/dividends/{time_range}?"
-        response = requests.get(api_url, params={"token": get_token()})
-        output = self._create_output(response)
+        response = self.client.get(f"/stock/{self.symbol}/dividends/{time_range}")
+        output = self._create_output(response, dataset="dividend")
 
         self.dividend = output
 
         return output
 
-    def get_earning(self, last: int) -> Union[pd.DataFrame, str]:
+    def get_earning(self, last: int) -> Union["pd.DataFrame", str]:
         """Earnings data for a given company including the actual EPS and other info.
 
         Args:
@@ -110,9 +174,8 @@ class Stock(object):
                     actualEPS.
         """
 
-        api_url = f"{get_url()}/stock/{self.symbol}/earnings/{last}?"
-        response = requests.get(api_url, params={"token": get_token()})
-        output = self._create_output(response, "earnings")
+        response = self.client.get(f"/stock/{self.symbol}/earnings/{last}")
+        output = self._create_output(response, "earnings", "earning")
 
         self.earning = output
 
@@ -125,15 +188,14 @@ class Stock(object):
             str: Load url to company logo
         """
 
-        api_url = f"{get_url()}/stock/{self.symbol}/logo?"
-        response = requests.get(api_url, params={"token": get_token()})
-        output = json.loads(response.text)["url"]
+        response = self.client.get(f"/stock/{self.symbol}/logo")
+        output = self._load_json(response)["url"]
 
         self.logo = output
 
         return output
 
-    def get_news(self, last: int) -> Union[pd.DataFrame, str]:
+    def get_news(self, last: int) -> Union["pd.DataFrame", str]:
         """Provides intraday news from over 3,000 global news sources
 
         Args:
@@ -157,9 +219,8 @@ class Stock(object):
                 - lang (string) Language of the source article
                 - hasPaywall (boolean) Whether the news source has a paywall
         """
-        api_url = f"{get_url()}/stock/{self.symbol}/news/last/{last}"
-        response = requests.get(api_url, params={"token": get_token()})
-        output = self._create_output(response)
+        response = self.client.get(f"/stock/{self.symbol}/news/last/{last}")
+        output = self._create_output(response, dataset="news")
 
         self.news = output
 
@@ -172,15 +233,14 @@ class Stock(object):
             List[str]: list of peers
         """
 
-        api_url = f"{get_url()}/stock/{self.symbol}/peers"
-        response = requests.get(api_url, params={"token": get_token()})
-        output = json.loads(response.text)
+        response = self.client.get(f"/stock/{self.symbol}/peers")
+        output = self._load_json(response)
 
         self.peer = output
 
         return output
 
-    def get_price(self, time_range: str) -> Union[pd.DataFrame, str]:
+    def get_price(self, time_range: str) -> Union["pd.DataFrame", str]:
         """Returns adjusted and unadjusted historical data for up to 15 years.
 
         Args:
@@ -223,14 +283,32 @@ class Stock(object):
                 - changePercent: (number) Change percent from previous trading day.
         """
 
-        api_url = f"{get_url()}/stock/{self.symbol}/chart/{time_range}"
-        response = requests.get(api_url, params={"token": get_token()})
-        output = self._create_output(response)
+        response = self.client.get(f"/stock/{self.symbol}/chart/{time_range}")
+        output = self._create_output(response, dataset="price")
 
         self.price = output
 
         return output
 
+    def iter_price(self, time_range: str, chunk_size: int = 5000) -> Iterator:
+        """Stream historical prices in chunks of rows
+
+        The response is decoded incrementally, so memory is bounded by
+        ``chunk_size`` whatever the time range. ``self.price`` is not set.
+
+        Args:
+            time_range: time range, as in :meth:`get_price`
+            chunk_size: number of rows per chunk
+
+        Returns:
+            Iterator: outputs of ``chunk_size`` rows each in the output format
+        """
+
+        response = self.client.stream(f"/stock/{self.symbol}/chart/{time_range}")
+
+        for records in iter_chunks(iter_response(response), chunk_size):
+            yield self._records_to_output(records, dataset="price")
+
     def get_profile(self) -> dict:
         """get company profile
 
@@ -271,15 +349,14 @@ class Stock(object):
                 phone (string) phone number of the company if available
         """
 
-        api_url = f"{get_url()}/stock/{self.symbol}/company"
-        response = requests.get(api_url, params={"token": get_token()})
-        output = json.loads(response.text)
+        response = self.client.get(f"/stock/{self.symbol}/company")
+        output = self._load_json(response)
 
         self.profile = output
 
         return output
 
-    def get_split(self, time_range: str) -> Union[pd.DataFrame, str]:
+    def get_split(self, time_range: str) -> Union["pd.DataFrame", str]:
         """get stock splits
 
         Args:
@@ -311,10 +388,9 @@ class Stock(object):
                 - description (string) Description of the split event.
         """
 
-        api_url = f"{get_url()}/stock/{self.symbol}/splits/{time_range}"
-        response = requests.get(api_url, params={"token": get_token()})
+        response = self.client.get(f"/stock/{self.symbol}/splits/{time_range}")
 
-        output = self._create_output(response)
+        output = self._create_output(response, dataset="split")
 
         self.split = output
 
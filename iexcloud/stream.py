@@ -0,0 +1,271 @@
+import codecs
+import json
+
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List
+from requests import Response
+
+_WHITESPACE = " \t\n\r"
+
+
+# states of _Decoder
+_OPEN, _FIRST, _ITEM, _COLON, _MEMBER, _NEXT, _DONE = range(7)
+# returned by _Decoder._value when the value is not complete yet
+_MORE = object()
+
+
+class _Decoder(object):
+    def __init__(self):
+        """Items of a top-level JSON array or object decoded from pushed chunks
+
+        Decoding a value restarts from its beginning, so a value spanning
+        chunks is only retried once the buffered text has doubled, which keeps
+        the work linear in the size of the value.
+        """
+
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json = json.JSONDecoder()
+        self.text = ""
+        self.pos = 0
+        self.chunks: List[str] = []
+        self.pending = 0
+        self.need = 0
+        self.eof = False
+        self.state = _OPEN
+        self.closing = None
+        self.key = None
+
+    def feed(self, chunk: bytes, eof: bool = False) -> List:
+        """Decode the items completed by the next chunk
+
+        Args:
+            chunk: next bytes of the payload
+            eof: whether no chunk follows
+
+        Raises:
+            ValueError: when the payload is not a JSON array or object
+
+        Returns:
+            List: array elements, or (key, value) pairs of an object
+        """
+
+        text = self.decoder.decode(chunk, eof)
+        self.chunks.append(text)
+        self.pending += len(text)
+        self.eof = eof
+
+        if not eof and len(self.text) - self.pos + self.pending < self.need:
+            return []
+
+        # joined once per window, so a long value is copied a few times only
+        self.text = self.text[self.pos :] + "".join(self.chunks)
+        self.pos = 0
+        self.chunks = []
+        self.pending = self.need = 0
+
+        items = []
+        while self._step(items):
+            pass
+
+        return items
+
+    def _step(self, items: List) -> bool:
+
+        if self.state == _OPEN:
+            opening = self._expect("[{")
+            if opening is None:
+                return False
+            self.closing = "]" if opening == "[" else "}"
+            self.state = _FIRST
+        elif self.state == _FIRST:
+            character = self._peek()
+            if character == "" and not self.eof:
+                return False
+            if character == self.closing:
+                self.pos += 1
+                self.state = _DONE
+            else:
+                self.state = _ITEM
+        elif self.state in (_ITEM, _MEMBER):
+            value = self._value()
+            if value is _MORE:
+                return False
+            if self.closing == "]":
+                items.append(value)
+                self.state = _NEXT
+            elif self.state == _ITEM:
+                self.key = value
+                self.state = _COLON
+            else:
+                items.append((self.key, value))
+                self.state = _NEXT
+        elif self.state == _COLON:
+            if self._expect(":") is None:
+                return False
+            self.state = _MEMBER
+        elif self.state == _NEXT:
+            separator = self._expect("," + self.closing)
+            if separator is None:
+                return False
+            self.state = _DONE if separator == self.closing else _ITEM
+        else:
+            return False
+
+        return True
+
+    def _peek(self) -> str:
+        """Next non-whitespace character, or "" when none is buffered"""
+
+        while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+            self.pos += 1
+
+        return self.text[self.pos] if self.pos < len(self.text) else ""
+
+    def _expect(self, characters: str) -> str:
+        """Consume one of ``characters``, or return None to wait for more"""
+
+        character = self._peek()
+        if character == "" and not self.eof:
+            return None
+
+        if character == "" or character not in characters:
+            raise ValueError(
+                f"Expected one of {characters!r} in JSON payload, got {character!r}"
+            )
+
+        self.pos += 1
+        return character
+
+    def _value(self):
+        """Decode the next complete JSON value, or return _MORE to wait"""
+
+        if self._peek() == "" and not self.eof:
+            return _MORE
+
+        try:
+            value, end = self.json.raw_decode(self.text, self.pos)
+        except ValueError:
+            if self.eof:
+                raise
+            self.need = 2 * (len(self.text) - self.pos)
+            return _MORE
+
+        # a number at the end of the buffer may continue in the next chunk
+        if end == len(self.text) and not self.eof:
+            self.need = len(self.text) - self.pos + 1
+            return _MORE
+
+        self.pos = end
+        return value
+
+
+def iter_items(chunks: Iterable[bytes]) -> Iterator:
+    """Decode the items of a top-level JSON array or object incrementally
+
+    Only the items completed by one chunk are held in memory besides the
+    unread part of the payload, so memory stays bounded whatever its size.
+
+    Args:
+        chunks: byte chunks of the payload, e.g. ``response.iter_content()``
+
+    Raises:
+        ValueError: when the payload is not a JSON array or object
+
+    Returns:
+        Iterator: array elements, or (key, value) pairs of an object
+    """
+
+    decoder = _Decoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+
+    yield from decoder.feed(b"", eof=True)
+
+
+async def aiter_items(chunks: AsyncIterable[bytes]) -> AsyncIterator:
+    """Asynchronous :func:`iter_items`
+
+    Args:
+        chunks: byte chunks of the payload, e.g. ``content.iter_chunked()`` of
+            an aiohttp response
+
+    Raises:
+        ValueError: when the payload is not a JSON array or object
+
+    Returns:
+        AsyncIterator: array elements, or (key, value) pairs of an object
+    """
+
+    decoder = _Decoder()
+    async for chunk in chunks:
+        for item in decoder.feed(chunk):
+            yield item
+
+    for item in decoder.feed(b"", eof=True):
+        yield item
+
+
+def iter_chunks(items: Iterable, size: int) -> Iterator[List]:
+    """Group items into lists of ``size``
+
+    Args:
+        items: items to group
+        size: maximum length of a group
+
+    Returns:
+        Iterator[List]: groups of items
+    """
+
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+async def aiter_chunks(items: AsyncIterable, size: int) -> AsyncIterator[List]:
+    """Asynchronous :func:`iter_chunks`
+
+    Args:
+        items: items to group
+        size: maximum length of a group
+
+    Returns:
+        AsyncIterator[List]: groups of items
+    """
+
+    chunk = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def iter_response(response: Response, chunk_size: int = 64 * 1024) -> Iterator:
+    """Decode the items of a streamed response incrementally
+
+    The response is closed once its items are exhausted.
+
+    Args:
+        response: response of a request sent with ``stream=True``
+        chunk_size: bytes read from the network at a time
+
+    Raises:
+        HTTPError: when the response is an error
+
+    Returns:
+        Iterator: array elements, or (key, value) pairs of an object
+    """
+
+    try:
+        response.raise_for_status()
+        yield from iter_items(response.iter_content(chunk_size))
+    finally:
+        response.close()
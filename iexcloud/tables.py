@@ -0,0 +1,100 @@
+from typing import Dict, List, Union
+from iexcloud.parse import columns_of
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
+
+def _to_arrow_number(values: list, arrow_type) -> "pa.Array":
+
+    try:
+        return pa.array(values, type=arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+
+    # numbers sent as strings
+    array = pa.array([None if value is None else str(value) for value in values])
+    return array.cast(arrow_type)
+
+
+def _to_arrow_datetime(values: list) -> "pa.Array":
+
+    if any(isinstance(value, (int, float)) for value in values):
+        return pa.array(values, type=pa.int64()).cast(pa.timestamp("ms"))
+
+    # empty or malformed dates are null, like NaT in pandas output
+    strings = [value if value else None for value in values]
+    try:
+        return pa.array(strings, type=pa.string()).cast(pa.timestamp("ms"))
+    except pa.ArrowInvalid:
+        return pa.array([_parse(value) for value in strings], type=pa.timestamp("ms"))
+
+
+def _parse(value: str):
+
+    try:
+        return pa.scalar(value).cast(pa.timestamp("ms")).as_py()
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+
+def _to_arrow_column(values: list, kind: str, compact: bool) -> "pa.Array":
+
+    if kind == "datetime":
+        return _to_arrow_datetime(values)
+    elif kind == "float":
+        return _to_arrow_number(values, pa.float32() if compact else pa.float64())
+    elif kind == "int":
+        # ints keep int64 in compact mode: a type chosen from each symbol's
+        # values would give tables that cannot be concatenated
+        return _to_arrow_number(values, pa.int64())
+    elif kind == "bool":
+        return pa.array(values, type=pa.bool_())
+    elif kind == "category":
+        return pa.array(values, type=pa.string()).dictionary_encode()
+    else:
+        return pa.array(values, type=pa.string())
+
+
+def records_to_table(
+    records: Union[List[dict], dict],
+    schema: Dict[str, str] = None,
+    compact: bool = False,
+) -> "pa.Table":
+    """Build a pyarrow Table from decoded records
+
+    Declared columns get their Arrow type: timestamp[ms] for dates,
+    dictionary-encoded strings for categories, float32 in compact mode and
+    int64 for ints, so tables of every symbol share one schema. Other columns
+    have their type inferred by pyarrow.
+
+    Args:
+        records: list of records, or a single record
+        schema: column name -> kind, see ``iexcloud.schema``
+        compact: whether to use float32 for floats
+
+    Raises:
+        ImportError: when pyarrow is not installed
+
+    Returns:
+        pa.Table: records as rows
+    """
+
+    if pa is None:  # pragma: no cover
+        raise ImportError("Arrow output requires pyarrow: pip install pyarrow")
+
+    if isinstance(records, dict):
+        records = [records]
+
+    schema = schema or {}
+    columns = {}
+    for column in columns_of(records):
+        values = [record.get(column) for record in records]
+        if column in schema:
+            columns[column] = _to_arrow_column(values, schema[column], compact)
+        else:
+            columns[column] = pa.array(values)
+
+    return pa.table(columns) if columns else pa.table({})
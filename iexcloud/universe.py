@@ -0,0 +1,174 @@
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, NamedTuple
+from iexcloud.client import Client, get_client
+from iexcloud.stock import Stock
+
+
+class SymbolResult(NamedTuple):
+    """Outcome of one symbol's request
+
+    ``output`` is what the ``Stock.get_*`` method returned, or None when it
+    raised ``error``.
+    """
+
+    symbol: str
+    output: object
+    error: Exception
+    elapsed: float
+
+    @property
+    def ok(self) -> bool:
+
+        return self.error is None
+
+
+class FetchReport(object):
+    def __init__(self):
+        """Successes, failures and timings of a universe fetch"""
+
+        self.successes: List[str] = []
+        self.failures: Dict[str, Exception] = {}
+        self.timings: Dict[str, float] = {}
+        self.elapsed: float = 0.0
+
+    def add(self, result: SymbolResult):
+
+        self.timings[result.symbol] = result.elapsed
+
+        if result.ok:
+            self.successes.append(result.symbol)
+        else:
+            self.failures[result.symbol] = result.error
+
+    @property
+    def failed_symbols(self) -> List[str]:
+        """Symbols to re-queue"""
+
+        return list(self.failures)
+
+    def __repr__(self) -> str:
+
+        return (
+            f"FetchReport(successes={len(self.successes)}, "
+            f"failures={len(self.failures)}, elapsed={self.elapsed:.2f}s)"
+        )
+
+
+class UniverseFetch(object):
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        dataset: str,
+        args: tuple = (),
+        kwargs: dict = None,
+        workers: int = 32,
+        output: str = "pandas",
+        client: Client = None,
+    ):
+        """Run one ``Stock.get_*`` method for many symbols on a thread pool
+
+        Iterating yields a ``SymbolResult`` per symbol as it completes. A failing
+        symbol is recorded in ``report`` instead of aborting the run.
+
+        Args:
+            symbols: stock symbols
+            dataset: name of the ``Stock.get_*`` method without the prefix,
+                e.g. "price" or "dividend"
+            args: positional arguments of the method
+            kwargs: keyword arguments of the method
+            workers: maximum number of threads
+            output: output format, as in ``Stock``.
+            client: client to use. Defaults to the shared one.
+        """
+
+        if not hasattr(Stock, f"get_{dataset}"):
+            raise ValueError(f"Stock has no method get_{dataset}")
+
+        self.symbols: List[str] = list(symbols)
+        self.dataset: str = dataset
+        self.args: tuple = args
+        self.kwargs: dict = kwargs or {}
+        self.workers: int = workers
+        self.output: str = output
+        self.client: Client = client if client is not None else get_client()
+        self.report: FetchReport = FetchReport()
+
+    def _fetch(self, symbol: str) -> SymbolResult:
+
+        start = time.perf_counter()
+        stock = Stock(symbol, self.output, client=self.client)
+
+        try:
+            output = getattr(stock, f"get_{self.dataset}")(*self.args, **self.kwargs)
+        except Exception as error:
+            return SymbolResult(symbol, None, error, time.perf_counter() - start)
+
+        return SymbolResult(symbol, output, None, time.perf_counter() - start)
+
+    def __iter__(self) -> Iterator[SymbolResult]:
+
+        self.report = FetchReport()
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self._fetch, symbol) for symbol in self.symbols]
+
+            try:
+                for future in as_completed(futures):
+                    result = future.result()
+                    self.report.add(result)
+                    yield result
+            finally:
+                for future in futures:
+                    future.cancel()
+                self.report.elapsed = time.perf_counter() - start
+
+    def run(self) -> FetchReport:
+        """Fetch every symbol, discarding outputs
+
+        Returns:
+            FetchReport: report of the run
+        """
+
+        for _ in self:
+            pass
+
+        return self.report
+
+
+def fetch_universe(
+    symbols: Iterable[str],
+    dataset: str,
+    *args,
+    workers: int = 32,
+    output: str = "pandas",
+    client: Client = None,
+    **kwargs,
+) -> UniverseFetch:
+    """Fetch one dataset for many symbols concurrently
+
+    Example:
+        >>> fetch = fetch_universe(symbols, "price", time_range="1m", workers=32)
+        >>> for result in fetch:
+        ...     if result.ok:
+        ...         store(result.symbol, result.output)
+        >>> retry = fetch.report.failed_symbols
+
+    Args:
+        symbols: stock symbols
+        dataset: name of the ``Stock.get_*`` method without the prefix
+        *args: positional arguments of the method
+        workers: maximum number of threads
+        output: output format, as in ``Stock``.
+        client: client to use. Defaults to the shared one.
+        **kwargs: keyword arguments of the method
+
+    Returns:
+        UniverseFetch: iterable of ``SymbolResult`` with a ``report``
+    """
+
+    return UniverseFetch(
+        symbols, dataset, args, kwargs, workers=workers, output=output, client=client
+    )
@@ -23,6 +23,13 @@ classifiers = [
 
 install_reqs = ["requests>=2.22.0"]
 
+extras_reqs = {
+    "async": ["aiohttp>=3.6"],
+    "fast": ["orjson"],
+    "arrow": ["pyarrow>=1.0"],
+    "duckdb": ["duckdb>=0.9"],
+}
+
 if __name__ == "__main__":
     setup(
         name=DISTNAME,
@@ -32,8 +39,9 @@ if __name__ == "__main__":
         license=LICENSE,
         classifiers=classifiers,
         install_requires=install_reqs,
+        extras_require=extras_reqs,
         url=URL,
-        packages=["iexcloud"],
+        packages=["iexcloud", "iexcloud.archive"],
         version=versioneer.get_version(),
         cmdclass=versioneer.get_cmdclass(),
     )
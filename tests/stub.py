@@ -0,0 +1,80 @@
+import json
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+
+        path = urlsplit(self.path).path
+        self.server.hits.append(self.path)
+
+        route = self.server.routes.get(path)
+        if route is None:
+            status, body, headers = 404, {"error": "not found"}, {}
+        elif callable(route):
+            status, body, headers = route(self)
+        else:
+            status, body, headers = 200, route, {}
+
+        if not isinstance(body, (bytes, str)):
+            body = json.dumps(body)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """Local stand-in for the IEX API serving canned responses by path
+
+    Routes map an API path (without the "/stable" prefix of the real url) to
+    either a JSON-serialisable body or a callable ``handler -> (status, body,
+    headers)``.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, routes: dict = None):
+
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.routes = dict(routes or {})
+        self.hits = []
+        self.connections = 0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+
+        return "http://%s:%d" % self.server_address
+
+    def process_request(self, request, client_address):
+
+        self.connections += 1
+        super().process_request(request, client_address)
+
+    def __enter__(self):
+
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,23 @@
+import pytest
+
+from contextlib import ExitStack
+from tests.stub import StubServer
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    """Start a ``StubServer`` in production mode for a dict of routes
+
+    The mode and token are set for the test only, and the servers are shut
+    down after it.
+    """
+
+    monkeypatch.setenv("IEX_MODE", "PRODUCTION")
+    monkeypatch.setenv("IEX_TOKEN", "production_token")
+
+    with ExitStack() as stack:
+
+        def start(routes: dict = None) -> StubServer:
+            return stack.enter_context(StubServer(routes))
+
+        yield start
@@ -0,0 +1,160 @@
+import asyncio
+import gc
+import time
+import warnings
+import pytest
+from urllib.parse import urlsplit
+from requests.exceptions import HTTPError
+from iexcloud import Client, RetryPolicies, RetryPolicy, Stock
+from iexcloud.aio import AsyncClient, AsyncStock, gather_prices
+
+PRICE = [
+    {"date": "2020-01-02", "close": 54.99, "volume": 11867660},
+    {"date": "2020-01-03", "close": 54.69, "volume": 11354460},
+]
+
+ROUTES = {
+    "/stock/KO/chart/1m": PRICE,
+    "/stock/PEP/chart/1m": PRICE,
+    "/stock/KO/earnings/1": {"symbol": "KO", "earnings": [{"actualEPS": 0.44}]},
+    "/stock/KO/peers": ["PEP", "KDP"],
+}
+
+
+@pytest.fixture
+def server(stub_server):
+
+    return stub_server(ROUTES)
+
+
+def test_matches_sync(server):
+
+    async def fetch(stock):
+        client = stock.client
+        result = [await stock.get_price("1m"), await stock.get_earning(1)]
+        await client.close()
+        return result + [stock.price]
+
+    sync = Stock("KO", client=Client(base_url=server.url))
+    stock = AsyncStock("KO", client=AsyncClient(base_url=server.url))
+    price, earning, attribute = asyncio.run(fetch(stock))
+
+    assert price.equals(sync.get_price("1m"))
+    assert earning.equals(sync.get_earning(1))
+    assert attribute is price
+
+
+def test_gather_prices(server):
+
+    async def fetch():
+        client = AsyncClient(base_url=server.url, limit=2)
+        result = await gather_prices(
+            ["KO", "PEP"], "1m", concurrency=2, output="json", client=client
+        )
+        await client.close()
+        return result
+
+    result = asyncio.run(fetch())
+
+    assert list(result) == ["KO", "PEP"]
+    assert result["KO"] == result["PEP"]
+    assert len(server.hits) == 2
+
+
+def test_session_closed_with_its_loop(server):
+
+    client = AsyncClient(base_url=server.url)
+
+    async def fetch():
+        await client.get("/stock/KO/peers")
+        return client._session
+
+    first = asyncio.run(fetch())
+    assert first.closed
+
+    second = asyncio.run(fetch())
+    assert second is not first
+    asyncio.run(client.close())
+    assert second.closed
+
+
+def test_session_closed_with_manual_loops(server):
+
+    client = AsyncClient(base_url=server.url)
+
+    async def fetch():
+        await client.get("/stock/KO/peers")
+        return client._session
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        loops = [asyncio.new_event_loop(), asyncio.new_event_loop()]
+        first = loops[0].run_until_complete(fetch())
+        # the first loop is open but not running while the second one is used
+        second = loops[1].run_until_complete(fetch())
+        assert first.closed and not second.closed
+
+        loops[1].run_until_complete(client.close())
+        for loop in loops:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+        del first, second
+        gc.collect()
+
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+
+
+def test_iter_price(server):
+
+    client = AsyncClient(base_url=server.url)
+
+    async def stream(output, path="1m"):
+        stock = AsyncStock("KO", output, client=client)
+        return [chunk async for chunk in stock.iter_price(path, chunk_size=1)]
+
+    async def fetch():
+        records = await stream("records")
+        frames = await stream("pandas")
+        with pytest.raises(HTTPError):
+            await stream("records", "max")
+        await client.close()
+        return records, frames
+
+    records, frames = asyncio.run(fetch())
+
+    assert records == [[PRICE[0]], [PRICE[1]]]
+    assert [len(frame) for frame in frames] == [1, 1]
+    assert str(frames[0]["date"].dtype).startswith("datetime64")
+    # a fully read stream gives its connection back to the pool
+    assert server.connections == 1
+
+
+def test_half_open_cancelled(server):
+
+    def slow(_):
+        time.sleep(0.5)
+        return 200, ["PEP"], {}
+
+    async def fetch():
+        policies = RetryPolicies(
+            RetryPolicy(max_retries=0), failure_threshold=1, reset_timeout=0
+        )
+        client = AsyncClient(base_url=server.url, retry=policies)
+        breaker = policies.breaker(urlsplit(server.url).netloc)
+        breaker.record_failure()
+
+        server.routes["/stock/KO/peers"] = slow
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.get("/stock/KO/peers"), 0.05)
+        state = breaker.state
+
+        server.routes["/stock/KO/peers"] = ["PEP"]
+        response = await client.get("/stock/KO/peers")
+        await client.close()
+        return state, response, breaker.state
+
+    state, response, after = asyncio.run(fetch())
+
+    assert state == "open"
+    assert response.json() == ["PEP"]
+    assert after == "closed"
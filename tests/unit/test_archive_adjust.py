@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+from iexcloud.archive import adjust_prices
+from iexcloud.archive.adjust import split_factors
+
+PRICE = [
+    {"date": "2020-01-02", "uClose": 100.0, "uVolume": 1000, "symbol": "KO"},
+    {"date": "2020-01-03", "uClose": 102.0, "uVolume": 1000, "symbol": "KO"},
+    {"date": "2020-01-06", "uClose": 50.0, "uVolume": 2000, "symbol": "KO"},
+    {"date": "2020-01-07", "uClose": 51.0, "uVolume": 2000, "symbol": "KO"},
+]
+SPLITS = [{"exDate": "2020-01-06", "ratio": 0.5, "fromFactor": 1, "toFactor": 2}]
+DIVIDENDS = [{"exDate": "2020-01-07", "amount": 0.5}]
+
+
+def test_split_adjustment():
+
+    prices = adjust_prices(PRICE, SPLITS)
+
+    np.testing.assert_allclose(prices["close"], [50.0, 51.0, 50.0, 51.0])
+    np.testing.assert_allclose(prices["volume"], [2000, 2000, 2000, 2000])
+    assert "totalReturnClose" not in prices
+
+
+def test_split_ratio_from_factors():
+
+    dates = pd.to_datetime(["2020-01-02", "2020-01-06"]).to_numpy()
+    splits = [{"exDate": "2020-01-03", "fromFactor": 1, "toFactor": 4}]
+
+    np.testing.assert_allclose(split_factors(dates, splits), [0.25, 1.0])
+
+
+def test_total_return():
+
+    prices = adjust_prices(PRICE, SPLITS, DIVIDENDS)
+
+    # the dividend is 1% of the close before its ex-date
+    np.testing.assert_allclose(prices["dividendFactor"], [0.99, 0.99, 0.99, 1.0])
+    np.testing.assert_allclose(prices["totalReturnClose"][0], 50.0 * 0.99)
+
+
+def test_future_actions():
+
+    splits = SPLITS + [{"exDate": "2020-02-01", "ratio": 0.5}]
+    dividends = DIVIDENDS + [{"exDate": "2020-02-03", "amount": 10.0}]
+
+    prices = adjust_prices(PRICE, splits, dividends)
+
+    np.testing.assert_allclose(prices["close"], [50.0, 51.0, 50.0, 51.0])
+    np.testing.assert_allclose(prices["dividendFactor"], [0.99, 0.99, 0.99, 1.0])
+
+
+def test_per_symbol():
+
+    other = [dict(row, symbol="PEP") for row in PRICE]
+    splits = [dict(SPLITS[0], symbol="KO")]
+
+    prices = adjust_prices(pd.DataFrame(PRICE + other), splits)
+
+    assert list(prices["symbol"].unique()) == ["KO", "PEP"]
+    np.testing.assert_allclose(prices["close"][4:], [100.0, 102.0, 50.0, 51.0])
+
+
+def test_unadjusted_columns_required():
+
+    with pytest.raises(ValueError):
+        adjust_prices([{"date": "2020-01-02", "close": 1.0}])
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from iexcloud.archive import DuckDBArchive  # noqa: E402
+from iexcloud.frames import records_to_frame  # noqa: E402
+from iexcloud.schema import PRICE as SCHEMA  # noqa: E402
+
+PRICE = [
+    {"date": "2019-12-31", "close": 54.69, "volume": 9021000, "extra": 1},
+    {"date": "2020-01-02", "close": 54.99, "volume": 11867660},
+]
+
+
+@pytest.fixture
+def archive():
+
+    archive = DuckDBArchive()
+    yield archive
+    archive.close()
+
+
+def test_views_keep_latest_rows(archive):
+
+    archive.write_prices("ko", records_to_frame(PRICE, SCHEMA, compact=True))
+    archive.write_prices("KO", [{"date": "2020-01-02", "close": 55.0}])
+
+    prices = archive.read_prices(["KO"])
+
+    assert list(prices["close"]) == pytest.approx([54.69, 55.0])
+    assert "extra" not in prices
+    assert archive.last_date("KO") == pd.Timestamp("2020-01-02")
+
+    archive.compact()
+    assert archive.query("SELECT count(*) AS n FROM prices_log")["n"][0] == 2
+
+
+def test_cross_section(archive):
+
+    archive.write_many("price", {"KO": PRICE, "PEP": PRICE})
+    archive.write("split", "KO", [{"exDate": "2020-01-02", "ratio": 0.5}])
+
+    closes = archive.query(
+        "SELECT symbol, close FROM prices WHERE date = ? ORDER BY symbol",
+        [pd.Timestamp("2020-01-02").to_pydatetime()],
+    )
+
+    assert list(closes["symbol"]) == ["KO", "PEP"]
+    assert len(archive.read_prices(start="2020-01-02", end="2020-01-02")) == 2
+    assert archive.read_splits(["KO"])["ratio"].tolist() == [0.5]
+
+
+def test_arrow_buffer(archive):
+
+    pytest.importorskip("pyarrow")
+    from iexcloud.tables import records_to_table
+
+    assert archive.write_prices("KO", records_to_table(PRICE, SCHEMA)) == 2
+    assert archive.read_prices()["volume"].tolist() == [9021000, 11867660]
@@ -0,0 +1,256 @@
+import time
+import pandas as pd
+import pytest
+from iexcloud.archive import Manifest, SQLiteArchive
+from iexcloud.archive.manifest import content_hash
+
+PRICE = [
+    {"date": "2020-01-02", "close": 54.99, "volume": 11867660},
+    {"date": "2020-01-03", "close": 54.69, "volume": 11354500},
+]
+
+
+@pytest.fixture
+def manifest(tmp_path):
+
+    manifest = Manifest(str(tmp_path / "manifest.sqlite"))
+    yield manifest
+    manifest.close()
+
+
+def test_ranges_merge(manifest):
+
+    manifest.update("price", "ko", "2020-01-02", "2020-01-03", 2, "a")
+    manifest.update("price", "KO", "2020-01-06", "2020-01-10", 7, "b")
+    entry = manifest.update("price", "KO", "2020-06-01", "2020-06-05", 12, "c")
+
+    assert entry.ranges == [["2020-01-02", "2020-01-10"], ["2020-06-01", "2020-06-05"]]
+    assert manifest.get("price", "KO").end == pd.Timestamp("2020-06-05")
+    assert manifest.get("price", "KO").rows == 12
+    assert manifest.get("price", "KO").hash == "c"
+    assert manifest.get("split", "KO") is None
+
+
+def test_plan_universe(manifest):
+
+    symbols = [f"S{i}" for i in range(8000)]
+    for symbol in symbols[:4000]:
+        manifest.update("price", symbol, "2015-01-02", "2020-06-12", 1000, "x")
+    manifest.update("price", "S1", "2015-01-02", "2020-06-19", 1000, "x")
+
+    start = time.perf_counter()
+    plan = manifest.plan(symbols, today="2020-06-19")
+    elapsed = time.perf_counter() - start
+
+    assert plan["S0"] == "5d"
+    assert "S1" not in plan
+    assert plan["S4000"] == "max"
+    assert elapsed < 1
+
+
+def test_content_hash():
+
+    frame = pd.DataFrame(PRICE)
+
+    assert content_hash(frame) == content_hash(frame.set_index(frame.index + 1))
+    assert content_hash(frame) != content_hash(frame.iloc[:1])
+
+
+def test_sqlite_archive_updates_manifest(tmp_path):
+
+    archive = SQLiteArchive(str(tmp_path / "archive.sqlite"))
+    archive.write_prices("KO", PRICE)
+    archive.write_prices("KO", PRICE[1:])
+
+    entry = archive.manifest.get("price", "KO")
+
+    assert entry.ranges == [("2020-01-02", "2020-01-03")]
+    assert entry.rows == 2
+    archive.close()
+
+
+def test_sqlite_archive_hash_covers_stored_rows(tmp_path):
+
+    first = SQLiteArchive(str(tmp_path / "first.sqlite"))
+    first.write_prices("KO", PRICE)
+    second = SQLiteArchive(str(tmp_path / "second.sqlite"))
+    second.write_prices("KO", PRICE[1:])
+    second.write_prices("KO", PRICE[:1])
+
+    def digest(archive):
+        return archive.manifest.get("price", "KO").hash
+
+    # the same stored rows give the same hash whatever the writes
+    assert digest(first) == digest(second)
+
+    second.write_prices("KO", PRICE[1:])
+    assert digest(second) == digest(first)
+
+    second.write_prices("KO", [{**PRICE[1], "close": 1.0}])
+    assert digest(second) != digest(first)
+
+    # news are keyed by time and headline
+    news = [
+        {"datetime": 1593459600000 + i, "headline": f"h{i}", "source": "s"}
+        for i in range(3)
+    ]
+    first.write("news", "KO", news)
+    second.write("news", "KO", news[:2])
+    second.write("news", "KO", news[1:])
+    assert (
+        first.manifest.get("news", "KO").hash == second.manifest.get("news", "KO").hash
+    )
+
+    first.close()
+    second.close()
+
+
+def test_parquet_archive_updates_manifest(tmp_path):
+
+    pytest.importorskip("pyarrow")
+    from iexcloud.archive import ParquetArchive
+
+    archive = ParquetArchive(str(tmp_path))
+    archive.write_prices("KO", PRICE)
+    archive.write_prices("KO", [{"date": "2021-01-04", "close": 1.0}])
+
+    entry = archive.manifest.get("price", "KO")
+
+    assert entry.rows == 3
+    assert archive.last_date("KO") == pd.Timestamp("2021-01-04")
+
+
+def test_pending(manifest):
+
+    manifest.begin("price", ["ko", "PEP"])
+    manifest.update("price", "KO", "2020-01-02", "2020-01-03", 2, "a")
+
+    assert manifest.pending() == [("price", "PEP")]
+    manifest.cancel("price", ["pep"])
+    assert manifest.pending("price") == []
+
+
+def test_parquet_content_hash(tmp_path):
+
+    pytest.importorskip("pyarrow")
+    from iexcloud.archive import ParquetArchive
+
+    whole = ParquetArchive(str(tmp_path / "whole"))
+    whole.write_prices("KO", PRICE)
+    pieces = ParquetArchive(str(tmp_path / "pieces"))
+    pieces.write_prices("KO", PRICE[:1])
+    pieces.write_prices("KO", PRICE[1:])
+
+    digest = whole.manifest.get("price", "KO").hash
+    assert pieces.manifest.get("price", "KO").hash == digest
+
+    pieces.write_prices("KO", PRICE[1:])
+    assert pieces.manifest.get("price", "KO").hash == digest
+    pieces.write_prices("KO", [dict(PRICE[1], close=55.0)])
+    assert pieces.manifest.get("price", "KO").hash != digest
+
+
+def test_parquet_repair(tmp_path, monkeypatch):
+
+    pytest.importorskip("pyarrow")
+    from iexcloud.archive import ParquetArchive
+
+    archive = ParquetArchive(str(tmp_path))
+    archive.write_prices("KO", PRICE[:1])
+
+    def crash(*args, **kwargs):
+        raise OSError("crashed before the manifest was confirmed")
+
+    # partitions are replaced, then the process dies
+    monkeypatch.setattr(archive.manifest, "update", crash)
+    with pytest.raises(OSError):
+        archive.write_prices("KO", PRICE[1:])
+    monkeypatch.undo()
+
+    assert archive.manifest.pending() == [("price", "KO")]
+    assert archive.manifest.get("price", "KO").rows == 1
+
+    reopened = ParquetArchive(str(tmp_path))
+    entry = reopened.manifest.get("price", "KO")
+
+    assert reopened.manifest.pending() == []
+    assert entry.rows == 2
+    assert entry.end == pd.Timestamp("2020-01-03")
+
+
+def test_duckdb_archive_updates_manifest():
+
+    pytest.importorskip("duckdb")
+    from iexcloud.archive import DuckDBArchive
+
+    archive = DuckDBArchive()
+    archive.write_prices("KO", PRICE)
+    digest = archive.manifest.get("price", "KO").hash
+    archive.write_prices("ko", PRICE[1:])
+
+    entry = archive.manifest.get("price", "KO")
+
+    assert entry.rows == 2
+    assert entry.ranges == [("2020-01-02", "2020-01-03")]
+    assert entry.hash == digest
+    assert archive.manifest.plan(["KO", "PEP"], today="2020-01-06") == {
+        "KO": "5d",
+        "PEP": "max",
+    }
+    archive.close()
+
+
+def test_price_store_updates_manifest(tmp_path):
+
+    from iexcloud.archive import PriceStore
+
+    store = PriceStore(str(tmp_path), start="2020-01-01")
+    store.write_prices("ko", PRICE)
+
+    entry = store.manifest.get("price", "KO")
+
+    assert entry.rows == 2
+    assert entry.ranges == [("2020-01-02", "2020-01-03")]
+    assert store.manifest.pending() == []
+
+
+def test_news_log_updates_manifest(tmp_path):
+
+    from iexcloud.archive import NewsLog
+
+    log = NewsLog(str(tmp_path))
+    first = {"datetime": 1593459600000, "headline": "a", "related": "KO,PEP"}
+    second = {"datetime": 1593546000000, "headline": "b", "related": "PEP"}
+    log.append([first])
+    log.append([first, second])
+
+    pep = log.manifest.get("news", "PEP")
+    assert pep.rows == 2
+    assert pep.ranges == [("2020-06-29", "2020-06-30")]
+    assert log.manifest.get("news", "KO").rows == 1
+
+    other = NewsLog(str(tmp_path / "other"))
+    other.append([second, first])
+    assert other.manifest.get("news", "PEP").hash == pep.hash
+    log.close()
+    other.close()
+
+
+def test_duckdb_repair(tmp_path):
+
+    pytest.importorskip("duckdb")
+    from iexcloud.archive import DuckDBArchive
+
+    path = str(tmp_path / "archive.duckdb")
+    archive = DuckDBArchive(path)
+    archive.write_prices("KO", PRICE)
+    # the data committed, then the process died before confirming
+    archive.manifest.begin("price", ["KO", "PEP"])
+    archive.close()
+
+    reopened = DuckDBArchive(path)
+
+    assert reopened.manifest.pending() == []
+    assert reopened.manifest.get("price", "KO").rows == 2
+    assert reopened.manifest.get("price", "PEP") is None
+    reopened.close()
@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+import pandas as pd
+import pytest
+from iexcloud.archive import NewsLog
+from iexcloud.frames import records_to_frame
+from iexcloud.result import Result
+from iexcloud.schema import NEWS as SCHEMA
+
+NEWS = [
+    {
+        "datetime": 1593459600000,
+        "headline": "Coca-Cola's dividend isn't going anywhere",
+        "source": "Motley Fool",
+        "related": "KO,PEP",
+        "hasPaywall": False,
+    },
+    {
+        "datetime": 1593546000000,
+        "headline": "Beverage stocks rally",
+        "source": "Reuters",
+        "related": "PEP, KDP",
+        "hasPaywall": False,
+    },
+]
+
+
+@pytest.fixture
+def log(tmp_path):
+
+    log = NewsLog(str(tmp_path))
+    yield log
+    log.close()
+
+
+def test_dedupe(log):
+
+    assert log.append(NEWS[:1], "KO") == 1
+    assert log.append(Result(json.dumps(NEWS).encode()), "KO") == 1
+    assert log.append(records_to_frame(NEWS, SCHEMA), "KO") == 0
+    assert len(log) == 2
+
+
+def test_concurrent_writers(log, tmp_path):
+
+    # another process polling the same news, with its own connection
+    other = NewsLog(str(tmp_path))
+    results = {}
+    append_block = log._append_block
+
+    def interleaved(articles):
+        thread = threading.Thread(
+            target=lambda: results.update(other=other.append(NEWS))
+        )
+        thread.start()
+        # the other writer checks for duplicates while this block is written
+        thread.join(0.2)
+        results["thread"] = thread
+        return append_block(articles)
+
+    log._append_block = interleaved
+
+    assert log.append(NEWS) == 2
+    results["thread"].join()
+    assert results["other"] == 0
+    assert len(other) == 2
+    other.close()
+
+
+def test_ticker_index(log):
+
+    log.append(NEWS, "KO")
+
+    assert [a["source"] for a in log.articles("pep")] == ["Motley Fool", "Reuters"]
+    assert [a["source"] for a in log.articles("KDP")] == ["Reuters"]
+    assert log.articles("MSFT") == []
+    assert log.tickers() == ["KDP", "KO", "PEP"]
+    assert len(log.articles(end="2020-06-29")) == 1
+
+
+def test_segments(tmp_path):
+
+    log = NewsLog(str(tmp_path), segment_bytes=1)
+    log.append(NEWS[:1])
+    log.append(NEWS[1:])
+
+    segments = sorted(f for f in os.listdir(tmp_path) if f.startswith("segment-"))
+
+    assert segments == ["segment-000001.log", "segment-000002.log"]
+    assert log.articles() == NEWS
+
+    frame = log.read("PEP", start="2020-06-30")
+    assert frame.loc[0, "datetime"] == pd.Timestamp("2020-06-30 19:40:00")
+    log.close()
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from iexcloud.archive import PriceStore
+
+PRICE = [
+    {"date": "2020-01-02", "close": 54.99, "volume": 11867660},
+    {"date": "2020-01-03", "close": 54.69, "volume": 11354500},
+    {"date": "2020-01-06", "close": 54.67, "volume": 14698292},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+
+    return PriceStore(str(tmp_path), start="2020-01-01")
+
+
+def test_panel(store):
+
+    assert store.write_prices("ko", PRICE) == 3
+    store.write_prices("PEP", [{"date": "2020-01-03", "close": 135.35}])
+
+    closes = store.panel("close", start="2020-01-02", end="2020-01-05")
+
+    assert closes.shape == (2, 2)
+    np.testing.assert_array_equal(closes[0], [54.99, 54.69])
+    np.testing.assert_array_equal(closes[1], [np.nan, 135.35])
+    assert list(store.dates(end="2020-01-06").astype(str)) == [
+        "2020-01-01",
+        "2020-01-02",
+        "2020-01-03",
+        "2020-01-06",
+    ]
+    assert store.last_date("KO") == pd.Timestamp("2020-01-06")
+    assert store.last_date("MSFT") is None
+
+
+def test_overwrite_and_growth(store):
+
+    for i in range(20):
+        store.write_prices(f"S{i}", PRICE)
+    store.write_prices("S0", [{"date": "2020-01-02", "close": 1.0}])
+    store.write_prices("S1", [{"date": "2030-01-02", "close": 2.0}])
+
+    assert store.panel("close", ["S0"])[0, 1] == 1.0
+    assert store.panel("volume", ["S2"])[0, 1] == 11867660
+    assert store.last_date("S1") == pd.Timestamp("2030-01-02")
+    assert store.array("close").shape == (20, store.meta["days"])
+
+
+def test_readonly_reopen(store):
+
+    store.write_prices("KO", PRICE)
+    reader = PriceStore(store.root, readonly=True)
+
+    assert isinstance(reader.panel("close"), np.memmap)
+    assert reader.frame("close", ["KO"]).loc["2020-01-06", "KO"] == 54.67
+
+    store.write_prices("PEP", PRICE)
+    reader.refresh()
+    assert reader.symbols == ["KO", "PEP"]
+
+    with pytest.raises(ValueError):
+        reader.write_prices("KO", PRICE)
+
+
+def test_before_start(store):
+
+    with pytest.raises(ValueError):
+        store.write_prices("KO", [{"date": "2019-12-31", "close": 1.0}])
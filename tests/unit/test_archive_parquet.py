@@ -0,0 +1,67 @@
+import os
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from iexcloud.archive import ParquetArchive  # noqa: E402
+from iexcloud.result import Result  # noqa: E402
+
+PRICE = [
+    {"date": "2019-12-31", "close": 54.69, "volume": 9021000, "symbol": "KO"},
+    {"date": "2020-01-02", "close": 54.99, "volume": 11867660, "symbol": "KO"},
+]
+
+
+@pytest.fixture
+def archive(tmp_path):
+
+    return ParquetArchive(str(tmp_path))
+
+
+def test_partitions(archive):
+
+    assert archive.write_prices("ko", PRICE) == 2
+
+    path = os.path.join(archive.root, "prices", "symbol=KO", "year=2020")
+    assert os.listdir(path) == ["part-0.parquet"]
+    assert archive.years("KO") == [2019, 2020]
+    assert archive.last_date("KO") == pd.Timestamp("2020-01-02")
+
+
+def test_append_dedupes_on_date(archive):
+
+    archive.write_prices("KO", PRICE)
+    update = [
+        {"date": "2020-01-02", "close": 55.0, "volume": 1},
+        {"date": "2020-01-03", "close": 54.3, "volume": 2},
+    ]
+
+    assert archive.write_prices("KO", Result.from_records(update, "price")) == 1
+
+    prices = archive.read_prices(["KO"])
+    assert list(prices["close"]) == [54.69, 55.0, 54.3]
+    assert "symbol" in prices and "year" not in prices
+
+
+def test_read_filters(archive):
+
+    archive.write_prices("KO", PRICE)
+    archive.write_prices("PEP", pd.DataFrame(PRICE).assign(extra=1.0))
+
+    prices = archive.read_prices(["ko", "PEP"], start="2020-01-01", columns=["close"])
+
+    assert list(prices.columns) == ["symbol", "date", "close"]
+    assert list(prices["symbol"]) == ["KO", "PEP"]
+    assert archive.read_prices(end="2019-12-31")["extra"].isna().tolist() == [
+        True,
+        False,
+    ]
+    assert archive.read_prices(["MSFT"]).empty
+    assert archive.symbols() == ["KO", "PEP"]
+
+
+def test_invalid_symbol(archive):
+
+    with pytest.raises(ValueError):
+        archive.write_prices("../KO", PRICE)
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+from iexcloud.archive import SQLiteArchive
+from iexcloud.result import Result
+
+PRICE = [
+    {"date": "2019-12-31", "close": 54.69, "volume": 9021000, "label": "Dec 31"},
+    {"date": "2020-01-02", "close": 54.99, "volume": 11867660, "label": "Jan 2"},
+]
+NEWS = [
+    {
+        "datetime": 1593459600000,
+        "headline": "Coca-Cola's dividend isn't going anywhere",
+        "source": "Motley Fool",
+        "related": "KO,PEP",
+        "hasPaywall": False,
+    }
+]
+
+
+@pytest.fixture
+def archive(tmp_path):
+
+    archive = SQLiteArchive(str(tmp_path / "archive.sqlite"))
+    yield archive
+    archive.close()
+
+
+def test_upsert_is_idempotent(archive):
+
+    assert archive.write_prices("ko", PRICE) == 2
+    update = pd.DataFrame([{"date": "2020-01-02", "close": 55.0, "volume": 1}])
+    archive.write_prices("KO", update.astype({"close": "float32"}))
+
+    prices = archive.read_prices(["KO"])
+
+    assert list(prices["close"]) == [54.69, 55.0]
+    assert prices["label"].isna().tolist() == [False, True]
+    assert prices["date"].iloc[-1] == pd.Timestamp("2020-01-02")
+    assert archive.last_date("KO") == pd.Timestamp("2020-01-02")
+    assert archive.last_date("PEP") is None
+
+
+def test_write_many_and_filters(archive):
+
+    outputs = {"KO": PRICE, "PEP": Result.from_records(PRICE, "price")}
+
+    assert archive.write_many("price", outputs) == 4
+    assert list(archive.read_prices(end="2019-12-31")["symbol"]) == ["KO", "PEP"]
+    assert len(archive.read_prices(["PEP"], start="2020-01-02")) == 1
+
+
+def test_news(archive):
+
+    archive.write("news", "KO", NEWS)
+    archive.write("news", "KO", NEWS)
+
+    news = archive.read_news(["KO"], start="2020-06-29", end="2020-06-29")
+
+    assert len(news) == 1
+    assert news.loc[0, "datetime"] == pd.Timestamp("2020-06-29 19:40:00")
+    assert news.loc[0, "headline"] == NEWS[0]["headline"]
+    assert bool(news.loc[0, "hasPaywall"]) is False
+
+
+def test_unknown_dataset(archive):
+
+    with pytest.raises(ValueError):
+        archive.write("quote", "KO", PRICE)
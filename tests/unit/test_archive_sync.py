@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+from iexcloud import Client
+from iexcloud.archive import plan_range, sync_prices
+
+
+def bars(*dates):
+
+    return [{"date": date, "close": 54.0, "volume": 1} for date in dates]
+
+
+@pytest.mark.parametrize(
+    "last_date, today, expected",
+    [
+        (None, "2020-06-15", "max"),
+        ("2020-06-15", "2020-06-15", None),
+        ("2020-06-12", "2020-06-14", None),  # Friday to Sunday
+        ("2020-06-12", "2020-06-19", "5d"),
+        ("2020-06-01", "2020-06-15", "1m"),
+        ("2020-04-01", "2020-06-15", "3m"),
+        ("2020-01-02", "2020-06-15", "ytd"),
+        ("2019-09-01", "2020-06-15", "1y"),
+        ("2016-01-01", "2020-06-15", "5y"),
+        ("2010-01-01", "2020-06-15", "max"),
+    ],
+)
+def test_plan_range(last_date, today, expected):
+
+    assert plan_range(last_date, today) == expected
+
+
+class Archive(object):
+    def __init__(self, last_date):
+
+        self.last = last_date
+        self.written = []
+
+    def last_date(self, symbol):
+
+        return self.last
+
+    def write_prices(self, symbol, prices):
+
+        self.written.extend(prices)
+        return len(prices)
+
+
+def test_sync_prices(stub_server):
+
+    routes = {"/stock/KO/chart/5d": bars("2020-06-12", "2020-06-15", "2020-06-16")}
+    server = stub_server(routes)
+    client = Client(base_url=server.url)
+    archive = Archive(pd.Timestamp("2020-06-12"))
+
+    assert sync_prices("KO", archive, client, today="2020-06-16") == 2
+    assert [row["date"] for row in archive.written] == ["2020-06-15", "2020-06-16"]
+
+    archive.last = pd.Timestamp("2020-06-16")
+    assert sync_prices("KO", archive, client, today="2020-06-16") == 0
+
+    assert server.hits == ["/stock/KO/chart/5d?token=production_token"]
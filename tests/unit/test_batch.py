@@ -0,0 +1,62 @@
+import pytest
+from urllib.parse import parse_qs, urlsplit
+from iexcloud import Client, StockBatch
+
+PRICE = [{"date": "2020-01-02", "close": 54.99, "volume": 11867660}]
+
+
+def batch(handler):
+
+    query = parse_qs(urlsplit(handler.path).query)
+    symbols = query["symbols"][0].split(",")
+    types = query["types"][0].split(",")
+    payload = {
+        symbol.upper(): {
+            "chart": PRICE,
+            "logo": {"url": f"https://logo/{symbol}"},
+            "peers": ["PEP"],
+            "earnings": {"symbol": symbol, "earnings": [{"actualEPS": 0.44}]},
+        }
+        for symbol in symbols
+        if symbol != "NOPE"
+    }
+    payload = {
+        symbol: {key: value for key, value in data.items() if key in types}
+        for symbol, data in payload.items()
+    }
+    return 200, payload, {}
+
+
+@pytest.fixture
+def server(stub_server):
+
+    return stub_server({"/stock/market/batch": batch})
+
+
+def test_plan():
+
+    batch = StockBatch([f"S{i}" for i in range(250)], client=Client())
+    plan = batch.plan(["price", "dividend", "price"])
+
+    assert len(plan) == 3
+    assert plan[0]["types"] == "chart,dividends"
+    assert len(plan[2]["symbols"].split(",")) == 50
+
+    with pytest.raises(ValueError):
+        batch.plan(["quote"])
+
+
+def test_fetch(server):
+
+    batch = StockBatch(["KO", "pep", "NOPE"], client=Client(base_url=server.url))
+    result = batch.fetch(["price", "logo", "peer", "earning"], time_range="1m", last=1)
+
+    assert len(server.hits) == 1
+    assert "range=1m" in server.hits[0]
+    assert list(result) == ["KO", "pep"]
+    assert list(result["KO"]["price"].columns) == ["date", "close", "volume"]
+    assert list(result["KO"]["earning"].columns) == ["actualEPS"]
+    assert result["pep"]["logo"] == "https://logo/pep"
+    assert batch.stocks["KO"].peer == ["PEP"]
+    assert batch.stocks["KO"].price is result["KO"]["price"]
+    assert batch.stocks["NOPE"].price is None
@@ -0,0 +1,143 @@
+import time
+import pytest
+from iexcloud import Client, MemoryCache, SQLiteCache, Stock
+from iexcloud.cache import cache_key
+
+PRICE = [{"date": "2020-01-02", "close": 54.99, "volume": 11867660}]
+
+
+@pytest.fixture
+def server(stub_server):
+
+    routes = {"/stock/KO/chart/1m": PRICE, "/stock/KO/chart/5dm": PRICE}
+    return stub_server(routes)
+
+
+def test_cache_key():
+
+    assert cache_key("u", {"token": "a", "b": 2, "a": 1}) == "u?a=1&b=2"
+    assert cache_key("u", {"token": "a"}) == "u"
+
+
+def test_ttl_rules():
+
+    cache = MemoryCache()
+
+    assert cache.ttl("/stock/KO/logo") == 7 * 24 * 3600
+    assert cache.ttl("/stock/KO/chart/5dm") == 60
+    assert cache.ttl("/stock/KO/chart/1m") == 3600
+    assert cache.ttl("/stock/market/batch") == 0
+
+
+def test_lru_eviction():
+
+    cache = MemoryCache(max_bytes=10)
+    cache.set("a", b"12345", 60)
+    cache.set("b", b"12345", 60)
+    cache.get("a")
+    cache.set("c", b"12345", 60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"12345"
+    assert cache.stats() == {
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+        "entries": 2,
+        "bytes": 10,
+    }
+
+
+def test_expiry():
+
+    cache = MemoryCache()
+    cache.set("a", b"1", 0)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_client_cache(server):
+
+    client = Client(base_url=server.url, cache=MemoryCache(ttls={"*/chart/1m": 60}))
+    pandas = Stock("KO", client=client).get_price("1m")
+    text = Stock("KO", output="json", client=client).get_price("1m")
+    Stock("KO", client=client).get_price("5dm")
+    Stock("KO", client=client).get_price("5dm")
+
+    assert len(server.hits) == 3
+    assert list(pandas.columns) == ["date", "close", "volume"]
+    assert text == '[{"date": "2020-01-02", "close": 54.99, "volume": 11867660}]'
+    assert client.stats()["cache"]["hits"] == 1
+
+
+def test_sqlite_cache(tmp_path, server):
+
+    path = str(tmp_path / "cache.sqlite")
+    client = Client(base_url=server.url, cache=SQLiteCache(path))
+    Stock("KO", client=client).get_price("1m")
+
+    # a new process opening the same file sees the stored payload
+    cache = SQLiteCache(path)
+    client = Client(base_url=server.url, cache=cache)
+    price = Stock("KO", client=client).get_price("1m")
+
+    assert len(server.hits) == 1
+    assert list(price.columns) == ["date", "close", "volume"]
+    assert cache.stats()["hits"] == 1
+
+
+def test_sqlite_eviction(tmp_path):
+
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), max_bytes=50, compression=0)
+    cache.set("a", b"1" * 10, 60)
+    cache.set("b", b"2" * 10, 60)
+    cache.get("a")
+    cache.set("c", b"3" * 10, 60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1" * 10
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+    cache.set("d", b"4", 0)
+    assert cache.get("d") is None
+
+
+def test_sqlite_running_size(tmp_path):
+
+    path = str(tmp_path / "cache.sqlite")
+    cache = SQLiteCache(path, compression=0)
+    cache.set("a", b"1" * 10, 60)
+    cache.set("a", b"1" * 20, 60)
+    cache.set("b", b"2" * 10, 0)
+    cache.get("b")
+
+    stored = cache._connect().execute("SELECT SUM(size) FROM responses").fetchone()
+    assert cache.stats()["bytes"] == stored[0]
+    assert SQLiteCache(path).stats()["bytes"] == stored[0]
+
+    cache.clear()
+    assert cache.stats()["bytes"] == 0
+
+
+def test_sqlite_access_batched(tmp_path, monkeypatch):
+
+    monkeypatch.setattr("iexcloud.cache.ACCESS_BATCH", 2)
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"))
+    cache.set("a", b"1", 60)
+    cache.set("b", b"2", 60)
+
+    def accessed():
+        query = "SELECT key, accessed FROM responses ORDER BY key"
+        return dict(cache._connect().execute(query).fetchall())
+
+    before = accessed()
+    time.sleep(0.01)
+    cache.get("a")
+    # a read alone does not write
+    assert accessed() == before
+
+    cache.get("b")
+    after = accessed()
+    assert after["a"] > before["a"] and after["b"] > before["b"]
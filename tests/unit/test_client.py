@@ -0,0 +1,41 @@
+import pytest
+from iexcloud import Client, Stock, get_client, set_client
+
+
+@pytest.fixture
+def server(stub_server):
+
+    routes = {"/stock/KO/peers": ["PEP", "KDP"], "/stock/KO/logo": {"url": "x"}}
+    return stub_server(routes)
+
+
+def test_token_and_params(server):
+
+    client = Client(base_url=server.url)
+    response = client.get("/stock/KO/peers", params={"format": "json"})
+
+    assert response.json() == ["PEP", "KDP"]
+    assert "token=production_token" in server.hits[0]
+    assert "format=json" in server.hits[0]
+
+
+def test_keep_alive(server):
+
+    client = Client(base_url=server.url, pool_maxsize=2)
+    stock = Stock("KO", client=client)
+    for _ in range(5):
+        stock.get_peer()
+        stock.get_logo()
+
+    assert len(server.hits) == 10
+    assert server.connections == 1
+
+
+def test_shared_client():
+
+    client = set_client(pool_maxsize=4)
+    assert get_client() is client
+    assert client.pool_maxsize == 4
+    assert Stock("KO").client is client
+
+    assert set_client() is not client
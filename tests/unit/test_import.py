@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+# Cumulative import time budget of `import iexcloud`, in microseconds. The
+# lazy package imports in ~2ms; importing requests alone takes ~100ms.
+BUDGET = 30000
+HEAVY = ("requests", "pandas", "numpy", "pyarrow", "aiohttp", "orjson")
+
+
+def import_times(statement: str) -> dict:
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def test_import_is_cheap():
+
+    times = import_times("import iexcloud; iexcloud.set_token('x'); iexcloud.get_url()")
+
+    assert not [name for name in times if name.split(".")[0] in HEAVY]
+    assert times["iexcloud"] < BUDGET
+
+
+def test_lazy_attributes():
+
+    import iexcloud
+    from iexcloud.stock import Stock
+
+    assert iexcloud.Stock is Stock
+    assert "fetch_universe" in dir(iexcloud)
+    assert isinstance(iexcloud.__version__, str)
@@ -0,0 +1,40 @@
+import json
+import pandas as pd
+from iexcloud.frames import records_to_frame
+from iexcloud.parse import loads
+
+NEWS = [
+    {
+        "datetime": 1593459600000,
+        "headline": "Coca-Cola's dividend isn't going anywhere",
+        "related": "KO,PEP",
+    }
+]
+
+
+def test_loads():
+
+    assert loads(json.dumps(NEWS).encode("utf-8")) == NEWS
+    assert loads(json.dumps(NEWS)) == NEWS
+
+
+def test_apostrophes_survive():
+
+    frame = records_to_frame(loads(json.dumps(NEWS)))
+
+    assert frame.loc[0, "headline"] == NEWS[0]["headline"]
+
+
+def test_dates():
+
+    frame = records_to_frame([{"date": "2020-01-02", "label": "Jan 2", "close": 54.99}])
+    news = records_to_frame(NEWS)
+
+    assert frame.loc[0, "date"] == pd.Timestamp("2020-01-02")
+    assert frame.loc[0, "label"] == "Jan 2"
+    assert news.loc[0, "datetime"] == pd.Timestamp("2020-06-29 19:40:00")
+
+
+def test_single_record():
+
+    assert list(records_to_frame({"a": 1, "b": 2}).columns) == ["a", "b"]
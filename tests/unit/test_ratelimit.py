@@ -0,0 +1,53 @@
+import pytest
+from iexcloud import Client, RateLimiter
+
+
+def test_token_bucket():
+
+    limiter = RateLimiter(rate=10, burst=2)
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(0.1, abs=0.01)
+    assert limiter.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_unlimited():
+
+    limiter = RateLimiter(rate=None)
+
+    assert all(limiter.reserve() == 0 for _ in range(1000))
+
+
+def test_throttle_and_recover():
+
+    limiter = RateLimiter(rate=10, recovery=0.5)
+    limiter.throttle(0.5)
+
+    assert limiter.rate == 5
+    assert limiter.reserve() == pytest.approx(0.5, abs=0.01)
+
+    limiter.succeed()
+    limiter.succeed()
+    assert limiter.rate == 10
+
+
+def test_client_retries_429(stub_server):
+
+    calls = []
+
+    def peers(handler):
+        calls.append(handler.path)
+        if len(calls) == 1:
+            return 429, "Too Many Requests", {"Retry-After": "0"}
+        return 200, ["PEP"], {}
+
+    limiter = RateLimiter(rate=100)
+    server = stub_server({"/stock/KO/peers": peers})
+    client = Client(base_url=server.url, rate_limiter=limiter)
+    response = client.get("/stock/KO/peers")
+
+    assert response.json() == ["PEP"]
+    assert len(calls) == 2
+    assert limiter.throttled == 1
+    assert limiter.rate < 100
@@ -0,0 +1,40 @@
+import pytest
+from iexcloud import Client, Reference
+
+METADATA = {"messageLimit": 5000000, "messagesUsed": 1234}
+SYMBOLS = [{"symbol": "KO", "isEnabled": True}, {"symbol": "PEP", "isEnabled": True}]
+
+
+@pytest.fixture
+def server(stub_server):
+
+    routes = {"/account/metadata": METADATA, "/ref-data/iex/symbols": SYMBOLS}
+    return stub_server(routes)
+
+
+def test_lazy(server):
+
+    reference = Reference(Client(base_url=server.url))
+
+    assert server.hits == []
+    assert reference.msg_balance == 5000000 - 1234
+    assert reference.msg_limit == 5000000
+    assert reference.msg_used == 1234
+    assert len(server.hits) == 1
+
+    assert reference.symbols == ["KO", "PEP"]
+    assert reference.symbols == ["KO", "PEP"]
+    assert len(server.hits) == 2
+
+
+def test_metadata_ttl(server):
+
+    reference = Reference(Client(base_url=server.url), ttl=0)
+    reference.get_msg_limit()
+    reference.get_msg_used()
+
+    cached = Reference(Client(base_url=server.url))
+    cached.get_msg_limit()
+    cached.update_msg_balance()
+
+    assert server.hits.count("/account/metadata?token=production_token") == 4
@@ -0,0 +1,56 @@
+import json
+import pytest
+from iexcloud import Client, Result, Stock
+
+EARNINGS = {"symbol": "KO", "earnings": [{"actualEPS": 0.44, "fiscalPeriod": "Q1"}]}
+
+
+def test_lazy_and_memoised():
+
+    result = Result(json.dumps(EARNINGS).encode(), "earnings", "earning")
+
+    assert result._outputs == {}
+    assert result.records() == EARNINGS["earnings"]
+    assert list(result._outputs) == ["records"]
+    assert json.loads(result.json()) == EARNINGS["earnings"]
+
+    frame = result.to_pandas()
+    assert frame is result.to_pandas()
+    assert str(frame["fiscalPeriod"].dtype) == "category"
+    assert result.to_numpy()["actualEPS"].dtype == "float64"
+
+
+def test_raw_json_is_not_decoded():
+
+    content = json.dumps(EARNINGS).encode()
+    result = Result(content)
+
+    assert result.json() == content.decode()
+    assert "records" not in result._outputs
+
+
+def test_from_records():
+
+    result = Result.from_records([{"close": 1.5}], "price", compact=True)
+
+    assert result.to_numpy()["close"].dtype == "float32"
+    assert json.loads(result.json()) == [{"close": 1.5}]
+
+
+def test_stock_result(stub_server):
+
+    server = stub_server({"/stock/KO/earnings/1": EARNINGS})
+    stock = Stock("KO", "result", Client(base_url=server.url))
+    result = stock.get_earning(1)
+
+    assert isinstance(result, Result)
+    assert stock.earning is result
+    assert result.records() == EARNINGS["earnings"]
+
+
+def test_to_arrow():
+
+    pytest.importorskip("pyarrow")
+    result = Result(json.dumps(EARNINGS).encode(), "earnings", "earning")
+
+    assert result.to_arrow().num_rows == 1
@@ -0,0 +1,137 @@
+import pytest
+from requests import ConnectionError
+from iexcloud import (
+    CircuitOpenError,
+    Client,
+    RateLimiter,
+    RetryPolicies,
+    RetryPolicy,
+)
+from iexcloud.retry import CircuitBreaker
+
+
+def flaky(*statuses):
+
+    statuses = list(statuses)
+
+    def handler(_):
+        status = statuses.pop(0) if statuses else 200
+        return status, ["PEP"] if status == 200 else "error", {}
+
+    return handler
+
+
+@pytest.fixture
+def client(stub_server):
+
+    server = stub_server()
+    policies = RetryPolicies(
+        RetryPolicy(max_retries=2, backoff=0.001), failure_threshold=3
+    )
+    client = Client(
+        base_url=server.url, rate_limiter=RateLimiter(rate=None), retry=policies
+    )
+    client.server = server
+    return client
+
+
+def test_retry_5xx(client):
+
+    client.server.routes["/stock/KO/peers"] = flaky(503, 502)
+
+    assert client.get("/stock/KO/peers").json() == ["PEP"]
+    assert client.stats()["retries"]["default"] == {"retries": 2, "exhausted": 0}
+
+
+def test_fail_fast(client):
+
+    client.server.routes["/stock/KO/peers"] = flaky(402)
+
+    assert client.get("/stock/KO/peers").status_code == 402
+    assert len(client.server.hits) == 1
+
+
+def test_endpoint_policy(client):
+
+    client.retry.endpoints["/stock/*/peers"] = RetryPolicy(max_retries=0)
+    client.server.routes["/stock/KO/peers"] = flaky(500)
+
+    assert client.get("/stock/KO/peers").status_code == 500
+    assert client.retry.endpoints["/stock/*/peers"].exhausted == 1
+
+
+def test_circuit_breaker(client):
+
+    client.server.routes["/stock/KO/peers"] = flaky(*[500] * 10)
+
+    assert client.get("/stock/KO/peers").status_code == 500
+    with pytest.raises(CircuitOpenError):
+        client.get("/stock/KO/peers")
+
+    assert len(client.server.hits) == 3
+    breaker = list(client.stats()["breakers"].values())[0]
+    assert breaker["state"] == "open"
+    assert breaker["rejected"] == 1
+
+
+def test_connection_error(monkeypatch):
+
+    monkeypatch.setenv("IEX_MODE", "PRODUCTION")
+    monkeypatch.setenv("IEX_TOKEN", "production_token")
+    policies = RetryPolicies(RetryPolicy(max_retries=1, backoff=0.001))
+    client = Client(base_url="http://127.0.0.1:9", retry=policies)
+
+    with pytest.raises(ConnectionError):
+        client.get("/stock/KO/peers")
+
+    assert policies.default.retries == 1
+
+
+def test_half_open():
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    breaker.allow()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_half_open_throttled(client):
+
+    client.retry = RetryPolicies(
+        RetryPolicy(max_retries=0), failure_threshold=1, reset_timeout=0
+    )
+    client.max_throttle_retries = 0
+    client.server.routes["/stock/KO/peers"] = flaky(500, 429)
+
+    assert client.get("/stock/KO/peers").status_code == 500
+    # the trial is throttled, which neither closes nor fails the circuit
+    assert client.get("/stock/KO/peers").status_code == 429
+    for _ in range(3):
+        assert client.get("/stock/KO/peers").json() == ["PEP"]
+
+    breaker = list(client.stats()["breakers"].values())[0]
+    assert breaker["state"] == "closed"
+    assert breaker["rejected"] == 0
+
+
+def test_release():
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == "open"
+    assert breaker.allow()
+
+    breaker.record_success()
+    breaker.release()
+    assert breaker.state == "closed"
+    assert not breaker.allow()
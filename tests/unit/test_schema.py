@@ -0,0 +1,170 @@
+import subprocess
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from iexcloud import Stock
+from iexcloud.arrays import records_to_arrays
+from iexcloud.frames import records_to_frame
+from iexcloud.tables import records_to_table
+from iexcloud.schema import DIVIDEND, NEWS, PRICE
+
+DIVIDENDS = [
+    {
+        "exDate": "2020-06-12",
+        "paymentDate": "2020-07-01",
+        "recordDate": "2020-06-15",
+        "declaredDate": "2020-04-22",
+        "amount": 0.41,
+        "flag": "Cash",
+        "currency": "USD",
+        "description": "Ordinary Shares",
+        "frequency": "quarterly",
+        "date": 1592179200000,
+    },
+    {
+        "exDate": "2020-03-13",
+        "paymentDate": None,
+        "recordDate": "2020-03-16",
+        "declaredDate": "2020-02-20",
+        "amount": "0.41",
+        "flag": "Cash",
+        "currency": "USD",
+        "description": "Ordinary Shares",
+        "frequency": "quarterly",
+        "date": 1584057600000,
+    },
+]
+
+
+def test_iso_dates():
+
+    frame = records_to_frame([{"date": "2020-01-02"}, {"date": "bad"}], PRICE)
+
+    assert frame["date"][0] == pd.Timestamp("2020-01-02")
+    assert pd.isna(frame["date"][1])
+
+
+def test_dividend_types():
+
+    frame = records_to_frame(DIVIDENDS, DIVIDEND)
+
+    assert list(frame.columns) == list(DIVIDENDS[0])
+    assert frame["exDate"].dtype.kind == "M"
+    assert pd.isna(frame.loc[1, "paymentDate"])
+    assert frame.loc[0, "date"] == pd.Timestamp("2020-06-15")
+    assert frame["amount"].dtype == "float64"
+    assert frame["amount"].tolist() == [0.41, 0.41]
+    assert frame["currency"].dtype == "category"
+
+
+def test_compact():
+
+    bars = [{"date": "2020-01-02", "close": 54.99, "volume": 11867660, "x": "a"}]
+    frame = records_to_frame(bars, PRICE, compact=True)
+
+    assert frame["close"].dtype == "float32"
+    assert frame["volume"].dtype == "int32"
+    assert frame["x"].tolist() == ["a"]
+
+
+def test_compact_large_volume():
+
+    bars = [{"volume": 3_000_000_000}, {"volume": 11867660}]
+
+    frame = records_to_frame(bars, PRICE, compact=True)
+    assert frame["volume"].dtype == "int64"
+    assert frame["volume"][0] == 3_000_000_000
+    assert records_to_frame(bars[1:], PRICE, compact=True)["volume"].dtype == "int32"
+    nullable = records_to_frame(bars + [{"volume": None}], PRICE, compact=True)
+    assert nullable["volume"].dtype == "Int64"
+
+    arrays = records_to_arrays(bars, PRICE, compact=True)
+    assert arrays["volume"].dtype == "int64"
+    assert arrays["volume"].tolist() == [3_000_000_000, 11867660]
+
+
+def test_nullable():
+
+    bars = [{"volume": 1}, {"volume": None}]
+    articles = [{"hasPaywall": False, "lang": "en"}, {"hasPaywall": None}]
+
+    assert records_to_frame(bars, PRICE)["volume"].dtype == "Int64"
+    news = records_to_frame(articles, NEWS)
+    assert news["hasPaywall"].dtype == "boolean"
+    assert news["lang"].dtype == "category"
+
+
+def test_arrow_table():
+
+    pa = pytest.importorskip("pyarrow")
+    table = records_to_table(DIVIDENDS, DIVIDEND)
+
+    assert table.column_names == list(DIVIDENDS[0])
+    assert table.schema.field("exDate").type == pa.timestamp("ms")
+    assert table.schema.field("date").type == pa.timestamp("ms")
+    assert table.column("amount").to_pylist() == [0.41, 0.41]
+    assert pa.types.is_dictionary(table.schema.field("currency").type)
+    assert table.column("paymentDate").null_count == 1
+
+    compact = records_to_table(
+        [{"close": 54.99, "volume": 11867660}], PRICE, compact=True
+    )
+    assert compact.schema.field("close").type == pa.float32()
+    assert compact.schema.field("volume").type == pa.int64()
+    assert pa.concat_tables([compact, compact]).num_rows == 2
+
+    dates = [{"declaredDate": ""}, {"declaredDate": "bad"}, {"declaredDate": None}]
+    assert records_to_table(dates, DIVIDEND).column("declaredDate").null_count == 3
+    dates[2]["declaredDate"] = "2020-02-20"
+    declared = records_to_table(dates, DIVIDEND).column("declaredDate")
+    assert declared.to_pylist() == [None, None, pd.Timestamp("2020-02-20")]
+
+    # symbols with small and large volumes share one schema
+    large = records_to_table([{"volume": 3_000_000_000}], PRICE, compact=True)
+    small = records_to_table([{"volume": 10}], PRICE, compact=True)
+    assert pa.concat_tables([small, large]).column("volume").to_pylist() == [
+        10,
+        3_000_000_000,
+    ]
+
+
+def test_invalid_output():
+
+    with pytest.raises(ValueError):
+        Stock("KO", output="xml")
+
+
+def test_numpy_arrays():
+
+    arrays = records_to_arrays(DIVIDENDS, DIVIDEND)
+
+    assert list(arrays) == list(DIVIDENDS[0])
+    assert arrays["exDate"].dtype == "datetime64[ms]"
+    assert np.isnat(arrays["paymentDate"][1])
+    assert arrays["date"][0] == np.datetime64("2020-06-15")
+    assert arrays["amount"].tolist() == [0.41, 0.41]
+    assert arrays["currency"].tolist() == ["USD", "USD"]
+
+    bars = [{"close": 54.99, "volume": 11867660}, {"close": 55.0, "volume": None}]
+    compact = records_to_arrays(bars, PRICE, compact=True)
+    assert compact["close"].dtype == "float32"
+    assert compact["volume"].dtype == "float64"
+    assert np.isnan(compact["volume"][1])
+
+    # float32 would round the volume to 123456792
+    bars = [{"volume": 123456789}, {"volume": None}]
+    assert records_to_arrays(bars, PRICE, compact=True)["volume"][0] == 123456789
+
+
+def test_pandas_free_outputs():
+
+    code = (
+        "import sys, iexcloud\n"
+        "stock = iexcloud.Stock('KO', output='numpy')\n"
+        "stock._records_to_output([{'close': 1.0}], dataset='price')\n"
+        "stock.output = 'records'\n"
+        "stock._records_to_output([{'close': 1.0}], dataset='price')\n"
+        "assert 'pandas' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
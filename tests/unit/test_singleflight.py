@@ -0,0 +1,102 @@
+import asyncio
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from iexcloud import Client, SingleFlight, Stock
+from iexcloud.aio import AsyncClient, AsyncStock
+from iexcloud.singleflight import AsyncSingleFlight
+
+
+def slow_peers(handler):
+
+    time.sleep(0.2)
+    return 200, ["PEP"], {}
+
+
+@pytest.fixture
+def server(stub_server):
+
+    return stub_server({"/stock/KO/peers": slow_peers})
+
+
+def test_threads_share_call(server):
+
+    client = Client(base_url=server.url)
+
+    with ThreadPoolExecutor(8) as executor:
+        futures = [
+            executor.submit(Stock("KO", client=client).get_peer) for _ in range(8)
+        ]
+        results = [future.result() for future in futures]
+
+    assert results == [["PEP"]] * 8
+    assert len(server.hits) == 1
+    assert client.stats()["single_flight"] == {"calls": 1, "shared": 7}
+
+
+def test_tasks_share_call(server):
+
+    async def fetch():
+        client = AsyncClient(base_url=server.url)
+        stocks = [AsyncStock("KO", client=client) for _ in range(8)]
+        results = await asyncio.gather(*[stock.get_peer() for stock in stocks])
+        await client.close()
+        return results
+
+    assert asyncio.run(fetch()) == [["PEP"]] * 8
+    assert len(server.hits) == 1
+
+
+def test_disabled(server):
+
+    client = Client(base_url=server.url, single_flight=False)
+
+    with ThreadPoolExecutor(2) as executor:
+        list(executor.map(lambda _: client.get("/stock/KO/peers"), range(2)))
+
+    assert len(server.hits) == 2
+
+
+def test_errors_are_shared():
+
+    flight = SingleFlight()
+
+    with pytest.raises(KeyError):
+        flight.do("key", lambda: {}["missing"])
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise KeyError("missing")
+
+    async def run():
+        flight = AsyncSingleFlight()
+        return await asyncio.gather(
+            flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+        )
+
+    errors = asyncio.run(run())
+    assert all(isinstance(error, KeyError) for error in errors)
+
+
+def test_leader_cancelled():
+
+    calls = []
+
+    async def fetch():
+        calls.append(None)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def run():
+        flight = AsyncSingleFlight()
+        leader = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(flight.do("key", fetch)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return leader, await asyncio.gather(*followers)
+
+    leader, results = asyncio.run(run())
+
+    assert leader.cancelled()
+    assert results == [2, 2, 2]
@@ -0,0 +1,76 @@
+import json
+import pytest
+from iexcloud import Client, Stock
+from iexcloud.stream import iter_chunks, iter_items
+
+PRICE = [
+    {"date": f"2020-01-{day:02d}", "close": 54.99 + day, "volume": 1000 * day}
+    for day in range(1, 8)
+]
+
+
+def split(payload: bytes, size: int):
+
+    return [payload[i : i + size] for i in range(0, len(payload), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 1024])
+def test_iter_items(size):
+
+    items = [{"a": 1.25, "b": "café ☕"}, 123456789, None, [1, [2]], "x"]
+    payload = json.dumps(items, ensure_ascii=False).encode()
+
+    assert list(iter_items(split(payload, size))) == items
+
+    obj = {"KO": {"chart": PRICE}, "PEP": {"peers": ["KO"]}}
+    payload = json.dumps(obj, indent=2).encode()
+
+    assert dict(iter_items(split(payload, size))) == obj
+
+
+def test_iter_items_edges():
+
+    assert list(iter_items([b" [ ", b"]"])) == []
+    assert list(iter_items([b"{}"])) == []
+    assert list(iter_items([b"[12", b"34, 5", b"6]"])) == [1234, 56]
+
+    with pytest.raises(ValueError):
+        list(iter_items([b"12"]))
+
+    with pytest.raises(ValueError):
+        list(iter_items([b"[1, 2"]))
+
+
+def test_iter_items_long_value(monkeypatch):
+
+    decodes = []
+    raw_decode = json.JSONDecoder.raw_decode
+    monkeypatch.setattr(
+        json.JSONDecoder,
+        "raw_decode",
+        lambda self, *args: decodes.append(args) or raw_decode(self, *args),
+    )
+    obj = {"KO": {"chart": PRICE * 200}}
+    payload = json.dumps(obj).encode()
+
+    assert dict(iter_items(split(payload, 16))) == obj
+    # the window doubles instead of growing one chunk per failed decode
+    assert len(decodes) < 32 < len(payload) // 16
+
+
+def test_iter_chunks():
+
+    assert list(iter_chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_iter_price(stub_server):
+
+    server = stub_server({"/stock/KO/chart/1m": PRICE})
+    client = Client(base_url=server.url)
+
+    frames = list(Stock("KO", client=client).iter_price("1m", chunk_size=3))
+    records = list(Stock("KO", "records", client).iter_price("1m", chunk_size=3))
+
+    assert [len(frame) for frame in frames] == [3, 3, 1]
+    assert str(frames[0]["date"].dtype).startswith("datetime64")
+    assert sum(records, []) == PRICE
@@ -0,0 +1,50 @@
+import pytest
+from requests import HTTPError
+from iexcloud import (
+    Client,
+    RetryPolicies,
+    RetryPolicy,
+    fetch_universe,
+)
+
+PRICE = [{"date": "2020-01-02", "close": 54.99, "volume": 11867660}]
+
+
+@pytest.fixture
+def server(stub_server):
+
+    routes = {
+        "/stock/KO/chart/1m": PRICE,
+        "/stock/PEP/chart/1m": PRICE,
+        "/stock/BAD/chart/1m": lambda handler: (500, "oops", {}),
+    }
+    return stub_server(routes)
+
+
+def test_fetch_universe(server):
+
+    fetch = fetch_universe(
+        ["KO", "BAD", "PEP"],
+        "price",
+        time_range="1m",
+        workers=2,
+        client=Client(
+            base_url=server.url, retry=RetryPolicies(RetryPolicy(max_retries=0))
+        ),
+    )
+    results = {result.symbol: result for result in fetch}
+
+    assert results["KO"].ok
+    assert list(results["PEP"].output.columns) == ["date", "close", "volume"]
+    assert isinstance(results["BAD"].error, HTTPError)
+
+    report = fetch.report
+    assert sorted(report.successes) == ["KO", "PEP"]
+    assert report.failed_symbols == ["BAD"]
+    assert set(report.timings) == {"KO", "PEP", "BAD"}
+
+
+def test_unknown_dataset():
+
+    with pytest.raises(ValueError):
+        fetch_universe(["KO"], "quote", client=Client())